@@ -3,7 +3,7 @@ Configurações da aplicação com validação de variáveis de ambiente
 """
 import os
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
 
 
 class Settings(BaseSettings):
@@ -16,7 +16,67 @@ class Settings(BaseSettings):
     
     # Banco de dados
     DATABASE_URL: str = "sqlite:///./doceria.db"
-    
+
+    # Modo assíncrono (AsyncSession) para pedidos, pagamentos e clientes.
+    # Requer aiosqlite (SQLite) ou asyncpg (Postgres).
+    DB_ASYNC: bool = False
+    ASYNC_DATABASE_URL: str = ""  # Se vazio, derivada da DATABASE_URL
+
+    # Perfil SQLite (pragmas aplicados em cada conexão)
+    SQLITE_PERFIL_PRODUCAO: bool = True
+    SQLITE_JOURNAL_MODE: str = "WAL"  # Leitores não bloqueiam durante commits
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_CACHE_SIZE: int = -20000  # Negativo = KiB (20 MB)
+    SQLITE_MMAP_SIZE: int = 134217728  # 128 MB
+    SQLITE_TEMP_STORE: str = "MEMORY"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    # Retries após o busy_timeout esgotar, só fora de transação e no COMMIT. Cada um
+    # espera o busy_timeout de novo: o pior caso é (1 + retries) x busy_timeout
+    SQLITE_BUSY_RETRIES: int = 1
+    SQLITE_BUSY_BACKOFF_MS: int = 50  # Espera inicial, dobrada a cada retry
+
+    # Fila de escrita única (criação de pedidos, pagamentos e clientes)
+    FILA_ESCRITA_ATIVA: bool = False
+    FILA_ESCRITA_LOTE_MAX: int = 32  # Operações gravadas por commit
+    FILA_ESCRITA_JANELA_MS: int = 2  # Espera para agrupar operações no mesmo lote
+
+    # Checkout: pedido, itens e pagamento automático gravados em uma transação
+    CHECKOUT_PAGAMENTO_OPCIONAL: bool = True  # Falha no pagamento não desfaz o pedido
+
+    # Fuso da loja: limites dos dias em filtros, estatísticas e resumos diários.
+    # Ao alterar, reconstrua os resumos: python -m app.services.resumo_diario
+    FUSO_HORARIO_LOJA: str = "America/Sao_Paulo"
+
+    # Banco de leitura (relatórios e catálogo)
+    READ_DATABASE_URL: str = ""  # Réplica de leitura; tem prioridade sobre o snapshot
+    SQLITE_SNAPSHOT_PATH: str = ""  # Ex.: ./doceria_leitura.db
+    SQLITE_SNAPSHOT_INTERVALO_S: int = 30
+    READ_YOUR_WRITES_S: int = 60  # Leituras vão ao banco principal após uma escrita do cliente
+
+    # Cache em processo das listagens do catálogo (produtos, kits, categorias, eventos)
+    CACHE_CATALOGO_ATIVO: bool = True
+    CACHE_CATALOGO_TTL_S: int = 60  # Também limita a defasagem entre workers
+
+    # Compressão das respostas (gzip; brotli se o pacote brotli estiver instalado)
+    COMPRESSAO_ATIVA: bool = True
+    COMPRESSAO_MINIMO_BYTES: int = 1024  # Corpos menores seguem sem compressão
+    COMPRESSAO_NIVEL_GZIP: int = 6  # 1 (rápido) a 9 (menor)
+    COMPRESSAO_BROTLI: bool = True
+    COMPRESSAO_NIVEL_BROTLI: int = 4  # 0 a 11; acima de ~5 o custo de CPU cresce rápido
+    COMPRESSAO_THREADPOOL_BYTES: int = 65536  # A partir daqui comprime no threadpool (gzip 6: ~1ms por 64KB)
+
+    # Monitoramento de consultas por requisição (headers X-DB-* e log)
+    SQL_MONITORAMENTO_ATIVO: bool = False
+    SQL_N_MAIS_1_LIMITE: int = 5  # Mesmo SQL com N parâmetros distintos = suspeita de N+1
+    SQL_ORCAMENTO_PADRAO: int = 0  # Máximo de consultas por requisição (0 = sem limite)
+    SQL_ORCAMENTO_ROTAS: Dict[str, int] = {}  # Ex.: {"POST /pedidos/": 20}; erro em ENVIRONMENT=testing
+
+    # Log de consultas lentas (JSONL com rotação)
+    SQL_LENTAS_LIMITE_MS: int = 0  # 0 = desativado
+    SQL_LENTAS_ARQUIVO: str = "logs/consultas_lentas.jsonl"
+    SQL_LENTAS_ARQUIVO_MAX_MB: int = 10
+    SQL_LENTAS_ARQUIVOS_BACKUP: int = 5
+
     # CORS
     CORS_ORIGINS: List[str] = [
         "http://localhost:5500",
@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.orm import Session
+from app.data import cache_catalogo
 from app.data.depedencies import get_db, get_current_user
 from app.services.categoria_service import CategoriaService
 from app.schemas import CategoriaCreate, CategoriaOut
@@ -9,8 +10,8 @@ service = CategoriaService()
 
 
 @router.get("/", response_model=list[CategoriaOut])
-def listar(db: Session = Depends(get_db)):
-    return service.listar(db)
+def listar(request: Request):
+    return cache_catalogo.listagem(request, cache_catalogo.CATEGORIAS, service.listar, CategoriaOut)
 
 
 @router.post("/", response_model=CategoriaOut)
@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.orm import Session
+from app.data import cache_catalogo
 from app.data.depedencies import get_db, get_current_user
 from app.services.kit_service import KitService
 
@@ -7,8 +8,8 @@ router = APIRouter(prefix="/kits", tags=["Kits"])
 service = KitService()
 
 @router.get("/")
-def listar(db: Session = Depends(get_db)):
-    return service.listar(db)
+def listar(request: Request):
+    return cache_catalogo.listagem(request, cache_catalogo.KITS, service.listar)
 
 @router.get("/{id}")
 def buscar(id: int, db: Session = Depends(get_db)):
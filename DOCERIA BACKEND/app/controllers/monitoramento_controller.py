@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends
+from app.config import settings
+from app.data.compressao import codificacoes_disponiveis, metricas
+from app.data.depedencies import get_current_user
+
+router = APIRouter(prefix="/monitoramento", tags=["Monitoramento"])
+
+
+@router.get("/compressao")
+def compressao(user=Depends(get_current_user)):
+    """Totais da compressão das respostas por codificação, desde o início do processo"""
+    return {
+        "ativa": settings.COMPRESSAO_ATIVA,
+        "codificacoes": codificacoes_disponiveis(),
+        "totais": metricas.resumo(),
+    }
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query, Request, Response
 from typing import Optional
-from app.data.depedencies import get_db, get_current_user
-from app.services.pedido_service import PedidoService
+from app.data.depedencies import get_service_db, get_read_db, get_current_user
+from app.services import condicional
+from app.services.pedido_service import AsyncPedidoService
+from app.services.paginacao import definir_proximo_cursor
+from app.services.serializacao import SerializadorResumo
 from app.schemas import (
     PedidoCreate, 
     PedidoUpdate, 
@@ -12,109 +14,149 @@ from app.schemas import (
 )
 
 router = APIRouter(prefix="/pedidos", tags=["Pedidos"])
-service = PedidoService()
+service = AsyncPedidoService()
+resumos = SerializadorResumo(PedidoResumo)
+
+
+def _cabecalhos_versao(id: int, versao) -> dict:
+    etag = condicional.etag_da_versao(f"pedido-{id}", versao)
+    return condicional.cabecalhos(etag, versao, condicional.CACHE_CONTROL_PRIVADO)
 
 
 @router.get("/", response_model=list[PedidoResumo], responses={
     200: {"description": "Lista de pedidos retornada com sucesso"}
 })
-def listar(
+async def listar(
+    response: Response,
     skip: int = Query(0, ge=0, description="Número de registros para pular"),
     limit: int = Query(100, ge=1, le=500, description="Limite de registros"),
     status: Optional[str] = Query(None, description="Filtrar por status"),
     cliente_id: Optional[int] = Query(None, description="Filtrar por cliente"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (header X-Next-Cursor); substitui skip"),
+    db=Depends(get_service_db),
     user=Depends(get_current_user)
 ):
     """Lista todos os pedidos com filtros opcionais"""
-    return service.listar(db, skip, limit, status, cliente_id)
+    pedidos = await service.listar(db, skip, limit, status, cliente_id, cursor)
+    definir_proximo_cursor(response, pedidos, limit, "data_pedido", "id")
+    return resumos.resposta(pedidos, response)
 
 
 @router.get("/pendentes", response_model=list[PedidoResumo], responses={
     200: {"description": "Lista de pedidos pendentes"}
 })
-def listar_pendentes(
-    db: Session = Depends(get_db),
+async def listar_pendentes(
+    db=Depends(get_service_db),
     user=Depends(get_current_user)
 ):
     """Lista pedidos pendentes (não entregues e não cancelados)"""
-    return service.pedidos_pendentes(db)
+    return resumos.resposta(await service.pedidos_pendentes(db))
 
 
 @router.get("/hoje", response_model=list[PedidoResumo], responses={
     200: {"description": "Lista de pedidos do dia"}
 })
-def listar_hoje(
+async def listar_hoje(
     data: Optional[str] = Query(None, description="Data no formato YYYY-MM-DD (opcional, padrão: hoje)"),
-    db: Session = Depends(get_db),
+    db=Depends(get_service_db),
     user=Depends(get_current_user)
 ):
     """Lista pedidos de uma data específica (padrão: hoje)"""
-    return service.pedidos_do_dia(db, data)
+    return resumos.resposta(await service.pedidos_do_dia(db, data))
 
 
 @router.get("/estatisticas", responses={
     200: {"description": "Estatísticas dos pedidos"}
 })
-def estatisticas(
+async def estatisticas(
     data_inicio: Optional[str] = Query(None, description="Data início (YYYY-MM-DD)"),
     data_fim: Optional[str] = Query(None, description="Data fim (YYYY-MM-DD)"),
-    db: Session = Depends(get_db),
+    db=Depends(get_read_db),
     user=Depends(get_current_user)
 ):
     """Retorna estatísticas dos pedidos"""
-    return service.estatisticas(db, data_inicio, data_fim)
+    return await service.estatisticas(db, data_inicio, data_fim)
+
+
+@router.get("/estatisticas/produtos", responses={
+    200: {"description": "Produtos e kits mais vendidos no período"}
+})
+async def produtos_vendidos(
+    data_inicio: Optional[str] = Query(None, description="Data início (YYYY-MM-DD)"),
+    data_fim: Optional[str] = Query(None, description="Data fim (YYYY-MM-DD)"),
+    limit: int = Query(20, ge=1, le=500, description="Quantidade de itens no ranking"),
+    db=Depends(get_read_db),
+    user=Depends(get_current_user)
+):
+    """Retorna os produtos e kits mais vendidos (pedidos não cancelados)"""
+    return await service.produtos_vendidos(db, data_inicio, data_fim, limit)
 
 
 @router.get("/total", responses={
     200: {"description": "Total de pedidos"}
 })
-def contar(
+async def contar(
     status: Optional[str] = Query(None, description="Filtrar por status"),
-    db: Session = Depends(get_db),
+    db=Depends(get_service_db),
     user=Depends(get_current_user)
 ):
     """Retorna o total de pedidos"""
-    total = service.contar(db, status)
+    total = await service.contar(db, status)
     return {"total": total}
 
 
 @router.get("/cliente/{cliente_id}", response_model=list[PedidoResumo], responses={
     200: {"description": "Pedidos do cliente"}
 })
-def listar_por_cliente(
+async def listar_por_cliente(
     cliente_id: int,
-    db: Session = Depends(get_db),
+    db=Depends(get_service_db),
     user=Depends(get_current_user)
 ):
     """Lista todos os pedidos de um cliente"""
-    return service.pedidos_cliente(db, cliente_id)
+    return resumos.resposta(await service.pedidos_cliente(db, cliente_id))
 
 
 @router.get("/numero/{numero}", response_model=PedidoOut, responses={
     200: {"description": "Pedido encontrado"},
     404: {"description": "Pedido não encontrado"}
 })
-def buscar_por_numero(
+async def buscar_por_numero(
     numero: str,
-    db: Session = Depends(get_db),
+    db=Depends(get_service_db),
     user=Depends(get_current_user)
 ):
     """Busca um pedido pelo número (ex: PED-2024-0001)"""
-    return service.buscar_por_numero(db, numero)
+    return await service.buscar_por_numero(db, numero)
 
 
 @router.get("/{id}", response_model=PedidoOut, responses={
     200: {"description": "Pedido encontrado"},
+    304: {"description": "Pedido não alterado desde a versão do cliente (If-None-Match)"},
     404: {"description": "Pedido não encontrado"}
 })
-def buscar_por_id(
+async def buscar_por_id(
     id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db=Depends(get_service_db),
     user=Depends(get_current_user)
 ):
-    """Busca um pedido pelo ID"""
-    return service.buscar_por_id(db, id)
+    """
+    Busca um pedido pelo ID (ETag/Last-Modified pela data_atualizacao)
+
+    Só o ETag (versão em microssegundos) gera 304: um pedido alterado no mesmo
+    segundo da cópia do cliente passaria pelo If-Modified-Since.
+    """
+    if condicional.condicional(request, if_modified_since=False):
+        # Só a versão (uma linha pela PK): sem itens nem serialização no 304
+        versao = await service.versao(db, id)
+        headers = _cabecalhos_versao(id, versao)
+        if condicional.nao_modificado(request, headers["ETag"], versao, if_modified_since=False):
+            return condicional.resposta_304(headers)
+    pedido = await service.buscar_por_id(db, id)
+    response.headers.update(_cabecalhos_versao(id, pedido.data_atualizacao or pedido.data_criacao))
+    return pedido
 
 
 @router.post("/", response_model=PedidoOut, responses={
@@ -122,13 +164,13 @@ def buscar_por_id(
     400: {"description": "Dados inválidos"},
     404: {"description": "Cliente ou produto não encontrado"}
 })
-def criar(
+async def criar(
     payload: PedidoCreate,
-    db: Session = Depends(get_db),
+    db=Depends(get_service_db),
     user=Depends(get_current_user)
 ):
     """Cria um novo pedido"""
-    return service.criar(db, payload.model_dump())
+    return await service.criar(db, payload.model_dump())
 
 
 @router.put("/{id}", response_model=PedidoOut, responses={
@@ -136,14 +178,14 @@ def criar(
     400: {"description": "Não é possível editar este pedido"},
     404: {"description": "Pedido não encontrado"}
 })
-def atualizar(
+async def atualizar(
     id: int,
     payload: PedidoUpdate,
-    db: Session = Depends(get_db),
+    db=Depends(get_service_db),
     user=Depends(get_current_user)
 ):
     """Atualiza dados de um pedido"""
-    return service.atualizar(db, id, payload.model_dump(exclude_unset=True))
+    return await service.atualizar(db, id, payload.model_dump(exclude_unset=True))
 
 
 @router.patch("/{id}/status", response_model=PedidoOut, responses={
@@ -151,86 +193,86 @@ def atualizar(
     400: {"description": "Não é possível alterar status deste pedido"},
     404: {"description": "Pedido não encontrado"}
 })
-def atualizar_status(
+async def atualizar_status(
     id: int,
     payload: AtualizarStatusPedido,
-    db: Session = Depends(get_db),
+    db=Depends(get_service_db),
     user=Depends(get_current_user)
 ):
     """Atualiza o status de um pedido"""
-    return service.atualizar_status(db, id, payload.status)
+    return await service.atualizar_status(db, id, payload.status)
 
 
 @router.patch("/{id}/confirmar", response_model=PedidoOut, responses={
     200: {"description": "Pedido confirmado"}
 })
-def confirmar(
+async def confirmar(
     id: int,
-    db: Session = Depends(get_db),
+    db=Depends(get_service_db),
     user=Depends(get_current_user)
 ):
     """Confirma um pedido pendente"""
-    return service.atualizar_status(db, id, "confirmado")
+    return await service.atualizar_status(db, id, "confirmado")
 
 
 @router.patch("/{id}/preparar", response_model=PedidoOut, responses={
     200: {"description": "Pedido em preparo"}
 })
-def iniciar_preparo(
+async def iniciar_preparo(
     id: int,
-    db: Session = Depends(get_db),
+    db=Depends(get_service_db),
     user=Depends(get_current_user)
 ):
     """Marca pedido como em preparo"""
-    return service.atualizar_status(db, id, "em_preparo")
+    return await service.atualizar_status(db, id, "em_preparo")
 
 
 @router.patch("/{id}/pronto", response_model=PedidoOut, responses={
     200: {"description": "Pedido pronto"}
 })
-def marcar_pronto(
+async def marcar_pronto(
     id: int,
-    db: Session = Depends(get_db),
+    db=Depends(get_service_db),
     user=Depends(get_current_user)
 ):
     """Marca pedido como pronto"""
-    return service.atualizar_status(db, id, "pronto")
+    return await service.atualizar_status(db, id, "pronto")
 
 
 @router.patch("/{id}/sair-entrega", response_model=PedidoOut, responses={
     200: {"description": "Pedido saiu para entrega"}
 })
-def sair_entrega(
+async def sair_entrega(
     id: int,
-    db: Session = Depends(get_db),
+    db=Depends(get_service_db),
     user=Depends(get_current_user)
 ):
     """Marca pedido como saiu para entrega"""
-    return service.atualizar_status(db, id, "saiu_entrega")
+    return await service.atualizar_status(db, id, "saiu_entrega")
 
 
 @router.patch("/{id}/entregar", response_model=PedidoOut, responses={
     200: {"description": "Pedido entregue"}
 })
-def entregar(
+async def entregar(
     id: int,
-    db: Session = Depends(get_db),
+    db=Depends(get_service_db),
     user=Depends(get_current_user)
 ):
     """Marca pedido como entregue"""
-    return service.atualizar_status(db, id, "entregue")
+    return await service.atualizar_status(db, id, "entregue")
 
 
 @router.patch("/{id}/cancelar", response_model=PedidoOut, responses={
     200: {"description": "Pedido cancelado"},
     400: {"description": "Não é possível cancelar este pedido"}
 })
-def cancelar(
+async def cancelar(
     id: int,
     motivo: Optional[str] = Query(None, description="Motivo do cancelamento"),
-    db: Session = Depends(get_db),
+    db=Depends(get_service_db),
     user=Depends(get_current_user)
 ):
     """Cancela um pedido"""
-    return service.cancelar(db, id, motivo)
+    return await service.cancelar(db, id, motivo)
 
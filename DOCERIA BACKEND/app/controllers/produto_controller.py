@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
+from app.data import cache_catalogo
 from app.data.depedencies import get_db, get_current_user
 from app.services.produto_service import ProdutoService
 from app.schemas import ProdutoCreate, ProdutoOut
@@ -11,8 +12,8 @@ service = ProdutoService()
     200: {"description": "Lista de produtos retornada com sucesso"},
     500: {"description": "Erro interno"}
 })
-def listar(db: Session = Depends(get_db)):
-    return service.listar(db)
+def listar(request: Request):
+    return cache_catalogo.listagem(request, cache_catalogo.PRODUTOS, service.listar)
 
 @router.get("/{id}", responses={
     200: {"description": "Produto encontrado"},
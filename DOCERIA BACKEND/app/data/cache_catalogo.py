@@ -0,0 +1,125 @@
+"""
+Cache em processo das listagens públicas do catálogo (produtos, kits, categorias e eventos)
+
+As páginas da loja buscam o catálogo a cada carregamento, mas ele muda poucas
+vezes por semana. Cada listagem fica guardada já serializada (bytes do JSON):
+um acerto responde sem abrir sessão do banco nem passar pelo Pydantic.
+
+- Expiração: CACHE_CATALOGO_TTL_S segundos, que também limitam a defasagem
+  entre workers (cada processo tem o seu cache)
+- Invalidação: os serviços chamam invalidar(...) após o commit das escritas
+- Uma geração por chave descarta cargas iniciadas antes de uma invalidação, e
+  uma trava por chave evita várias cargas simultâneas da mesma listagem
+- Faltas leem o banco principal: o banco de leitura pode ainda não ter a escrita
+  que acabou de invalidar a listagem
+- Versão: ETag forte = hash dos bytes (o mesmo em todos os workers) e
+  Last-Modified = quando este processo viu o conteúdo mudar. Um If-None-Match
+  que confere com a entrada em cache recebe 304 sem sessão do banco
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, NamedTuple, Optional
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.data.database import SessionLocal
+from app.services import condicional, serializacao
+
+PRODUTOS = "produtos"
+KITS = "kits"
+CATEGORIAS = "categorias"
+EVENTOS = "eventos"
+
+
+class Listagem(NamedTuple):
+    corpo: bytes
+    etag: str
+    ultima_modificacao: datetime
+
+
+class CacheCatalogo:
+    def __init__(self, ttl_s: float):
+        self.ttl_s = ttl_s
+        self._entradas: dict[str, tuple[float, Listagem]] = {}
+        self._versoes: dict[str, tuple[str, datetime]] = {}
+        self._geracoes: dict[str, int] = {}
+        self._travas: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def obter(self, chave: str) -> Optional[Listagem]:
+        entrada = self._entradas.get(chave)
+        if entrada and entrada[0] > time.monotonic():
+            return entrada[1]
+        return None
+
+    def versionar(self, chave: str, corpo: bytes) -> Listagem:
+        """Listagem com ETag; Last-Modified só avança quando os bytes mudam"""
+        etag = condicional.etag_do_corpo(corpo)
+        with self._lock:
+            anterior = self._versoes.get(chave)
+            if anterior is None or anterior[0] != etag:
+                anterior = (etag, datetime.utcnow())
+                self._versoes[chave] = anterior
+        return Listagem(corpo, etag, anterior[1])
+
+    def carregar(self, chave: str, calcular: Callable[[], bytes]) -> tuple[Listagem, bool]:
+        """(listagem, acerto): a listagem em cache ou a calculada (e guardada) agora"""
+        listagem = self.obter(chave)
+        if listagem is not None:
+            return listagem, True
+        with self._lock:
+            trava = self._travas.setdefault(chave, threading.Lock())
+        with trava:
+            listagem = self.obter(chave)
+            if listagem is not None:
+                return listagem, True
+            geracao = self._geracoes.get(chave, 0)
+            listagem = self.versionar(chave, calcular())
+            with self._lock:
+                if self._geracoes.get(chave, 0) == geracao:
+                    self._entradas[chave] = (time.monotonic() + self.ttl_s, listagem)
+            return listagem, False
+
+    def invalidar(self, *chaves: str):
+        with self._lock:
+            for chave in chaves:
+                self._entradas.pop(chave, None)
+                self._geracoes[chave] = self._geracoes.get(chave, 0) + 1
+
+
+cache = CacheCatalogo(settings.CACHE_CATALOGO_TTL_S)
+
+
+def invalidar(*chaves: str):
+    cache.invalidar(*chaves)
+
+
+def listagem(request: Request, chave: str, listar: Callable[[Session], Any], modelo=None) -> Response:
+    """
+    Resposta JSON da listagem `chave` (ou 304, se o cliente já tem esta versão).
+    Numa falta executa `listar(db)` e serializa como o FastAPI faria (validando
+    com `modelo`, o response_model dos itens, quando informado).
+    """
+    def calcular() -> bytes:
+        db = SessionLocal()
+        try:
+            dados = listar(db)
+            if modelo is not None:
+                adaptador = serializacao.adaptador_lista(modelo)
+                return adaptador.dump_json(adaptador.validate_python(dados, from_attributes=True))
+            return serializacao.dumps(jsonable_encoder(dados))
+        finally:
+            db.close()
+
+    if settings.CACHE_CATALOGO_ATIVO:
+        atual, acerto = cache.carregar(chave, calcular)
+        headers = {"X-Cache": "HIT" if acerto else "MISS"}
+    else:
+        atual, headers = cache.versionar(chave, calcular()), {}
+    headers.update(condicional.cabecalhos(atual.etag, atual.ultima_modificacao))
+    if condicional.nao_modificado(request, atual.etag, atual.ultima_modificacao):
+        return condicional.resposta_304(headers)
+    return Response(atual.corpo, media_type="application/json", headers=headers)
@@ -0,0 +1,206 @@
+"""
+Compressão das respostas (gzip e brotli) negociada pelo Accept-Encoding
+
+As listagens grandes (/pedidos?limit=500, /clientes?limit=500, /pagamentos e
+o catálogo) são JSON muito repetitivo: comprimido, cai para 10-15% do tamanho.
+
+- Só comprime respostas de tipo textual (JSON, texto, XML, JS) com corpo de
+  pelo menos COMPRESSAO_MINIMO_BYTES, entregues numa única mensagem
+- Respostas em streaming (mais de uma mensagem de corpo) e as que já têm
+  Content-Encoding passam sem alteração
+- brotli vem do pacote `brotli` (requirements.txt); se ele não estiver
+  instalado, a negociação usa só gzip
+- O ETag da resposta comprimida vira fraco (W/"..."), como no nginx: os bytes
+  mudam, mas a versão é a mesma e o If-None-Match continua valendo. O 304
+  repete o ETag na forma que o cliente tem (fraco só se o 200 foi comprimido)
+- Vary: Accept-Encoding vai em toda resposta comprimível de mensagem única,
+  comprimida ou não (pequena, sem codificação aceita), e em todo 304
+- Corpos a partir de COMPRESSAO_THREADPOOL_BYTES são comprimidos no threadpool,
+  para não prender o event loop durante a compressão
+
+Métricas: cada resposta comprimida leva X-Compression-Ratio (comprimido /
+original) e X-Compression-CPU-Ms; os totais por codificação ficam em
+`metricas.resumo()`, expostos em GET /monitoramento/compressao; cada resposta
+comprimida também é registrada no log em nível DEBUG.
+"""
+import gzip
+import logging
+import threading
+import time
+from typing import Optional
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import settings
+
+try:
+    import brotli
+except ImportError:  # dependência opcional
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+TIPOS_COMPRIMIVEIS = ("application/json", "text/", "application/javascript", "application/xml", "+json", "+xml")
+
+
+class MetricasCompressao:
+    """Totais de bytes e tempo de CPU por codificação, desde o início do processo"""
+
+    def __init__(self):
+        self._totais: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, codificacao: str, original: int, comprimido: int, cpu_s: float):
+        with self._lock:
+            total = self._totais.setdefault(
+                codificacao, {"respostas": 0, "bytes_originais": 0, "bytes_comprimidos": 0, "cpu_s": 0.0}
+            )
+            total["respostas"] += 1
+            total["bytes_originais"] += original
+            total["bytes_comprimidos"] += comprimido
+            total["cpu_s"] += cpu_s
+
+    def resumo(self) -> dict:
+        with self._lock:
+            return {
+                codificacao: {
+                    **total,
+                    "cpu_s": round(total["cpu_s"], 6),
+                    "razao": round(total["bytes_comprimidos"] / total["bytes_originais"], 4),
+                    "cpu_ms_por_resposta": round(total["cpu_s"] * 1000 / total["respostas"], 3),
+                }
+                for codificacao, total in self._totais.items()
+            }
+
+
+metricas = MetricasCompressao()
+
+
+def codificacoes_disponiveis() -> list[str]:
+    """Em ordem de preferência para o mesmo peso (q) no Accept-Encoding"""
+    return ["br", "gzip"] if brotli is not None and settings.COMPRESSAO_BROTLI else ["gzip"]
+
+
+def escolher_codificacao(accept_encoding: str) -> Optional[str]:
+    """Codificação de maior q aceita pelo cliente, ou None"""
+    pesos = {}
+    for parte in accept_encoding.split(","):
+        nome, _, parametros = parte.strip().partition(";")
+        q = 1.0
+        parametro = parametros.strip()
+        if parametro.startswith("q="):
+            try:
+                q = float(parametro[2:])
+            except ValueError:
+                q = 0.0
+        if nome:
+            pesos[nome.strip().lower()] = q
+    melhor, melhor_q = None, 0.0
+    for codificacao in codificacoes_disponiveis():
+        q = pesos.get(codificacao, pesos.get("*", 0.0))
+        if q > melhor_q:
+            melhor, melhor_q = codificacao, q
+    return melhor
+
+
+def comprimir(corpo: bytes, codificacao: str) -> bytes:
+    if codificacao == "br":
+        return brotli.compress(corpo, quality=settings.COMPRESSAO_NIVEL_BROTLI)
+    return gzip.compress(corpo, compresslevel=settings.COMPRESSAO_NIVEL_GZIP, mtime=0)
+
+
+def _comprimir_medindo(corpo: bytes, codificacao: str) -> tuple[bytes, float]:
+    """(corpo comprimido, segundos de CPU da thread que comprimiu)"""
+    cpu = time.thread_time()
+    comprimido = comprimir(corpo, codificacao)
+    return comprimido, time.thread_time() - cpu
+
+
+def _enfraquecer_etag(headers: MutableHeaders):
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+
+
+def _cliente_tem_etag_fraco(if_none_match: str, etag: Optional[str]) -> bool:
+    """
+    Se o 200 em cache no cliente foi comprimido: o If-None-Match traz o ETag
+    como o 200 o levou, fraco (W/) só quando a resposta foi comprimida
+    """
+    if not etag or etag.startswith("W/"):
+        return False
+    return f"W/{etag}" in (valor.strip() for valor in if_none_match.split(","))
+
+
+def _comprimivel(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    tipo = headers.get("content-type", "")
+    return any(marcador in tipo for marcador in TIPOS_COMPRIMIVEIS)
+
+
+class CompressaoMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        cabecalhos = Headers(scope=scope)
+        codificacao = escolher_codificacao(cabecalhos.get("accept-encoding", ""))
+        if_none_match = cabecalhos.get("if-none-match", "")
+        inicio: Optional[Message] = None
+        repassar = False
+
+        async def enviar(message: Message):
+            nonlocal inicio, repassar
+            if repassar:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                inicio = message
+                if message["status"] == 304:
+                    # Mesmos validadores do 200 que o cliente tem em cache
+                    headers = MutableHeaders(raw=message["headers"])
+                    headers.add_vary_header("Accept-Encoding")
+                    if _cliente_tem_etag_fraco(if_none_match, headers.get("etag")):
+                        _enfraquecer_etag(headers)
+                if not _comprimivel(Headers(raw=message["headers"])):
+                    repassar = True
+                    await send(message)
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            corpo = message.get("body", b"")
+            repassar = True
+            if message.get("more_body", False):
+                # Streaming: segue como veio
+                await send(inicio)
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=inicio["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if codificacao is not None and len(corpo) >= settings.COMPRESSAO_MINIMO_BYTES:
+                if len(corpo) >= settings.COMPRESSAO_THREADPOOL_BYTES:
+                    comprimido, cpu_s = await run_in_threadpool(_comprimir_medindo, corpo, codificacao)
+                else:
+                    comprimido, cpu_s = _comprimir_medindo(corpo, codificacao)
+                razao = len(comprimido) / len(corpo)
+                metricas.registrar(codificacao, len(corpo), len(comprimido), cpu_s)
+                logger.debug(f"{scope['path']}: {codificacao} {len(corpo)} -> {len(comprimido)} bytes "
+                             f"({razao:.3f}) em {cpu_s * 1000:.2f}ms de CPU")
+
+                headers["Content-Encoding"] = codificacao
+                headers["Content-Length"] = str(len(comprimido))
+                headers["X-Compression-Ratio"] = f"{razao:.3f}"
+                headers["X-Compression-CPU-Ms"] = f"{cpu_s * 1000:.2f}"
+                _enfraquecer_etag(headers)
+                message = {**message, "body": comprimido}
+            await send(inicio)
+            await send(message)
+
+        await self.app(scope, receive, enviar)
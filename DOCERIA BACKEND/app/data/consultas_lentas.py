@@ -0,0 +1,175 @@
+"""
+Log de consultas lentas (JSONL com rotação) e agregação por statement
+
+Consultas que levam SQL_LENTAS_LIMITE_MS ou mais são gravadas em
+SQL_LENTAS_ARQUIVO, uma por linha:
+
+    {"data": ..., "duracao_ms": 812.4, "origem": "PedidoService.estatisticas",
+     "sql": "SELECT ...", "parametros": "('2024-01-01',)", "executemany": false}
+
+Agregação (execute na pasta DOCERIA BACKEND; inclui os arquivos rotacionados):
+
+    python -m app.data.consultas_lentas
+    python -m app.data.consultas_lentas logs/consultas_lentas.jsonl --top 10 --ordenar media_ms
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import re
+import sys
+from collections import defaultdict
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from app.config import settings
+
+_logger = None
+
+_MAX_PARAMETROS = 10
+_MAX_TEXTO = 50
+
+
+def _get_logger() -> logging.Logger:
+    global _logger
+    if _logger is None:
+        pasta = os.path.dirname(settings.SQL_LENTAS_ARQUIVO)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        handler = RotatingFileHandler(
+            settings.SQL_LENTAS_ARQUIVO,
+            maxBytes=settings.SQL_LENTAS_ARQUIVO_MAX_MB * 1024 * 1024,
+            backupCount=settings.SQL_LENTAS_ARQUIVOS_BACKUP,
+            encoding="utf-8",
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger = logging.getLogger("app.consultas_lentas")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        logger.addHandler(handler)
+        _logger = logger
+    return _logger
+
+
+def _resumir_valor(valor):
+    if isinstance(valor, (str, bytes)) and len(valor) > _MAX_TEXTO:
+        return f"{valor[:_MAX_TEXTO]!r}...({len(valor)})"
+    return repr(valor)
+
+
+def resumir_parametros(parameters, executemany: bool = False) -> str:
+    """Representação curta dos parâmetros (textos longos e listas grandes truncados)"""
+    if executemany and parameters and isinstance(parameters[0], (list, tuple, dict)):
+        return f"{len(parameters)} linhas, primeira: {resumir_parametros(parameters[0])}"
+    if isinstance(parameters, dict):
+        itens = [f"{chave}={_resumir_valor(valor)}" for chave, valor in list(parameters.items())[:_MAX_PARAMETROS]]
+    else:
+        itens = [_resumir_valor(valor) for valor in list(parameters or ())[:_MAX_PARAMETROS]]
+    if parameters and len(parameters) > _MAX_PARAMETROS:
+        itens.append(f"... +{len(parameters) - _MAX_PARAMETROS}")
+    return f"({', '.join(itens)})"
+
+
+def origem_consulta() -> str:
+    """
+    Método que emitiu a consulta, procurando na pilha de chamadas o primeiro frame
+    de `app.services` (ex.: PedidoService.estatisticas). Sem serviço na pilha,
+    usa o primeiro frame da aplicação fora de `app.data` (ex.: um controller).
+    """
+    frame = sys._getframe(1)
+    fallback = None
+    while frame is not None:
+        modulo = frame.f_globals.get("__name__", "")
+        if modulo.startswith("app.") and not modulo.startswith("app.data"):
+            nome = getattr(frame.f_code, "co_qualname", frame.f_code.co_name)
+            if modulo.startswith("app.services."):
+                return nome
+            if fallback is None:
+                fallback = f"{modulo}:{nome}"
+        frame = frame.f_back
+    return fallback or "desconhecida"
+
+
+def registrar_consulta_lenta(statement: str, parameters, duracao: float, executemany: bool = False):
+    try:
+        _get_logger().info(json.dumps(_registro(statement, parameters, duracao, executemany), ensure_ascii=False))
+    except Exception as e:
+        # Falha no log nunca interrompe a consulta
+        logging.getLogger(__name__).warning(f"Erro ao registrar consulta lenta: {e}")
+
+
+def _registro(statement: str, parameters, duracao: float, executemany: bool) -> dict:
+    return {
+        "data": datetime.now().isoformat(timespec="milliseconds"),
+        "duracao_ms": round(duracao * 1000, 2),
+        "origem": origem_consulta(),
+        "sql": " ".join(statement.split()),
+        "parametros": resumir_parametros(parameters, executemany),
+        "executemany": executemany,
+    }
+
+
+def normalizar_sql(sql: str) -> str:
+    """Remove literais e colapsa listas IN para agrupar variações do mesmo statement"""
+    sql = " ".join(sql.split())
+    sql = re.sub(r"'(?:[^']|'')*'", "?", sql)
+    sql = re.sub(r"\b\d+(?:\.\d+)?\b", "?", sql)
+    sql = re.sub(r"\(\s*\?(?:\s*,\s*\?)+\s*\)", "(?, ...)", sql)
+    sql = re.sub(r"__\[POSTCOMPILE_\w+\]", "(?, ...)", sql)
+    return sql
+
+
+def agregar(arquivos: list) -> list[dict]:
+    """Agrupa os registros por SQL normalizado com contagem, tempo total, médio e máximo"""
+    grupos = defaultdict(lambda: {"contagem": 0, "total_ms": 0.0, "max_ms": 0.0, "origens": set()})
+    for arquivo in arquivos:
+        with open(arquivo, encoding="utf-8") as f:
+            for linha in f:
+                try:
+                    registro = json.loads(linha)
+                except json.JSONDecodeError:
+                    continue
+                grupo = grupos[normalizar_sql(registro["sql"])]
+                grupo["contagem"] += 1
+                grupo["total_ms"] += registro["duracao_ms"]
+                grupo["max_ms"] = max(grupo["max_ms"], registro["duracao_ms"])
+                grupo["origens"].add(registro.get("origem", "desconhecida"))
+
+    return [
+        {
+            "sql": sql,
+            "contagem": grupo["contagem"],
+            "total_ms": round(grupo["total_ms"], 2),
+            "media_ms": round(grupo["total_ms"] / grupo["contagem"], 2),
+            "max_ms": grupo["max_ms"],
+            "origens": sorted(grupo["origens"]),
+        }
+        for sql, grupo in grupos.items()
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m app.data.consultas_lentas",
+        description="Agrega o log de consultas lentas por statement normalizado",
+    )
+    parser.add_argument("arquivo", nargs="?", default=settings.SQL_LENTAS_ARQUIVO)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--ordenar", choices=["total_ms", "media_ms", "max_ms", "contagem"], default="total_ms")
+    args = parser.parse_args()
+
+    arquivos = sorted(glob.glob(f"{glob.escape(args.arquivo)}*"))
+    if not arquivos:
+        print(f"Nenhum log encontrado em {args.arquivo}")
+        sys.exit(1)
+
+    resultado = sorted(agregar(arquivos), key=lambda grupo: grupo[args.ordenar], reverse=True)
+    for posicao, grupo in enumerate(resultado[:args.top], start=1):
+        print(f"#{posicao} {grupo['contagem']}x  total {grupo['total_ms']:.1f}ms  "
+              f"média {grupo['media_ms']:.1f}ms  máx {grupo['max_ms']:.1f}ms")
+        print(f"    origem: {', '.join(grupo['origens'])}")
+        print(f"    {grupo['sql'][:300]}")
+
+
+if __name__ == "__main__":
+    main()
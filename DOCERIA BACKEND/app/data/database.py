@@ -1,12 +1,66 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from fastapi.concurrency import run_in_threadpool
 from app.config import settings
+from app.data.sqlite_profile import connect_args_sqlite, configurar_engine_sqlite
 
 engine = create_engine(
-    settings.DATABASE_URL, 
-    connect_args={"check_same_thread": False}
+    settings.DATABASE_URL,
+    connect_args=connect_args_sqlite() if settings.DATABASE_URL.startswith("sqlite") else {}
 )
+configurar_engine_sqlite(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
+
+
+def _url_assincrona(url: str) -> str:
+    """Converte a DATABASE_URL para o driver assíncrono equivalente"""
+    if url.startswith("sqlite:///"):
+        return url.replace("sqlite:///", "sqlite+aiosqlite:///", 1)
+    if url.startswith("postgresql://") or url.startswith("postgres://"):
+        return "postgresql+asyncpg://" + url.split("://", 1)[1]
+    return url
+
+
+# Engine assíncrona (aiosqlite localmente, asyncpg no Postgres).
+# Só é criada quando DB_ASYNC está ativo, para não exigir os drivers no modo síncrono.
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.DB_ASYNC:
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+
+    async_url = settings.ASYNC_DATABASE_URL or _url_assincrona(settings.DATABASE_URL)
+    async_engine = create_async_engine(
+        async_url,
+        connect_args=connect_args_sqlite() if async_url.startswith("sqlite") else {}
+    )
+    configurar_engine_sqlite(async_engine.sync_engine)
+    # expire_on_commit=False: os objetos são serializados fora da sessão,
+    # onde um recarregamento implícito não é permitido
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+
+
+def insert_dialeto(db):
+    """insert() com ON CONFLICT (UPSERT) do banco da sessão: SQLite ou PostgreSQL"""
+    from sqlalchemy.dialects import postgresql, sqlite
+
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert
+    return sqlite.insert
+
+
+async def executar(db, metodo, *args, **kwargs):
+    """
+    Executa um método síncrono de serviço com a sessão recebida.
+
+    Com AsyncSession o método roda via run_sync (I/O assíncrono, sem ocupar
+    threads); com Session comum roda no threadpool, como nas rotas síncronas.
+    """
+    if AsyncSessionLocal is not None and isinstance(db, AsyncSession):
+        return await db.run_sync(metodo, *args, **kwargs)
+    return await run_in_threadpool(metodo, db, *args, **kwargs)
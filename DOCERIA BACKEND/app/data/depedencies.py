@@ -1,8 +1,10 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from app.data.database import SessionLocal
+from app.data.database import SessionLocal, AsyncSessionLocal
+from app.data import replica
 from app.services.token_service import verificar_token
+from app.config import settings
 
 # Trocar OAuth2PasswordBearer por HTTPBearer:
 bearer_scheme = HTTPBearer(auto_error=True)
@@ -14,6 +16,28 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def get_read_db(request: Request):
+    """
+    Sessão para rotas GET pesadas: usa o banco de leitura quando configurado,
+    exceto logo após uma escrita do mesmo cliente (read-your-writes)
+    """
+    if not replica.replica_ativa() or replica.escreveu_recentemente(request):
+        db = SessionLocal()
+    else:
+        db = replica.SessionLeitura()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# Sessão usada pelas rotas de pedidos, pagamentos e clientes:
+# AsyncSession quando DB_ASYNC está ativo, Session comum caso contrário
+get_service_db = get_async_db if settings.DB_ASYNC else get_db
+
 def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)):
     """
     Valida o JWT enviado em Authorization: Bearer <token>
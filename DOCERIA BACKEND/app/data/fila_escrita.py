@@ -0,0 +1,159 @@
+"""
+Fila de escrita única: serializa as operações de escrita em uma thread dedicada
+
+Cada operação roda em um SAVEPOINT próprio dentro de uma transação compartilhada
+pelo lote (group commit). Os commits feitos pelos serviços apenas liberam o
+savepoint; o lote inteiro é gravado com um único COMMIT e só então os resultados
+são devolvidos às requisições que aguardam.
+"""
+import asyncio
+import contextvars
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.data.database import executar
+from app.data.sqlite_profile import connect_args_sqlite, configurar_engine_sqlite, habilitar_transacoes_explicitas
+
+logger = logging.getLogger(__name__)
+
+
+class _Operacao:
+    def __init__(self, metodo, args, kwargs):
+        self.metodo = metodo
+        self.args = args
+        self.kwargs = kwargs
+        # Contexto da requisição (monitoramento de consultas) propagado para a thread de escrita
+        self.contexto = contextvars.copy_context()
+        self.future = Future()
+        self.resultado = None
+        self.erro = None
+
+
+class FilaEscrita:
+    """Thread única de escrita com agrupamento de commits"""
+
+    def __init__(self, database_url: str, lote_max: int = 32, janela_ms: int = 2):
+        self.lote_max = lote_max
+        self.janela = janela_ms / 1000
+        self._fila = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+        sqlite = database_url.startswith("sqlite")
+        self.engine = create_engine(
+            database_url,
+            connect_args=connect_args_sqlite() if sqlite else {},
+            pool_size=1,
+        )
+        if sqlite:
+            configurar_engine_sqlite(self.engine)
+            # BEGIN IMMEDIATE reserva a trava de escrita já no início do lote
+            habilitar_transacoes_explicitas(self.engine, "BEGIN IMMEDIATE")
+
+    def enviar(self, metodo, *args, **kwargs) -> Future:
+        """Enfileira `metodo(session, *args, **kwargs)` e retorna um Future com o resultado"""
+        self._iniciar()
+        operacao = _Operacao(metodo, args, kwargs)
+        self._fila.put(operacao)
+        return operacao.future
+
+    def _iniciar(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="fila-escrita", daemon=True)
+                self._thread.start()
+
+    def _proximo_lote(self) -> list:
+        lote = [self._fila.get()]
+        limite = time.monotonic() + self.janela
+        while len(lote) < self.lote_max:
+            restante = limite - time.monotonic()
+            try:
+                lote.append(self._fila.get(timeout=restante) if restante > 0 else self._fila.get_nowait())
+            except queue.Empty:
+                break
+        return lote
+
+    def _loop(self):
+        while True:
+            # Marca as operações como em execução; as canceladas enquanto esperavam
+            # na fila (cliente desconectou, timeout) são descartadas sem rodar
+            lote = [operacao for operacao in self._proximo_lote() if operacao.future.set_running_or_notify_cancel()]
+            if not lote:
+                continue
+            try:
+                self._executar_lote(lote)
+            except Exception as e:
+                logger.error(f"Erro ao gravar lote de {len(lote)} operações: {e}", exc_info=True)
+                for operacao in lote:
+                    operacao.erro = e
+            for operacao in lote:
+                self._entregar(operacao)
+
+    @staticmethod
+    def _entregar(operacao: _Operacao):
+        """Devolve o resultado à requisição; um Future inválido não pode derrubar a thread"""
+        try:
+            if operacao.erro is not None:
+                operacao.future.set_exception(operacao.erro)
+            else:
+                operacao.future.set_result(operacao.resultado)
+        except InvalidStateError as e:
+            logger.warning(f"Resultado de {operacao.metodo.__qualname__} descartado: {e}")
+
+    def _executar_lote(self, lote: list):
+        with self.engine.connect() as conn:
+            transacao = conn.begin()
+            for operacao in lote:
+                db = Session(
+                    bind=conn,
+                    join_transaction_mode="create_savepoint",
+                    autoflush=False,
+                    expire_on_commit=False,
+                )
+                try:
+                    operacao.resultado = operacao.contexto.run(
+                        operacao.metodo, db, *operacao.args, **operacao.kwargs
+                    )
+                except Exception as e:
+                    db.rollback()
+                    operacao.erro = e
+                finally:
+                    db.close()
+            transacao.commit()
+
+
+_fila = None
+_fila_lock = threading.Lock()
+
+
+def get_fila_escrita() -> FilaEscrita:
+    global _fila
+    if _fila is None:
+        with _fila_lock:
+            if _fila is None:
+                _fila = FilaEscrita(
+                    settings.DATABASE_URL,
+                    lote_max=settings.FILA_ESCRITA_LOTE_MAX,
+                    janela_ms=settings.FILA_ESCRITA_JANELA_MS,
+                )
+    return _fila
+
+
+async def executar_escrita(db, metodo, *args, **kwargs):
+    """
+    Executa uma operação de escrita de serviço.
+
+    Com FILA_ESCRITA_ATIVA a operação vai para a fila de escrita única (a sessão
+    da requisição não é usada); caso contrário roda como `executar`.
+    """
+    if settings.FILA_ESCRITA_ATIVA:
+        return await asyncio.wrap_future(get_fila_escrita().enviar(metodo, *args, **kwargs))
+    return await executar(db, metodo, *args, **kwargs)
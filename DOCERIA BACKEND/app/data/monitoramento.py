@@ -0,0 +1,120 @@
+"""
+Contagem de consultas SQL por requisição, detecção de N+1 e log de consultas lentas
+
+Os eventos de cursor do SQLAlchemy (registrados em todas as engines) acumulam,
+na requisição em andamento, o número de statements e o tempo total no banco. O
+middleware `monitorar_consultas` publica os totais nos headers X-DB-* e no log.
+
+Suspeita de N+1: o mesmo SQL executado SQL_N_MAIS_1_LIMITE vezes ou mais com
+parâmetros diferentes (ex.: lazy load de itens, um SELECT por item do pedido).
+
+Orçamento por rota: SQL_ORCAMENTO_ROTAS ({"POST /pedidos/": 20}) ou
+SQL_ORCAMENTO_PADRAO. Exceder o orçamento gera warning no log; com
+ENVIRONMENT=testing gera OrcamentoConsultasExcedido, falhando o teste.
+
+Consultas acima de SQL_LENTAS_LIMITE_MS vão para o log de consultas lentas
+(ver app/data/consultas_lentas.py).
+"""
+import logging
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Optional
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import settings
+from app.data.consultas_lentas import registrar_consulta_lenta
+
+logger = logging.getLogger(__name__)
+
+
+class OrcamentoConsultasExcedido(RuntimeError):
+    """Requisição executou mais consultas que o orçamento da rota (apenas em testing)"""
+
+
+class ConsultasRequisicao:
+    """Consultas executadas durante uma requisição"""
+
+    def __init__(self):
+        self.total = 0
+        self.tempo = 0.0
+        self._parametros = defaultdict(set)
+
+    def registrar(self, statement: str, parameters, duracao: float):
+        self.total += 1
+        self.tempo += duracao
+        self._parametros[statement].add(hash(repr(parameters)))
+
+    def suspeitas_n_mais_1(self, limite: int) -> list[tuple[str, int]]:
+        """SQLs repetidos com `limite` ou mais conjuntos de parâmetros distintos"""
+        return sorted(
+            ((statement, len(valores)) for statement, valores in self._parametros.items()
+             if len(valores) >= limite),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+
+
+_requisicao_atual: ContextVar[Optional[ConsultasRequisicao]] = ContextVar("consultas_requisicao", default=None)
+
+
+def _antes_de_executar(conn, cursor, statement, parameters, context, executemany):
+    if _requisicao_atual.get() is not None or settings.SQL_LENTAS_LIMITE_MS:
+        conn.info.setdefault("inicio_consulta", []).append(time.perf_counter())
+
+
+def _depois_de_executar(conn, cursor, statement, parameters, context, executemany):
+    inicios = conn.info.get("inicio_consulta")
+    if not inicios:
+        return
+    duracao = time.perf_counter() - inicios.pop()
+
+    consultas = _requisicao_atual.get()
+    if consultas is not None:
+        consultas.registrar(statement, parameters, duracao)
+    if settings.SQL_LENTAS_LIMITE_MS and duracao * 1000 >= settings.SQL_LENTAS_LIMITE_MS:
+        registrar_consulta_lenta(statement, parameters, duracao, executemany)
+
+
+def registrar_eventos():
+    """Registra os eventos de cursor em todas as engines (principal, leitura, assíncrona e fila)"""
+    if not event.contains(Engine, "before_cursor_execute", _antes_de_executar):
+        event.listen(Engine, "before_cursor_execute", _antes_de_executar)
+        event.listen(Engine, "after_cursor_execute", _depois_de_executar)
+
+
+def orcamento_rota(chave: str) -> int:
+    """Máximo de consultas da rota ("MÉTODO /caminho"); 0 = sem limite"""
+    return settings.SQL_ORCAMENTO_ROTAS.get(chave, settings.SQL_ORCAMENTO_PADRAO)
+
+
+async def monitorar_consultas(request: Request, call_next):
+    consultas = ConsultasRequisicao()
+    token = _requisicao_atual.set(consultas)
+    try:
+        response = await call_next(request)
+    finally:
+        _requisicao_atual.reset(token)
+
+    rota = request.scope.get("route")
+    chave = f"{request.method} {getattr(rota, 'path', request.url.path)}"
+    tempo_ms = consultas.tempo * 1000
+    suspeitas = consultas.suspeitas_n_mais_1(settings.SQL_N_MAIS_1_LIMITE)
+
+    response.headers["X-DB-Queries"] = str(consultas.total)
+    response.headers["X-DB-Time-Ms"] = f"{tempo_ms:.2f}"
+    response.headers["X-DB-N1-Suspects"] = str(len(suspeitas))
+
+    logger.info(f"{chave}: {consultas.total} consultas em {tempo_ms:.2f}ms")
+    for statement, vezes in suspeitas:
+        logger.warning(f"Possível N+1 em {chave}: {vezes}x {' '.join(statement.split())[:200]}")
+
+    orcamento = orcamento_rota(chave)
+    if orcamento and consultas.total > orcamento:
+        mensagem = f"{chave} executou {consultas.total} consultas (orçamento: {orcamento})"
+        if settings.ENVIRONMENT == "testing":
+            raise OrcamentoConsultasExcedido(mensagem)
+        logger.warning(mensagem)
+
+    return response
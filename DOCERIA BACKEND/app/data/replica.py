@@ -0,0 +1,159 @@
+"""
+Engine de leitura opcional para relatórios e catálogo
+
+Fonte das leituras, por ordem de prioridade:
+- READ_DATABASE_URL: réplica de leitura (ex.: réplica do Postgres)
+- SQLITE_SNAPSHOT_PATH: cópia local do SQLite atualizada periodicamente pela API de backup
+
+Read-your-writes: a resposta de uma escrita bem-sucedida leva o momento da
+escrita (cookie `ultima_escrita` e header X-Ultima-Escrita, em segundos Unix).
+O cliente devolve um dos dois nas leituras seguintes, que vão para o banco
+principal durante READ_YOUR_WRITES_S segundos (o frontend reenvia o header e
+os cookies em `safeFetch`, js/api.js). O estado fica com o cliente:
+vale com vários workers e não mistura clientes atrás do mesmo IP. Um valor
+forjado só leva o próprio cliente ao banco principal; momentos no futuro são
+ignorados.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from app.config import settings
+from app.data.sqlite_profile import connect_args_sqlite, configurar_engine_sqlite
+
+logger = logging.getLogger(__name__)
+
+METODOS_ESCRITA = {"POST", "PUT", "PATCH", "DELETE"}
+
+engine_leitura = None
+SessionLeitura = None
+_snapshot = None
+
+COOKIE_ULTIMA_ESCRITA = "ultima_escrita"
+HEADER_ULTIMA_ESCRITA = "X-Ultima-Escrita"
+TOLERANCIA_RELOGIO_S = 5  # Diferença aceita entre os relógios dos servidores
+
+
+def caminho_sqlite(url: str) -> str:
+    return url.replace("sqlite:///", "")
+
+
+def url_snapshot(caminho: str) -> str:
+    """Snapshot aberto como imutável: somente leitura, sem travas nem arquivo -wal"""
+    return f"sqlite:///file:{os.path.abspath(caminho)}?immutable=1&uri=true"
+
+
+class SnapshotSQLite:
+    """
+    Mantém uma cópia do banco principal, atualizada a cada `intervalo` segundos
+
+    A cópia é gravada em um arquivo temporário e trocada pelo snapshot com
+    os.replace (atômico): as conexões já abertas continuam lendo o arquivo
+    anterior inteiro e as novas abrem o novo, nunca um arquivo pela metade. O
+    snapshot fica em journal_mode=DELETE e é aberto como imutável (url_snapshot),
+    sem arquivos -wal/-shm compartilhados entre a cópia antiga e a nova.
+    """
+
+    def __init__(self, origem: str, destino: str, intervalo: int):
+        self.origem = origem
+        self.destino = destino
+        self.intervalo = intervalo
+        self._thread = None
+
+    def atualizar(self):
+        temporario = f"{self.destino}.tmp"
+        inicio = time.perf_counter()
+        origem = sqlite3.connect(self.origem)
+        try:
+            copia = sqlite3.connect(temporario)
+            try:
+                origem.backup(copia)
+                copia.execute("PRAGMA journal_mode=DELETE")
+            finally:
+                copia.close()
+        except Exception:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            raise
+        finally:
+            origem.close()
+        os.replace(temporario, self.destino)
+        logger.debug(f"Snapshot de leitura atualizado em {(time.perf_counter() - inicio) * 1000:.0f} ms")
+
+    def iniciar(self):
+        self.atualizar()
+        self._thread = threading.Thread(target=self._loop, name="snapshot-leitura", daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        while True:
+            time.sleep(self.intervalo)
+            try:
+                self.atualizar()
+            except Exception as e:
+                logger.error(f"Erro ao atualizar snapshot de leitura: {e}")
+
+
+if settings.READ_DATABASE_URL:
+    engine_leitura = create_engine(
+        settings.READ_DATABASE_URL,
+        connect_args=connect_args_sqlite() if settings.READ_DATABASE_URL.startswith("sqlite") else {}
+    )
+elif settings.SQLITE_SNAPSHOT_PATH and settings.DATABASE_URL.startswith("sqlite"):
+    _snapshot = SnapshotSQLite(
+        caminho_sqlite(settings.DATABASE_URL),
+        settings.SQLITE_SNAPSHOT_PATH,
+        settings.SQLITE_SNAPSHOT_INTERVALO_S,
+    )
+    # NullPool: cada sessão abre o arquivo de novo e enxerga sempre o snapshot mais recente
+    engine_leitura = create_engine(
+        url_snapshot(settings.SQLITE_SNAPSHOT_PATH),
+        connect_args=connect_args_sqlite(),
+        poolclass=NullPool,
+    )
+
+if engine_leitura is not None:
+    configurar_engine_sqlite(engine_leitura)
+    SessionLeitura = sessionmaker(autocommit=False, autoflush=False, bind=engine_leitura)
+
+
+def replica_ativa() -> bool:
+    return SessionLeitura is not None
+
+
+def iniciar_replica():
+    """Gera o primeiro snapshot e inicia a atualização periódica (apenas no modo snapshot)"""
+    if _snapshot is not None:
+        _snapshot.iniciar()
+        logger.info(f"Snapshot de leitura em {_snapshot.destino} (a cada {_snapshot.intervalo}s)")
+
+
+def registrar_escrita(response):
+    """Marca na resposta o momento da escrita (cookie e header)"""
+    momento = f"{time.time():.3f}"
+    response.headers[HEADER_ULTIMA_ESCRITA] = momento
+    response.set_cookie(
+        COOKIE_ULTIMA_ESCRITA, momento,
+        max_age=settings.READ_YOUR_WRITES_S, httponly=True, samesite="lax",
+    )
+
+
+def _ultima_escrita(request) -> Optional[float]:
+    valor = request.headers.get(HEADER_ULTIMA_ESCRITA) or request.cookies.get(COOKIE_ULTIMA_ESCRITA)
+    try:
+        return float(valor) if valor else None
+    except ValueError:
+        return None
+
+
+def escreveu_recentemente(request) -> bool:
+    momento = _ultima_escrita(request)
+    if momento is None:
+        return False
+    decorrido = time.time() - momento
+    return -TOLERANCIA_RELOGIO_S <= decorrido < settings.READ_YOUR_WRITES_S
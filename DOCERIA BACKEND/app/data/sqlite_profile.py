@@ -0,0 +1,126 @@
+"""
+Perfil de produção do SQLite: pragmas por conexão e retry em SQLITE_BUSY
+"""
+import logging
+import random
+import sqlite3
+import time
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _banco_ocupado(erro: Exception) -> bool:
+    mensagem = str(erro).lower()
+    return "database is locked" in mensagem or "database is busy" in mensagem
+
+
+def _com_retry(operacao, *args, conexao=None):
+    """
+    Executa a operação repetindo com backoff exponencial enquanto o banco estiver ocupado.
+
+    Com `conexao`, só repete comandos iniciados fora de transação. Dentro de uma
+    transação o erro sobe na hora: no WAL, um SQLITE_BUSY_SNAPSHOT (leitura
+    defasada tentando escrever) não se resolve repetindo o comando; a transação
+    inteira precisa ser desfeita e refeita por quem a abriu.
+    """
+    tentativas = settings.SQLITE_BUSY_RETRIES
+    espera = settings.SQLITE_BUSY_BACKOFF_MS / 1000
+    for tentativa in range(tentativas + 1):
+        fora_de_transacao = conexao is None or not conexao.in_transaction
+        try:
+            return operacao(*args)
+        except sqlite3.OperationalError as e:
+            if not _banco_ocupado(e) or not fora_de_transacao:
+                raise
+            if conexao is not None and conexao.in_transaction:
+                # Desfaz o BEGIN que o driver abriu para este comando: volta ao estado anterior
+                conexao.rollback()
+            if tentativa == tentativas:
+                raise
+            atraso = espera * (2 ** tentativa)
+            atraso += random.uniform(0, atraso)  # jitter para não sincronizar os retries
+            logger.warning(f"SQLite ocupado, tentativa {tentativa + 1}/{tentativas} em {atraso * 1000:.0f} ms")
+            time.sleep(atraso)
+
+
+class CursorComRetry(sqlite3.Cursor):
+    """
+    Cursor que repete comandos recusados com SQLITE_BUSY quando iniciados fora de
+    transação (o BEGIN ou o primeiro INSERT/UPDATE/DELETE, que abre a transação)
+    """
+
+    def execute(self, sql, parameters=()):
+        return _com_retry(super().execute, sql, parameters, conexao=self.connection)
+
+    def executemany(self, sql, seq_of_parameters):
+        return _com_retry(super().executemany, sql, list(seq_of_parameters), conexao=self.connection)
+
+
+class ConexaoComRetry(sqlite3.Connection):
+    """
+    Conexão sqlite3 usada como `factory`: cursores com retry e commit com retry
+    (um COMMIT recusado com SQLITE_BUSY mantém a transação e pode ser repetido)
+    """
+
+    def cursor(self, factory=CursorComRetry):
+        return super().cursor(factory)
+
+    def commit(self):
+        return _com_retry(super().commit)
+
+
+def connect_args_sqlite() -> dict:
+    """Argumentos de conexão do driver para o perfil SQLite"""
+    args = {"check_same_thread": False}
+    if settings.SQLITE_PERFIL_PRODUCAO:
+        args["factory"] = ConexaoComRetry
+        args["timeout"] = settings.SQLITE_BUSY_TIMEOUT_MS / 1000
+    return args
+
+
+def aplicar_pragmas(dbapi_connection, connection_record):
+    """Listener do evento `connect`: aplica os pragmas configurados em cada nova conexão"""
+    pragmas = [
+        f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}",
+        f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA cache_size={settings.SQLITE_CACHE_SIZE}",
+        f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}",
+        f"PRAGMA temp_store={settings.SQLITE_TEMP_STORE}",
+        f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+    ]
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in pragmas:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def configurar_engine_sqlite(engine):
+    """Registra os pragmas na engine (para engines assíncronas, passar `sync_engine`)"""
+    from sqlalchemy import event
+
+    if engine.dialect.name == "sqlite" and settings.SQLITE_PERFIL_PRODUCAO:
+        event.listen(engine, "connect", aplicar_pragmas)
+
+
+def habilitar_transacoes_explicitas(engine, begin: str = "BEGIN"):
+    """
+    Desliga o controle de transação do driver sqlite3 e emite o BEGIN manualmente.
+
+    O driver só abre transação antes de INSERT/UPDATE/DELETE, o que deixa DDL e
+    SAVEPOINTs fora da transação. Necessário para migrações atômicas e savepoints.
+    """
+    from sqlalchemy import event
+
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def _desativar_transacao_do_driver(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql(begin)
@@ -1,8 +1,16 @@
 import logging
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.datastructures import Default
 from fastapi.middleware.cors import CORSMiddleware
-from app.data.database import Base, engine
+from app.data.database import engine, SessionLocal
+from app.migrations import migracoes_pendentes
 from app.config import settings
+from app.data.compressao import CompressaoMiddleware
+from app.services import resumo_diario
+from app.services.serializacao import RespostaJSON
+from app.data.replica import (
+    replica_ativa, iniciar_replica, registrar_escrita, METODOS_ESCRITA, HEADER_ULTIMA_ESCRITA,
+)
 from app.controllers import (
     auth_controller,
     categoria_controller,
@@ -13,6 +21,7 @@ from app.controllers import (
     cliente_controller,
     pedido_controller,
     pagamento_controller,
+    monitoramento_controller,
 )
 
 # Configurar logging
@@ -25,7 +34,10 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="API Doceria",
     description="API para sistema de doceria Doce Encanto",
-    version="1.0.0"
+    version="1.0.0",
+    # Default(...) mantém o caminho do FastAPI que gera os bytes no pydantic-core
+    # nas rotas com response_model; as demais usam RespostaJSON (orjson)
+    default_response_class=Default(RespostaJSON),
 )
 
 # Configurar CORS com origens específicas
@@ -38,12 +50,45 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", HEADER_ULTIMA_ESCRITA],
 )
 
+# Compressão gzip/brotli das respostas JSON grandes (listagens)
+if settings.COMPRESSAO_ATIVA:
+    app.add_middleware(CompressaoMiddleware)
+
 logger.info(f"Aplicacao iniciada em modo {settings.ENVIRONMENT}")
 logger.info(f"CORS configurado para origens: {settings.CORS_ORIGINS}")
 
-Base.metadata.create_all(bind=engine)
+# O schema é mantido pelas migrações (python -m app.migrations), executadas no deploy
+pendentes = migracoes_pendentes(engine)
+if pendentes:
+    logger.warning(
+        f"Banco de dados desatualizado: {len(pendentes)} migração(ões) pendente(s). "
+        "Execute: python -m app.migrations"
+    )
+else:
+    # Resumos diários calculados em outro fuso não podem receber os deltas do fuso atual
+    with SessionLocal() as db:
+        resumo_diario.verificar_fuso(db)
+
+# Contagem de consultas SQL por requisição e log de consultas lentas
+if settings.SQL_MONITORAMENTO_ATIVO or settings.SQL_LENTAS_LIMITE_MS:
+    from app.data.monitoramento import registrar_eventos, monitorar_consultas
+    registrar_eventos()
+    if settings.SQL_MONITORAMENTO_ATIVO:
+        app.middleware("http")(monitorar_consultas)
+
+# Banco de leitura opcional (réplica ou snapshot SQLite)
+if replica_ativa():
+    iniciar_replica()
+
+    @app.middleware("http")
+    async def read_your_writes(request: Request, call_next):
+        response = await call_next(request)
+        if request.method in METODOS_ESCRITA and response.status_code < 400:
+            registrar_escrita(response)
+        return response
 
 # Rotas públicas
 app.include_router(auth_controller.router)
@@ -63,3 +108,6 @@ app.include_router(pedido_controller.router)
 
 # Rotas de pagamentos
 app.include_router(pagamento_controller.router)
+
+# Monitoramento (métricas de compressão)
+app.include_router(monitoramento_controller.router)
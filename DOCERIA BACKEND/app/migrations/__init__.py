@@ -0,0 +1,212 @@
+"""
+Migrações versionadas do banco de dados
+
+Cada arquivo em `app/migrations/versoes/` (vNNNN_descricao.py) define:
+    VERSAO: int
+    DESCRICAO: str
+    def aplicar(ctx: Contexto): ...
+
+As migrações rodam uma única vez, em ordem, no deploy:
+    python -m app.migrations            # aplica as pendentes
+    python -m app.migrations status     # mostra a versão atual e as pendentes
+
+A versão aplicada fica registrada na tabela `schema_versoes`. Cada migração roda
+em uma transação própria: se falhar, nada dela é gravado.
+"""
+import importlib
+import logging
+import pkgutil
+import time
+from datetime import datetime
+from sqlalchemy import (
+    MetaData, Table, Column, Integer, String, DateTime, UniqueConstraint, ForeignKeyConstraint,
+    CheckConstraint, create_engine, inspect, select, text,
+)
+from sqlalchemy.schema import CreateIndex
+from app.config import settings
+from app.data.sqlite_profile import connect_args_sqlite, configurar_engine_sqlite, habilitar_transacoes_explicitas
+
+logger = logging.getLogger(__name__)
+
+_metadata = MetaData()
+
+schema_versoes = Table(
+    "schema_versoes", _metadata,
+    Column("versao", Integer, primary_key=True),
+    Column("descricao", String, nullable=False),
+    Column("aplicada_em", DateTime, nullable=False),
+)
+
+
+class Migracao:
+    def __init__(self, modulo):
+        self.versao = modulo.VERSAO
+        self.descricao = modulo.DESCRICAO
+        self.aplicar = modulo.aplicar
+
+    def __repr__(self):
+        return f"v{self.versao:04d} {self.descricao}"
+
+
+class Contexto:
+    """Conexão da migração em andamento e utilitários para operações em lote"""
+
+    def __init__(self, conn, lote: int, informar):
+        self.conn = conn
+        self.lote = lote
+        self.informar = informar
+
+    @property
+    def dialeto(self) -> str:
+        return self.conn.dialect.name
+
+    def tabela(self, nome: str) -> Table:
+        """Reflete a definição atual de uma tabela"""
+        return Table(nome, MetaData(), autoload_with=self.conn)
+
+    def existe_tabela(self, nome: str) -> bool:
+        return inspect(self.conn).has_table(nome)
+
+    def colunas(self, tabela: str) -> set:
+        return {c["name"] for c in inspect(self.conn).get_columns(tabela)}
+
+    def indices(self, tabela: str) -> set:
+        return {i["name"] for i in inspect(self.conn).get_indexes(tabela)}
+
+    def copiar_em_lotes(self, origem: str, destino: str, colunas: list):
+        """Copia as linhas de `origem` para `destino` em lotes ordenados por id"""
+        lista = ", ".join(colunas)
+        total = self.conn.execute(text(f"SELECT COUNT(*) FROM {origem}")).scalar()
+        copiadas = 0
+        ultimo_id = None
+        while True:
+            filtro = "" if ultimo_id is None else "WHERE id > :ultimo"
+            ids = self.conn.execute(
+                text(f"SELECT id FROM {origem} {filtro} ORDER BY id LIMIT :lote"),
+                {"ultimo": ultimo_id, "lote": self.lote}
+            ).scalars().all()
+            if not ids:
+                break
+            self.conn.execute(
+                text(f"INSERT INTO {destino} ({lista}) SELECT {lista} FROM {origem} "
+                     f"WHERE id >= :primeiro AND id <= :ultimo"),
+                {"primeiro": ids[0], "ultimo": ids[-1]}
+            )
+            ultimo_id = ids[-1]
+            copiadas += len(ids)
+            self.informar(f"  {origem}: {copiadas}/{total} linhas copiadas ({copiadas * 100 // max(total, 1)}%)")
+
+    def recriar_tabela(self, tabela: Table):
+        """
+        Recria a tabela com a definição informada, preservando os dados.
+
+        Procedimento do SQLite para alterar colunas: cria a tabela nova, copia em
+        lotes, remove a antiga, renomeia a nova e recria os índices.
+        """
+        nome = tabela.name
+        nova = Table(f"{nome}_nova", MetaData())
+        for coluna in tabela.columns:
+            nova.append_column(Column(
+                coluna.name, coluna.type,
+                primary_key=coluna.primary_key,
+                nullable=coluna.nullable,
+                server_default=coluna.server_default._copy() if coluna.server_default is not None else None,
+            ))
+        # list(): _copy() registra a cópia na tabela de origem enquanto o conjunto é percorrido
+        for constraint in list(tabela.constraints):
+            if isinstance(constraint, (UniqueConstraint, ForeignKeyConstraint, CheckConstraint)):
+                nova.append_constraint(constraint._copy(target_table=nova))
+        nova.create(self.conn)
+
+        self.copiar_em_lotes(nome, nova.name, [c.name for c in tabela.columns])
+        self.conn.execute(text(f"DROP TABLE {nome}"))
+        self.conn.execute(text(f"ALTER TABLE {nova.name} RENAME TO {nome}"))
+        for indice in tabela.indexes:
+            self.conn.execute(CreateIndex(indice))
+
+    def preencher_em_lotes(self, tabela: str, calcular, colunas_origem: list, filtro: str = "1 = 1"):
+        """
+        Backfill em lotes: para cada linha que satisfaz `filtro`, grava o dicionário
+        retornado por `calcular(linha)` (colunas -> valores).
+        """
+        total = self.conn.execute(text(f"SELECT COUNT(*) FROM {tabela} WHERE {filtro}")).scalar()
+        processadas = 0
+        ultimo_id = 0
+        lista = ", ".join(["id"] + colunas_origem)
+        while True:
+            linhas = self.conn.execute(
+                text(f"SELECT {lista} FROM {tabela} WHERE id > :ultimo AND ({filtro}) ORDER BY id LIMIT :lote"),
+                {"ultimo": ultimo_id, "lote": self.lote}
+            ).mappings().all()
+            if not linhas:
+                break
+            valores = [dict(calcular(linha), _id=linha["id"]) for linha in linhas]
+            atribuicoes = ", ".join(f"{c} = :{c}" for c in valores[0] if c != "_id")
+            self.conn.execute(text(f"UPDATE {tabela} SET {atribuicoes} WHERE id = :_id"), valores)
+            ultimo_id = linhas[-1]["id"]
+            processadas += len(linhas)
+            self.informar(f"  {tabela}: {processadas}/{total} linhas atualizadas ({processadas * 100 // max(total, 1)}%)")
+
+
+def carregar_migracoes() -> list[Migracao]:
+    from app.migrations import versoes
+
+    migracoes = []
+    for info in pkgutil.iter_modules(versoes.__path__):
+        if info.name.startswith("v"):
+            migracoes.append(Migracao(importlib.import_module(f"{versoes.__name__}.{info.name}")))
+    migracoes.sort(key=lambda m: m.versao)
+    versoes_vistas = [m.versao for m in migracoes]
+    if len(versoes_vistas) != len(set(versoes_vistas)):
+        raise RuntimeError(f"Versões de migração duplicadas: {versoes_vistas}")
+    return migracoes
+
+
+def criar_engine_migracao(database_url: str = None):
+    """Engine com transações explícitas, para que DDL e dados sejam atômicos no SQLite"""
+    url = database_url or settings.DATABASE_URL
+    engine = create_engine(url, connect_args=connect_args_sqlite() if url.startswith("sqlite") else {})
+    configurar_engine_sqlite(engine)
+    habilitar_transacoes_explicitas(engine)
+    return engine
+
+
+def versoes_aplicadas(conn) -> set:
+    if not inspect(conn).has_table(schema_versoes.name):
+        return set()
+    return set(conn.execute(select(schema_versoes.c.versao)).scalars().all())
+
+
+def migracoes_pendentes(engine) -> list[Migracao]:
+    with engine.connect() as conn:
+        aplicadas = versoes_aplicadas(conn)
+    return [m for m in carregar_migracoes() if m.versao not in aplicadas]
+
+
+def versao_atual(engine) -> int:
+    with engine.connect() as conn:
+        return max(versoes_aplicadas(conn), default=0)
+
+
+def aplicar_migracoes(engine=None, ate: int = None, lote: int = 5000, informar=logger.info) -> list[Migracao]:
+    """Aplica em ordem as migrações pendentes (até a versão `ate`, se informada)"""
+    engine = engine or criar_engine_migracao()
+    with engine.begin() as conn:
+        _metadata.create_all(conn)
+
+    aplicadas = []
+    for migracao in migracoes_pendentes(engine):
+        if ate is not None and migracao.versao > ate:
+            break
+        informar(f"Aplicando {migracao}...")
+        inicio = time.perf_counter()
+        with engine.begin() as conn:
+            migracao.aplicar(Contexto(conn, lote, informar))
+            conn.execute(schema_versoes.insert().values(
+                versao=migracao.versao,
+                descricao=migracao.descricao,
+                aplicada_em=datetime.utcnow(),
+            ))
+        informar(f"{migracao} aplicada em {time.perf_counter() - inicio:.2f}s")
+        aplicadas.append(migracao)
+    return aplicadas
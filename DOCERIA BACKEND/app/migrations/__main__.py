@@ -0,0 +1,45 @@
+"""
+CLI de migrações. Execute na pasta DOCERIA BACKEND, uma vez por deploy:
+
+    python -m app.migrations                 # aplica todas as migrações pendentes
+    python -m app.migrations status          # versão atual e migrações pendentes
+    python -m app.migrations --ate 3         # aplica até a versão 3
+    python -m app.migrations --lote 20000    # tamanho do lote nas cópias/backfills
+"""
+import argparse
+import sys
+from app.migrations import aplicar_migracoes, criar_engine_migracao, migracoes_pendentes, versao_atual
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m app.migrations", description="Migrações do banco de dados")
+    parser.add_argument("comando", nargs="?", default="aplicar", choices=["aplicar", "status"])
+    parser.add_argument("--ate", type=int, default=None, help="Versão máxima a aplicar")
+    parser.add_argument("--lote", type=int, default=5000, help="Linhas por lote em cópias e backfills")
+    parser.add_argument("--database-url", default=None, help="Padrão: DATABASE_URL das configurações")
+    args = parser.parse_args()
+
+    engine = criar_engine_migracao(args.database_url)
+
+    if args.comando == "status":
+        print(f"Versão atual: {versao_atual(engine)}")
+        pendentes = migracoes_pendentes(engine)
+        if not pendentes:
+            print("Nenhuma migração pendente.")
+        for migracao in pendentes:
+            print(f"  pendente: {migracao}")
+        return
+
+    try:
+        aplicadas = aplicar_migracoes(engine, ate=args.ate, lote=args.lote, informar=print)
+    except Exception as e:
+        print(f"Erro ao aplicar migrações: {e}")
+        sys.exit(1)
+
+    if not aplicadas:
+        print("Banco já está atualizado.")
+    print(f"Versão atual: {versao_atual(engine)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Schema inicial (equivalente ao antigo Base.metadata.create_all)
+
+Definição congelada: alterações posteriores nos models entram em novas migrações.
+Em bancos já existentes, as tabelas presentes são mantidas (checkfirst).
+"""
+from sqlalchemy import MetaData, Table, Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey
+
+VERSAO = 1
+DESCRICAO = "Schema inicial"
+
+metadata = MetaData()
+
+Table(
+    "users", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("nome", String),
+    Column("email", String, unique=True, index=True),
+    Column("senha", String),
+)
+
+Table(
+    "categorias", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("nome", String, unique=True),
+)
+
+Table(
+    "produtos", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("nome", String, unique=True),
+    Column("descricao", String),
+    Column("preco", Float),
+    Column("categoria_id", Integer, ForeignKey("categorias.id")),
+)
+
+Table(
+    "contatos", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("nome", String),
+    Column("email", String, index=True),
+    Column("telefone", String, nullable=True),
+    Column("numero_pessoas", Integer, nullable=True),
+    Column("tipo_evento", String, nullable=True),
+    Column("data", String, nullable=True),
+    Column("local", String, nullable=True),
+    Column("observacao", Text, nullable=True),
+)
+
+Table(
+    "eventos", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("titulo", String),
+    Column("descricao", String),
+    Column("data", String),
+)
+
+Table(
+    "kits", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("nome", String),
+    Column("descricao", String),
+    Column("preco", Float),
+)
+
+Table(
+    "clientes", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("nome", String, nullable=False),
+    Column("email", String, unique=True, index=True, nullable=False),
+    Column("telefone", String, nullable=True),
+    Column("cpf", String, unique=True, index=True, nullable=True),
+    Column("endereco", String, nullable=True),
+    Column("numero", String, nullable=True),
+    Column("complemento", String, nullable=True),
+    Column("bairro", String, nullable=True),
+    Column("cidade", String, nullable=True),
+    Column("estado", String, nullable=True),
+    Column("cep", String, nullable=True),
+    Column("data_nascimento", String, nullable=True),
+    Column("observacoes", String, nullable=True),
+    Column("ativo", Boolean),
+    Column("data_cadastro", DateTime),
+    Column("data_atualizacao", DateTime),
+)
+
+Table(
+    "pedidos", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("numero_pedido", String, unique=True, index=True),
+    Column("cliente_id", Integer, ForeignKey("clientes.id"), nullable=False),
+    Column("status", String),
+    Column("tipo_entrega", String),
+    Column("data_pedido", DateTime),
+    Column("data_entrega", String, nullable=True),
+    Column("hora_entrega", String, nullable=True),
+    Column("endereco_entrega", String, nullable=True),
+    Column("numero_entrega", String, nullable=True),
+    Column("complemento_entrega", String, nullable=True),
+    Column("bairro_entrega", String, nullable=True),
+    Column("cidade_entrega", String, nullable=True),
+    Column("estado_entrega", String, nullable=True),
+    Column("cep_entrega", String, nullable=True),
+    Column("subtotal", Float),
+    Column("desconto", Float),
+    Column("taxa_entrega", Float),
+    Column("total", Float),
+    Column("forma_pagamento", String, nullable=True),
+    Column("troco_para", Float, nullable=True),
+    Column("observacoes", Text, nullable=True),
+    Column("data_criacao", DateTime),
+    Column("data_atualizacao", DateTime),
+)
+
+Table(
+    "itens_pedido", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("pedido_id", Integer, ForeignKey("pedidos.id"), nullable=False),
+    Column("produto_id", Integer, ForeignKey("produtos.id"), nullable=True),
+    Column("kit_id", Integer, ForeignKey("kits.id"), nullable=True),
+    Column("nome_item", String, nullable=False),
+    Column("descricao_item", String, nullable=True),
+    Column("quantidade", Integer),
+    Column("preco_unitario", Float, nullable=False),
+    Column("subtotal", Float, nullable=False),
+    Column("observacoes", Text, nullable=True),
+)
+
+Table(
+    "pagamentos", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("pedido_id", Integer, ForeignKey("pedidos.id"), nullable=False),
+    Column("valor", Float, nullable=False),
+    Column("valor_pago", Float),
+    Column("troco", Float),
+    Column("forma_pagamento", String, nullable=False),
+    Column("status", String),
+    Column("bandeira_cartao", String, nullable=True),
+    Column("ultimos_digitos", String, nullable=True),
+    Column("parcelas", Integer),
+    Column("chave_pix", String, nullable=True),
+    Column("codigo_pix", String, nullable=True),
+    Column("comprovante", Text, nullable=True),
+    Column("codigo_barras", String, nullable=True),
+    Column("linha_digitavel", String, nullable=True),
+    Column("data_vencimento", String, nullable=True),
+    Column("codigo_transacao", String, nullable=True, index=True),
+    Column("codigo_autorizacao", String, nullable=True),
+    Column("nsu", String, nullable=True),
+    Column("data_criacao", DateTime),
+    Column("data_pagamento", DateTime, nullable=True),
+    Column("data_estorno", DateTime, nullable=True),
+    Column("observacoes", Text, nullable=True),
+    Column("motivo_recusa", String, nullable=True),
+    Column("motivo_estorno", String, nullable=True),
+)
+
+Table(
+    "historico_pagamentos", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("pagamento_id", Integer, ForeignKey("pagamentos.id"), nullable=False),
+    Column("status_anterior", String, nullable=True),
+    Column("status_novo", String, nullable=False),
+    Column("descricao", String, nullable=True),
+    Column("usuario_id", Integer, nullable=True),
+    Column("data_alteracao", DateTime),
+)
+
+
+def aplicar(ctx):
+    metadata.create_all(ctx.conn, checkfirst=True)
@@ -0,0 +1,23 @@
+"""
+Permite telefone NULL em clientes
+
+Substitui fix_telefone.py, migrate_telefone_nullable.py e a migração automática
+que rodava dentro de ClienteService.criar. Bancos antigos foram criados com
+telefone NOT NULL; como o SQLite não remove NOT NULL com ALTER TABLE, a tabela
+é recriada com cópia em lotes.
+"""
+VERSAO = 2
+DESCRICAO = "Telefone do cliente opcional"
+
+
+def aplicar(ctx):
+    clientes = ctx.tabela("clientes")
+    if clientes.c.telefone.nullable:
+        ctx.informar("  clientes.telefone já aceita NULL, nada a fazer")
+        return
+
+    if ctx.dialeto == "sqlite":
+        clientes.c.telefone.nullable = True
+        ctx.recriar_tabela(clientes)
+    else:
+        ctx.conn.exec_driver_sql("ALTER TABLE clientes ALTER COLUMN telefone DROP NOT NULL")
@@ -0,0 +1,35 @@
+"""
+Índices compostos para os filtros e ordenações usados pelos serviços
+"""
+from sqlalchemy import Index
+
+VERSAO = 3
+DESCRICAO = "Índices compostos de pedidos, itens, pagamentos e histórico"
+
+INDICES = {
+    "pedidos": [
+        ("ix_pedidos_status_data_pedido", ["status", "data_pedido"]),
+        ("ix_pedidos_cliente_data_pedido", ["cliente_id", "data_pedido"]),
+    ],
+    "itens_pedido": [
+        ("ix_itens_pedido_pedido_id", ["pedido_id"]),
+    ],
+    "pagamentos": [
+        ("ix_pagamentos_pedido_status", ["pedido_id", "status"]),
+    ],
+    "historico_pagamentos": [
+        ("ix_historico_pagamentos_pagamento_data", ["pagamento_id", "data_alteracao"]),
+    ],
+}
+
+
+def aplicar(ctx):
+    for nome_tabela, indices in INDICES.items():
+        tabela = ctx.tabela(nome_tabela)
+        existentes = ctx.indices(nome_tabela)
+        for nome, colunas in indices:
+            if nome in existentes:
+                ctx.informar(f"  {nome} já existe")
+                continue
+            ctx.informar(f"  criando {nome}")
+            Index(nome, *[tabela.c[c] for c in colunas]).create(ctx.conn)
@@ -0,0 +1,31 @@
+"""
+Índices para a paginação por cursor das listagens sem filtro
+
+(data_pedido, id) e (data_criacao, id): no SQLite o id (rowid) já faz parte de
+todo índice, então um índice na data basta para a ordenação e o filtro do cursor.
+"""
+from sqlalchemy import Index
+
+VERSAO = 4
+DESCRICAO = "Índices de data para paginação por cursor"
+
+INDICES = {
+    "pedidos": [
+        ("ix_pedidos_data_pedido", ["data_pedido"]),
+    ],
+    "pagamentos": [
+        ("ix_pagamentos_data_criacao", ["data_criacao"]),
+    ],
+}
+
+
+def aplicar(ctx):
+    for nome_tabela, indices in INDICES.items():
+        tabela = ctx.tabela(nome_tabela)
+        existentes = ctx.indices(nome_tabela)
+        for nome, colunas in indices:
+            if nome in existentes:
+                ctx.informar(f"  {nome} já existe")
+                continue
+            ctx.informar(f"  criando {nome}")
+            Index(nome, *[tabela.c[c] for c in colunas]).create(ctx.conn)
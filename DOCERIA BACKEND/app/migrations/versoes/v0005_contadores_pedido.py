@@ -0,0 +1,41 @@
+"""
+Contador de número de pedido por ano
+
+Substitui a busca do último PED-{ano}-% (LIKE + ORDER BY a cada pedido) por uma
+linha por ano em `contadores_pedido`, incrementada atomicamente na transação do
+pedido. A tabela é iniciada com o maior sequencial já emitido em cada ano.
+"""
+import re
+from sqlalchemy import MetaData, Table, Column, Integer, insert, select, text
+
+VERSAO = 5
+DESCRICAO = "Contador de número de pedido por ano"
+
+_NUMERO = re.compile(r"^PED-(\d{4})-(\d+)$")
+
+metadata = MetaData()
+
+contadores_pedido = Table(
+    "contadores_pedido", metadata,
+    Column("ano", Integer, primary_key=True, autoincrement=False),
+    Column("ultimo", Integer, nullable=False),
+)
+
+
+def aplicar(ctx):
+    metadata.create_all(ctx.conn, checkfirst=True)
+
+    ultimos = {}
+    resultado = ctx.conn.execute(text("SELECT numero_pedido FROM pedidos WHERE numero_pedido LIKE 'PED-%'"))
+    for (numero,) in resultado:
+        m = _NUMERO.match(numero or "")
+        if m:
+            ano, seq = int(m.group(1)), int(m.group(2))
+            ultimos[ano] = max(ultimos.get(ano, 0), seq)
+
+    existentes = set(ctx.conn.execute(select(contadores_pedido.c.ano)).scalars())
+    novos = [{"ano": ano, "ultimo": seq} for ano, seq in sorted(ultimos.items()) if ano not in existentes]
+    if novos:
+        ctx.conn.execute(insert(contadores_pedido), novos)
+    for contador in novos:
+        ctx.informar(f"  {contador['ano']}: último sequencial {contador['ultimo']}")
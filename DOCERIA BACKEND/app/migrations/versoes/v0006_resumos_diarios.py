@@ -0,0 +1,79 @@
+"""
+Resumos diários (rollups) de pedidos, pagamentos e produtos vendidos
+
+Cria as tabelas lidas pelas estatísticas e totais e as preenche a partir dos
+dados existentes com INSERT ... SELECT agrupado. Depois da migração os serviços
+mantêm os resumos; `python -m app.services.resumo_diario` refaz o cálculo.
+"""
+from sqlalchemy import MetaData, Table, Column, Integer, String, Float, Date, text
+
+VERSAO = 6
+DESCRICAO = "Resumos diários para os dashboards"
+
+metadata = MetaData()
+
+Table(
+    "resumo_diario_pedidos", metadata,
+    Column("dia", Date, primary_key=True),
+    Column("status", String, primary_key=True, index=True),
+    Column("tipo_entrega", String, primary_key=True),
+    Column("forma_pagamento", String, primary_key=True),
+    Column("quantidade", Integer, nullable=False),
+    Column("valor_total", Float, nullable=False),
+)
+
+Table(
+    "resumo_diario_pagamentos", metadata,
+    Column("dia", Date, primary_key=True),
+    Column("status", String, primary_key=True, index=True),
+    Column("forma_pagamento", String, primary_key=True),
+    Column("quantidade", Integer, nullable=False),
+    Column("valor_total", Float, nullable=False),
+)
+
+Table(
+    "resumo_diario_produtos", metadata,
+    Column("dia", Date, primary_key=True),
+    Column("tipo_item", String, primary_key=True),
+    Column("item_id", Integer, primary_key=True),
+    Column("quantidade", Integer, nullable=False),
+    Column("valor_total", Float, nullable=False),
+)
+
+PREENCHIMENTO = {
+    "resumo_diario_pedidos": """
+        INSERT INTO resumo_diario_pedidos (dia, status, tipo_entrega, forma_pagamento, quantidade, valor_total)
+        SELECT date(data_pedido), COALESCE(status, ''), COALESCE(tipo_entrega, ''),
+               COALESCE(forma_pagamento, ''), COUNT(*), COALESCE(SUM(total), 0)
+        FROM pedidos
+        WHERE data_pedido IS NOT NULL
+        GROUP BY 1, 2, 3, 4
+    """,
+    "resumo_diario_pagamentos": """
+        INSERT INTO resumo_diario_pagamentos (dia, status, forma_pagamento, quantidade, valor_total)
+        SELECT date(data_criacao), COALESCE(status, ''), COALESCE(forma_pagamento, ''),
+               COUNT(*), COALESCE(SUM(valor), 0)
+        FROM pagamentos
+        WHERE data_criacao IS NOT NULL
+        GROUP BY 1, 2, 3
+    """,
+    "resumo_diario_produtos": """
+        INSERT INTO resumo_diario_produtos (dia, tipo_item, item_id, quantidade, valor_total)
+        SELECT date(p.data_pedido),
+               CASE WHEN i.produto_id IS NOT NULL THEN 'produto' ELSE 'kit' END,
+               COALESCE(i.produto_id, i.kit_id),
+               COALESCE(SUM(i.quantidade), 0), COALESCE(SUM(i.subtotal), 0)
+        FROM itens_pedido i
+        JOIN pedidos p ON p.id = i.pedido_id
+        WHERE p.data_pedido IS NOT NULL AND (p.status IS NULL OR p.status <> 'cancelado')
+        GROUP BY 1, 2, 3
+    """,
+}
+
+
+def aplicar(ctx):
+    metadata.create_all(ctx.conn, checkfirst=True)
+    for tabela, sql in PREENCHIMENTO.items():
+        ctx.conn.execute(text(f"DELETE FROM {tabela}"))
+        linhas = ctx.conn.execute(text(sql)).rowcount
+        ctx.informar(f"  {tabela}: {linhas} linhas")
@@ -0,0 +1,93 @@
+"""
+Dias no fuso da loja nos resumos diários e índice de pagamentos por status e data
+
+Os filtros de período passaram a usar intervalos [00:00, 00:00 do dia seguinte)
+no fuso FUSO_HORARIO_LOJA em vez de func.date() sobre o horário UTC. Os resumos
+diários, preenchidos na v0006 com o dia UTC, são recalculados com o dia local
+(registros lidos em lotes, totais acumulados por chave) para que resumos e
+consultas diretas concordem. O índice (status, data_criacao) atende os
+percentis das estatísticas de pagamentos.
+"""
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+from sqlalchemy import Index, text
+from app.config import settings
+
+VERSAO = 7
+DESCRICAO = "Resumos diários no fuso da loja e índice de pagamentos por status"
+
+INDICES = {
+    "pagamentos": [
+        ("ix_pagamentos_status_data_criacao", ["status", "data_criacao"]),
+    ],
+}
+
+LEITURAS = {
+    "resumo_diario_pedidos": (
+        ("dia", "status", "tipo_entrega", "forma_pagamento"),
+        """
+        SELECT data_pedido, COALESCE(status, ''), COALESCE(tipo_entrega, ''),
+               COALESCE(forma_pagamento, ''), 1, COALESCE(total, 0)
+        FROM pedidos
+        WHERE data_pedido IS NOT NULL
+        """,
+    ),
+    "resumo_diario_pagamentos": (
+        ("dia", "status", "forma_pagamento"),
+        """
+        SELECT data_criacao, COALESCE(status, ''), COALESCE(forma_pagamento, ''), 1, COALESCE(valor, 0)
+        FROM pagamentos
+        WHERE data_criacao IS NOT NULL
+        """,
+    ),
+    "resumo_diario_produtos": (
+        ("dia", "tipo_item", "item_id"),
+        """
+        SELECT p.data_pedido,
+               CASE WHEN i.produto_id IS NOT NULL THEN 'produto' ELSE 'kit' END,
+               COALESCE(i.produto_id, i.kit_id),
+               COALESCE(i.quantidade, 0), COALESCE(i.subtotal, 0)
+        FROM itens_pedido i
+        JOIN pedidos p ON p.id = i.pedido_id
+        WHERE p.data_pedido IS NOT NULL AND (p.status IS NULL OR p.status <> 'cancelado')
+        """,
+    ),
+}
+
+
+def _dia_local(valor, fuso):
+    momento = valor if isinstance(valor, datetime) else datetime.fromisoformat(valor)
+    return momento.replace(tzinfo=timezone.utc).astimezone(fuso).date().isoformat()
+
+
+def aplicar(ctx):
+    for nome_tabela, indices in INDICES.items():
+        tabela = ctx.tabela(nome_tabela)
+        existentes = ctx.indices(nome_tabela)
+        for nome, colunas in indices:
+            if nome in existentes:
+                ctx.informar(f"  {nome} já existe")
+                continue
+            ctx.informar(f"  criando {nome}")
+            Index(nome, *[tabela.c[c] for c in colunas]).create(ctx.conn)
+
+    fuso = ZoneInfo(settings.FUSO_HORARIO_LOJA)
+    ctx.informar(f"  fuso da loja: {fuso.key}")
+    for tabela, (chave, sql) in LEITURAS.items():
+        totais = {}
+        linhas = ctx.conn.execution_options(yield_per=ctx.lote).execute(text(sql))
+        for momento, *resto, quantidade, valor in linhas:
+            k = (_dia_local(momento, fuso), *resto)
+            q, v = totais.get(k, (0, 0.0))
+            totais[k] = (q + quantidade, v + valor)
+
+        ctx.conn.execute(text(f"DELETE FROM {tabela}"))
+        colunas = (*chave, "quantidade", "valor_total")
+        valores = [dict(zip(colunas, (*k, q, v))) for k, (q, v) in totais.items()]
+        if valores:
+            ctx.conn.execute(
+                text(f"INSERT INTO {tabela} ({', '.join(colunas)}) "
+                     f"VALUES ({', '.join(':' + c for c in colunas)})"),
+                valores,
+            )
+        ctx.informar(f"  {tabela}: {len(valores)} linhas")
@@ -0,0 +1,72 @@
+"""
+Índice de busca de clientes por trigramas
+
+Cria `clientes_busca` (FTS5 trigram no SQLite; tabela com índice GIN
+gin_trgm_ops no PostgreSQL, com a extensão pg_trgm) e a preenche em lotes com
+nome, email, telefone e CPF normalizados. Depois da migração o índice é mantido
+pelos eventos de Cliente (app/services/busca_clientes.py).
+"""
+import unicodedata
+from sqlalchemy import text
+
+VERSAO = 8
+DESCRICAO = "Índice de busca de clientes (FTS5 trigram / pg_trgm)"
+
+ESTRUTURA = {
+    "sqlite": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS clientes_busca "
+        "USING fts5(nome, email, telefone, cpf, tokenize='trigram')",
+    ],
+    "postgresql": [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE TABLE IF NOT EXISTS clientes_busca ("
+        "cliente_id INTEGER PRIMARY KEY REFERENCES clientes (id) ON DELETE CASCADE, "
+        "texto TEXT NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS ix_clientes_busca_texto_trgm "
+        "ON clientes_busca USING gin (texto gin_trgm_ops)",
+    ],
+}
+
+
+def _normalizar(texto):
+    if not texto:
+        return ""
+    sem_acentos = "".join(c for c in unicodedata.normalize("NFKD", texto) if not unicodedata.combining(c))
+    return " ".join(sem_acentos.casefold().split())
+
+
+def _digitos(texto):
+    return "".join(c for c in texto or "" if c.isdigit())
+
+
+def aplicar(ctx):
+    for sql in ESTRUTURA[ctx.dialeto]:
+        ctx.conn.execute(text(sql))
+    ctx.conn.execute(text("DELETE FROM clientes_busca"))
+
+    if ctx.dialeto == "postgresql":
+        inserir = text("INSERT INTO clientes_busca (cliente_id, texto) VALUES (:id, :texto)")
+    else:
+        inserir = text("INSERT INTO clientes_busca (rowid, nome, email, telefone, cpf) "
+                       "VALUES (:id, :nome, :email, :telefone, :cpf)")
+
+    total = ctx.conn.execute(text("SELECT COUNT(*) FROM clientes")).scalar()
+    indexados, ultimo_id = 0, 0
+    while True:
+        linhas = ctx.conn.execute(
+            text("SELECT id, nome, email, telefone, cpf FROM clientes WHERE id > :ultimo ORDER BY id LIMIT :lote"),
+            {"ultimo": ultimo_id, "lote": ctx.lote}
+        ).all()
+        if not linhas:
+            break
+        documentos = []
+        for id, nome, email, telefone, cpf in linhas:
+            documento = {"id": id, "nome": _normalizar(nome), "email": _normalizar(email),
+                         "telefone": _digitos(telefone), "cpf": _digitos(cpf)}
+            documento["texto"] = " ".join((documento["nome"], documento["email"],
+                                           documento["telefone"], documento["cpf"]))
+            documentos.append(documento)
+        ctx.conn.execute(inserir, documentos)
+        ultimo_id = linhas[-1][0]
+        indexados += len(linhas)
+        ctx.informar(f"  clientes_busca: {indexados}/{total} clientes ({indexados * 100 // max(total, 1)}%)")
@@ -0,0 +1,69 @@
+"""
+Colunas normalizadas de email, telefone e CPF dos clientes
+
+buscar_por_email usava email ILIKE, que não aproveita o índice único de
+email, e telefone/CPF antigos estão gravados como foram digitados. Acrescenta
+email_normalizado (minúsculas), telefone_normalizado e cpf_normalizado (só
+dígitos), preenche em lotes e cria os índices (únicos para email e CPF).
+
+Se dois clientes antigos tiverem o mesmo valor normalizado (ex.: Ana@x.com e
+ana@x.com), o mais antigo fica com o valor e os demais ficam com NULL, listados
+na saída da migração para revisão. As buscas por email/CPF também comparam o
+valor original (filtro_email/filtro_cpf), então esses clientes continuam
+encontráveis pelo email/CPF exatamente como cadastrados.
+"""
+from sqlalchemy import Index, text
+
+VERSAO = 9
+DESCRICAO = "Email, telefone e CPF normalizados dos clientes"
+
+COLUNAS = ["email_normalizado", "telefone_normalizado", "cpf_normalizado"]
+
+INDICES = [
+    ("ix_clientes_email_normalizado", "email_normalizado", True),
+    ("ix_clientes_telefone_normalizado", "telefone_normalizado", False),
+    ("ix_clientes_cpf_normalizado", "cpf_normalizado", True),
+]
+
+
+def _digitos(valor):
+    digitos = "".join(c for c in valor or "" if c.isdigit())
+    return digitos or None
+
+
+def _normalizar(linha) -> dict:
+    return {
+        "email_normalizado": linha["email"].strip().lower() if linha["email"] else None,
+        "telefone_normalizado": _digitos(linha["telefone"]),
+        "cpf_normalizado": _digitos(linha["cpf"]),
+    }
+
+
+def aplicar(ctx):
+    existentes = ctx.colunas("clientes")
+    for nome in COLUNAS:
+        if nome not in existentes:
+            ctx.informar(f"  adicionando clientes.{nome}")
+            ctx.conn.execute(text(f"ALTER TABLE clientes ADD COLUMN {nome} VARCHAR"))
+    clientes = ctx.tabela("clientes")
+
+    ctx.preencher_em_lotes("clientes", _normalizar, ["email", "telefone", "cpf"])
+
+    for nome, coluna, unico in INDICES:
+        if not unico:
+            continue
+        repetidos = ctx.conn.execute(text(
+            f"SELECT id, {coluna} FROM clientes WHERE {coluna} IS NOT NULL AND id NOT IN "
+            f"(SELECT MIN(id) FROM clientes WHERE {coluna} IS NOT NULL GROUP BY {coluna})"
+        )).all()
+        for id, valor in repetidos:
+            ctx.informar(f"  cliente {id}: {coluna} '{valor}' repetido, mantido NULL")
+            ctx.conn.execute(text(f"UPDATE clientes SET {coluna} = NULL WHERE id = :id"), {"id": id})
+
+    indices = ctx.indices("clientes")
+    for nome, coluna, unico in INDICES:
+        if nome in indices:
+            ctx.informar(f"  {nome} já existe")
+            continue
+        ctx.informar(f"  criando {nome}")
+        Index(nome, clientes.c[coluna], unique=unico).create(ctx.conn)
@@ -0,0 +1,56 @@
+"""
+Data de nascimento interpretada e índice (mês, dia) de aniversário dos clientes
+
+aniversariantes_do_mes carregava todos os clientes ativos e separava
+data_nascimento ("DD/MM/YYYY" ou "YYYY-MM-DD") no Python a cada chamada.
+Acrescenta nascimento (DATE), mes_aniversario e dia_aniversario, preenchidos
+em lotes a partir do texto existente, e o índice ix_clientes_aniversario.
+Textos que não são datas válidas ficam com as colunas novas em NULL e são
+contados na saída da migração.
+"""
+from datetime import datetime
+from sqlalchemy import Index, text
+
+VERSAO = 10
+DESCRICAO = "Mês e dia de aniversário dos clientes"
+
+COLUNAS = [("nascimento", "DATE"), ("mes_aniversario", "INTEGER"), ("dia_aniversario", "INTEGER")]
+
+
+def _interpretar(linha) -> dict:
+    texto = (linha["data_nascimento"] or "").strip()[:10]
+    for formato in ("%d/%m/%Y", "%Y-%m-%d", "%d-%m-%Y"):
+        try:
+            data = datetime.strptime(texto, formato).date()
+            return {"nascimento": data.isoformat(), "mes_aniversario": data.month, "dia_aniversario": data.day}
+        except ValueError:
+            continue
+    try:
+        sem_ano = datetime.strptime(f"{texto}/2000", "%d/%m/%Y")
+        return {"nascimento": None, "mes_aniversario": sem_ano.month, "dia_aniversario": sem_ano.day}
+    except ValueError:
+        return {"nascimento": None, "mes_aniversario": None, "dia_aniversario": None}
+
+
+def aplicar(ctx):
+    existentes = ctx.colunas("clientes")
+    for nome, tipo in COLUNAS:
+        if nome not in existentes:
+            ctx.informar(f"  adicionando clientes.{nome}")
+            ctx.conn.execute(text(f"ALTER TABLE clientes ADD COLUMN {nome} {tipo}"))
+
+    ctx.preencher_em_lotes("clientes", _interpretar, ["data_nascimento"],
+                           filtro="data_nascimento IS NOT NULL AND data_nascimento <> ''")
+    invalidas = ctx.conn.execute(text(
+        "SELECT COUNT(*) FROM clientes WHERE data_nascimento IS NOT NULL AND data_nascimento <> '' "
+        "AND mes_aniversario IS NULL"
+    )).scalar()
+    if invalidas:
+        ctx.informar(f"  {invalidas} cliente(s) com data_nascimento não reconhecida")
+
+    if "ix_clientes_aniversario" in ctx.indices("clientes"):
+        ctx.informar("  ix_clientes_aniversario já existe")
+    else:
+        ctx.informar("  criando ix_clientes_aniversario")
+        clientes = ctx.tabela("clientes")
+        Index("ix_clientes_aniversario", clientes.c.mes_aniversario, clientes.c.dia_aniversario).create(ctx.conn)
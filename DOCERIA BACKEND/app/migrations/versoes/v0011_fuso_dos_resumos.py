@@ -0,0 +1,33 @@
+"""
+Fuso horário em que os resumos diários foram calculados
+
+Os resumos agrupam os registros pelo dia da loja (FUSO_HORARIO_LOJA). Se o
+fuso mudar depois, os deltas gravados pelos serviços caem em dias diferentes
+dos já calculados. Cria resumo_diario_parametros e registra o fuso atual (o
+usado pela v0007, que recalculou os resumos); a aplicação se recusa a iniciar
+com outro fuso até os resumos serem reconstruídos
+(`python -m app.services.resumo_diario`).
+"""
+from sqlalchemy import MetaData, Table, Column, String, text
+from app.config import settings
+
+VERSAO = 11
+DESCRICAO = "Fuso horário dos resumos diários"
+
+metadata = MetaData()
+
+Table(
+    "resumo_diario_parametros", metadata,
+    Column("nome", String, primary_key=True),
+    Column("valor", String, nullable=False),
+)
+
+
+def aplicar(ctx):
+    metadata.create_all(ctx.conn, checkfirst=True)
+    ctx.conn.execute(text("DELETE FROM resumo_diario_parametros WHERE nome = 'fuso_horario'"))
+    ctx.conn.execute(
+        text("INSERT INTO resumo_diario_parametros (nome, valor) VALUES ('fuso_horario', :fuso)"),
+        {"fuso": settings.FUSO_HORARIO_LOJA},
+    )
+    ctx.informar(f"  fuso dos resumos: {settings.FUSO_HORARIO_LOJA}")
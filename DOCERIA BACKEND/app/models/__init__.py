@@ -5,8 +5,11 @@ from app.models.contato_model import Contato
 from app.models.evento_model import Evento
 from app.models.kit_model import Kit
 from app.models.cliente_model import Cliente
-from app.models.pedido_model import Pedido, ItemPedido, StatusPedido, TipoEntrega, FormaPagamento
+from app.models.pedido_model import Pedido, ItemPedido, ContadorPedido, StatusPedido, TipoEntrega, FormaPagamento
 from app.models.pagamento_model import Pagamento, HistoricoPagamento, StatusPagamento
+from app.models.resumo_model import (
+    ResumoDiarioPedido, ResumoDiarioPagamento, ResumoDiarioProduto, ResumoDiarioParametro,
+)
 
 __all__ = [
     "User",
@@ -18,10 +21,15 @@ __all__ = [
     "Cliente",
     "Pedido",
     "ItemPedido",
+    "ContadorPedido",
     "StatusPedido",
     "TipoEntrega",
     "FormaPagamento",
     "Pagamento",
     "HistoricoPagamento",
     "StatusPagamento",
+    "ResumoDiarioPedido",
+    "ResumoDiarioPagamento",
+    "ResumoDiarioProduto",
+    "ResumoDiarioParametro",
 ]
@@ -1,16 +1,58 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean
-from datetime import datetime
+from sqlalchemy import Column, Integer, String, Date, DateTime, Boolean, Index, or_
+from sqlalchemy.orm import validates
+from datetime import date, datetime
+from typing import Optional, Tuple
 from app.data.database import Base
 
 
+def normalizar_email(email: Optional[str]) -> Optional[str]:
+    """Email como comparado nas buscas: sem espaços nas pontas e em minúsculas"""
+    return email.strip().lower() if email else None
+
+
+def somente_digitos(valor: Optional[str]) -> Optional[str]:
+    """Telefone/CPF só com dígitos (None se não houver nenhum)"""
+    digitos = "".join(c for c in valor or "" if c.isdigit())
+    return digitos or None
+
+
+def interpretar_nascimento(valor: Optional[str]) -> Tuple[Optional[date], Optional[int], Optional[int]]:
+    """
+    (data, mês, dia) de data_nascimento em "DD/MM/YYYY", "YYYY-MM-DD",
+    "DD-MM-YYYY" ou só "DD/MM" (sem ano: data None). (None, None, None) se não
+    for uma data válida.
+    """
+    texto = (valor or "").strip()[:10]
+    for formato in ("%d/%m/%Y", "%Y-%m-%d", "%d-%m-%Y"):
+        try:
+            data = datetime.strptime(texto, formato).date()
+            return data, data.month, data.day
+        except ValueError:
+            continue
+    try:
+        sem_ano = datetime.strptime(f"{texto}/2000", "%d/%m/%Y")  # 2000: aceita 29/02
+        return None, sem_ano.month, sem_ano.day
+    except ValueError:
+        return None, None, None
+
+
 class Cliente(Base):
     __tablename__ = "clientes"
+    __table_args__ = (
+        # aniversariantes: mês inteiro ou intervalos de dias dentro do mês
+        Index("ix_clientes_aniversario", "mes_aniversario", "dia_aniversario"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     nome = Column(String, nullable=False)
     email = Column(String, unique=True, index=True, nullable=False)
     telefone = Column(String, nullable=True)
     cpf = Column(String, unique=True, index=True, nullable=True)
+
+    # Colunas de busca exata (preenchidas pelos @validates abaixo)
+    email_normalizado = Column(String, unique=True, index=True, nullable=True)
+    telefone_normalizado = Column(String, index=True, nullable=True)
+    cpf_normalizado = Column(String, unique=True, index=True, nullable=True)
     
     # Endereço
     endereco = Column(String, nullable=True)
@@ -22,7 +64,10 @@ class Cliente(Base):
     cep = Column(String, nullable=True)
     
     # Dados adicionais
-    data_nascimento = Column(String, nullable=True)  # Para promoções de aniversário
+    data_nascimento = Column(String, nullable=True)  # Para promoções de aniversário (como digitado)
+    nascimento = Column(Date, nullable=True)  # data_nascimento interpretada
+    mes_aniversario = Column(Integer, nullable=True)
+    dia_aniversario = Column(Integer, nullable=True)
     observacoes = Column(String, nullable=True)
     
     # Controle
@@ -30,3 +75,42 @@ class Cliente(Base):
     data_cadastro = Column(DateTime, default=datetime.utcnow)
     data_atualizacao = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    @validates("email")
+    def _normalizar_email(self, chave, valor):
+        self.email_normalizado = normalizar_email(valor)
+        return valor
+
+    @validates("telefone")
+    def _normalizar_telefone(self, chave, valor):
+        self.telefone_normalizado = somente_digitos(valor)
+        return valor
+
+    @validates("cpf")
+    def _normalizar_cpf(self, chave, valor):
+        self.cpf_normalizado = somente_digitos(valor)
+        return valor
+
+    @validates("data_nascimento")
+    def _interpretar_nascimento(self, chave, valor):
+        self.nascimento, self.mes_aniversario, self.dia_aniversario = interpretar_nascimento(valor)
+        return valor
+
+
+# Clientes antigos cujo email/CPF repetia o de outro após a normalização ficaram
+# com a coluna normalizada NULL (migração v0009); a comparação com o valor
+# original mantém esses clientes encontráveis pelo email/CPF como cadastrados.
+
+def filtro_email(email: str):
+    """Cliente pelo email: exato ou normalizado (índices únicos de email e email_normalizado)"""
+    normalizado = normalizar_email(email)
+    if normalizado is None:  # sem comparar com NULL (IS NULL)
+        return Cliente.email == email
+    return or_(Cliente.email == email, Cliente.email_normalizado == normalizado)
+
+
+def filtro_cpf(cpf: str):
+    """Cliente pelo CPF: como digitado ou só dígitos (índices únicos de cpf e cpf_normalizado)"""
+    digitos = somente_digitos(cpf)
+    if digitos is None:  # sem comparar com NULL (IS NULL)
+        return Cliente.cpf == cpf
+    return or_(Cliente.cpf == cpf, Cliente.cpf_normalizado == digitos)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Boolean
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.data.database import Base
@@ -25,6 +25,12 @@ class FormaPagamento(str, enum.Enum):
 
 class Pagamento(Base):
     __tablename__ = "pagamentos"
+    __table_args__ = (
+        # criar/pagamento_aprovado_pedido/buscar_por_pedido: (pedido_id, status)
+        Index("ix_pagamentos_pedido_status", "pedido_id", "status"),
+        # estatisticas(percentis): aprovados em um intervalo de data_criacao
+        Index("ix_pagamentos_status_data_criacao", "status", "data_criacao"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     
@@ -62,7 +68,7 @@ class Pagamento(Base):
     nsu = Column(String, nullable=True)  # Número Sequencial Único
     
     # Datas
-    data_criacao = Column(DateTime, default=datetime.utcnow)
+    data_criacao = Column(DateTime, default=datetime.utcnow, index=True)
     data_pagamento = Column(DateTime, nullable=True)  # Quando foi efetivamente pago
     data_estorno = Column(DateTime, nullable=True)
     
@@ -71,10 +77,19 @@ class Pagamento(Base):
     motivo_recusa = Column(String, nullable=True)
     motivo_estorno = Column(String, nullable=True)
 
+    @property
+    def numero_pedido(self):
+        """Número do pedido (PagamentoOut); carregado junto pelas opções de PagamentoService"""
+        return self.pedido.numero_pedido if self.pedido else None
+
 
 class HistoricoPagamento(Base):
     """Histórico de alterações no pagamento"""
     __tablename__ = "historico_pagamentos"
+    __table_args__ = (
+        # historico: filtro por pagamento, ordem por data da alteração
+        Index("ix_historico_pagamentos_pagamento_data", "pagamento_id", "data_alteracao"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     pagamento_id = Column(Integer, ForeignKey("pagamentos.id"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Enum
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.data.database import Base
@@ -30,6 +30,12 @@ class FormaPagamento(str, enum.Enum):
 
 class Pedido(Base):
     __tablename__ = "pedidos"
+    __table_args__ = (
+        # listar/pedidos_por_status/pedidos_pendentes: filtro por status, ordem por data
+        Index("ix_pedidos_status_data_pedido", "status", "data_pedido"),
+        # listar/pedidos_cliente: filtro por cliente, ordem por data
+        Index("ix_pedidos_cliente_data_pedido", "cliente_id", "data_pedido"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     numero_pedido = Column(String, unique=True, index=True)  # Ex: PED-2024-0001
@@ -43,7 +49,7 @@ class Pedido(Base):
     tipo_entrega = Column(String, default=TipoEntrega.ENTREGA.value)
     
     # Datas
-    data_pedido = Column(DateTime, default=datetime.utcnow)
+    data_pedido = Column(DateTime, default=datetime.utcnow, index=True)
     data_entrega = Column(String, nullable=True)  # Data desejada para entrega
     hora_entrega = Column(String, nullable=True)  # Hora desejada
     
@@ -81,7 +87,7 @@ class ItemPedido(Base):
     __tablename__ = "itens_pedido"
 
     id = Column(Integer, primary_key=True, index=True)
-    pedido_id = Column(Integer, ForeignKey("pedidos.id"), nullable=False)
+    pedido_id = Column(Integer, ForeignKey("pedidos.id"), nullable=False, index=True)
     
     # Produto ou Kit (um dos dois deve ser preenchido)
     produto_id = Column(Integer, ForeignKey("produtos.id"), nullable=True)
@@ -104,3 +110,11 @@ class ItemPedido(Base):
     produto = relationship("Produto")
     kit = relationship("Kit")
 
+
+
+class ContadorPedido(Base):
+    """Último sequencial de numero_pedido emitido em cada ano (PED-ANO-SEQUENCIAL)"""
+    __tablename__ = "contadores_pedido"
+
+    ano = Column(Integer, primary_key=True, autoincrement=False)
+    ultimo = Column(Integer, nullable=False, default=0)
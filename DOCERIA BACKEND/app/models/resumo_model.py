@@ -0,0 +1,48 @@
+from sqlalchemy import Column, Integer, String, Float, Date
+from app.data.database import Base
+
+# Resumos diários (rollups) dos dashboards, mantidos pelos serviços na mesma
+# transação das escritas (ver app/services/resumo_diario.py).
+# Valores ausentes nas colunas da chave são gravados como "".
+
+
+class ResumoDiarioPedido(Base):
+    """Pedidos por dia x status x tipo de entrega x forma de pagamento"""
+    __tablename__ = "resumo_diario_pedidos"
+
+    dia = Column(Date, primary_key=True)
+    status = Column(String, primary_key=True, index=True)
+    tipo_entrega = Column(String, primary_key=True)
+    forma_pagamento = Column(String, primary_key=True)
+    quantidade = Column(Integer, nullable=False, default=0)
+    valor_total = Column(Float, nullable=False, default=0.0)
+
+
+class ResumoDiarioPagamento(Base):
+    """Pagamentos por dia x status x forma de pagamento"""
+    __tablename__ = "resumo_diario_pagamentos"
+
+    dia = Column(Date, primary_key=True)
+    status = Column(String, primary_key=True, index=True)
+    forma_pagamento = Column(String, primary_key=True)
+    quantidade = Column(Integer, nullable=False, default=0)
+    valor_total = Column(Float, nullable=False, default=0.0)
+
+
+class ResumoDiarioProduto(Base):
+    """Itens vendidos por dia x produto/kit (pedidos não cancelados)"""
+    __tablename__ = "resumo_diario_produtos"
+
+    dia = Column(Date, primary_key=True)
+    tipo_item = Column(String, primary_key=True)  # produto ou kit
+    item_id = Column(Integer, primary_key=True)
+    quantidade = Column(Integer, nullable=False, default=0)
+    valor_total = Column(Float, nullable=False, default=0.0)
+
+
+class ResumoDiarioParametro(Base):
+    """Parâmetros com que os resumos foram calculados (ex.: fuso_horario)"""
+    __tablename__ = "resumo_diario_parametros"
+
+    nome = Column(String, primary_key=True)
+    valor = Column(String, nullable=False)
@@ -1,4 +1,5 @@
-from app.data.database import Base, engine, SessionLocal
+from app.data.database import SessionLocal
+from app.migrations import aplicar_migracoes
 from app.models.categoria_model import Categoria
 from app.models.produto_model import Produto
 from app.models.contato_model import Contato
@@ -6,7 +7,7 @@ from app.models.contato_model import Contato
 
 
 def create_tables():
-	Base.metadata.create_all(bind=engine)
+	aplicar_migracoes(informar=print)
 
 
 def seed():
@@ -3,7 +3,7 @@ from fastapi import HTTPException
 from sqlalchemy.orm import Session
 import bcrypt
 from app.models.user_model import User
-from app.models.cliente_model import Cliente
+from app.models.cliente_model import Cliente, filtro_email
 from app.services.token_service import criar_token
 
 logger = logging.getLogger(__name__)
@@ -33,7 +33,7 @@ class AuthService:
 
             # Criar cliente automaticamente associado ao usuário
             # Verificar se cliente já existe (pode ter sido criado anteriormente)
-            cliente_existente = db.query(Cliente).filter(Cliente.email == email).first()
+            cliente_existente = db.query(Cliente).filter(filtro_email(email)).first()
             if cliente_existente:
                 logger.info(f"Cliente já existe para email: {email} (Cliente ID: {cliente_existente.id})")
             else:
@@ -0,0 +1,187 @@
+"""
+Índice de busca de clientes (caixa de busca do atendimento)
+
+`clientes_busca` guarda nome, email, telefone e CPF de cada cliente normalizados
+(minúsculas, sem acentos; telefone e CPF só com dígitos) e indexados por
+trigramas, então `%termo%` em qualquer posição não varre a tabela de clientes:
+    - SQLite: tabela FTS5 com tokenizer trigram (rowid = id do cliente),
+      ordenada por bm25 com peso maior para o nome
+    - PostgreSQL: tabela comum com o texto concatenado e índice GIN
+      gin_trgm_ops (pg_trgm), ordenada por word_similarity
+
+O índice é atualizado por eventos do mapper de Cliente (inserção, alteração e
+remoção), na mesma transação da escrita. Para preencher ou corrigir:
+    python -m app.services.busca_clientes
+"""
+import argparse
+import re
+import time
+import unicodedata
+from typing import Optional
+from sqlalchemy import delete, event, func, insert, inspect, literal_column, select, table, column
+from sqlalchemy.orm import Session
+from app.models.cliente_model import Cliente
+
+CAMPOS = ("nome", "email", "telefone", "cpf")
+PESOS_BM25 = (10.0, 4.0, 2.0, 2.0)  # na ordem de CAMPOS
+TAMANHO_MINIMO_TRIGRAMA = 3
+CANDIDATOS_RANKING = 2000
+
+_FTS = table("clientes_busca", column("rowid"), *[column(c) for c in CAMPOS])
+_PG = table("clientes_busca", column("cliente_id"), column("texto"))
+
+_SO_NUMERO = re.compile(r"[\d\s().+/-]+")
+
+
+def normalizar(texto: Optional[str]) -> str:
+    """Minúsculas, sem acentos e com espaços simples"""
+    if not texto:
+        return ""
+    sem_acentos = "".join(c for c in unicodedata.normalize("NFKD", texto) if not unicodedata.combining(c))
+    return " ".join(sem_acentos.casefold().split())
+
+
+def _digitos(texto: Optional[str]) -> str:
+    return "".join(c for c in texto or "" if c.isdigit())
+
+
+def normalizar_termo(termo: str) -> str:
+    """Termo digitado na busca: telefone/CPF formatados viram só dígitos"""
+    if _SO_NUMERO.fullmatch(termo.strip()) and _digitos(termo):
+        return _digitos(termo)
+    return normalizar(termo)
+
+
+def _documento(cliente) -> dict:
+    return {
+        "nome": normalizar(cliente.nome),
+        "email": normalizar(cliente.email),
+        "telefone": _digitos(cliente.telefone),
+        "cpf": _digitos(cliente.cpf),
+    }
+
+
+def _postgres(conexao) -> bool:
+    return conexao.dialect.name == "postgresql"
+
+
+# Manutenção
+
+def indexar(conexao, clientes: list, substituir: bool = True):
+    """Grava (ou substitui) os clientes no índice. `clientes`: objetos ou linhas com id e CAMPOS"""
+    if not clientes:
+        return
+    if substituir:
+        remover(conexao, [c.id for c in clientes])
+    if _postgres(conexao):
+        linhas = [{"cliente_id": c.id, "texto": " ".join(_documento(c).values())} for c in clientes]
+        conexao.execute(insert(_PG), linhas)
+    else:
+        conexao.execute(insert(_FTS), [{"rowid": c.id, **_documento(c)} for c in clientes])
+
+
+def remover(conexao, ids: list):
+    if _postgres(conexao):
+        conexao.execute(delete(_PG).where(_PG.c.cliente_id.in_(ids)))
+    else:
+        conexao.execute(delete(_FTS).where(_FTS.c.rowid.in_(ids)))
+
+
+def _apos_inserir(mapper, conexao, cliente):
+    indexar(conexao, [cliente])
+
+
+def _apos_atualizar(mapper, conexao, cliente):
+    estado = inspect(cliente)
+    if any(estado.attrs[campo].history.has_changes() for campo in CAMPOS):
+        indexar(conexao, [cliente])
+
+
+def _apos_remover(mapper, conexao, cliente):
+    remover(conexao, [cliente.id])
+
+
+def registrar_eventos():
+    """Mantém o índice nas escritas de Cliente feitas pelo ORM (todas as sessões)"""
+    if not event.contains(Cliente, "after_insert", _apos_inserir):
+        event.listen(Cliente, "after_insert", _apos_inserir)
+        event.listen(Cliente, "after_update", _apos_atualizar)
+        event.listen(Cliente, "after_delete", _apos_remover)
+
+
+registrar_eventos()
+
+
+# Consulta
+
+def buscar(db: Session, colunas: list, termo: str, limit: int = 50) -> list:
+    """
+    `colunas` dos clientes que contêm `termo` (normalizado) no nome, email,
+    telefone ou CPF, os mais relevantes primeiro, até `limit`.
+    """
+    termo = normalizar_termo(termo)
+    if not termo:
+        return []
+    query = db.query(*colunas)
+
+    if db.get_bind().dialect.name == "postgresql":
+        query = query.join(_PG, _PG.c.cliente_id == Cliente.id).filter(
+            _PG.c.texto.contains(termo, autoescape=True)
+        ).order_by(func.word_similarity(termo, _PG.c.texto).desc(), Cliente.id)
+    elif len(termo) >= TAMANHO_MINIMO_TRIGRAMA:
+        # bm25 só das primeiras CANDIDATOS_RANKING ocorrências: termos comuns
+        # ("silva") casam dezenas de milhares de clientes e pontuar todos custaria
+        # mais que a busca
+        fts = literal_column("clientes_busca")
+        frase = '"' + termo.replace('"', '""') + '"'
+        candidatos = select(
+            _FTS.c.rowid, func.bm25(fts, *PESOS_BM25).label("relevancia")
+        ).where(fts.op("MATCH")(frase)).limit(CANDIDATOS_RANKING).subquery()
+        query = query.join(candidatos, candidatos.c.rowid == Cliente.id).order_by(
+            candidatos.c.relevancia, Cliente.id
+        )
+    else:
+        # Abaixo de 3 caracteres não há trigrama: varre o índice (já normalizado)
+        padrao = f"%{termo}%"
+        query = query.join(_FTS, _FTS.c.rowid == Cliente.id).filter(
+            _FTS.c.nome.like(padrao) | _FTS.c.email.like(padrao)
+            | _FTS.c.telefone.like(padrao) | _FTS.c.cpf.like(padrao)
+        ).order_by(Cliente.id)
+    return query.limit(limit).all()
+
+
+# Reconstrução (backfill)
+
+def reconstruir(db: Session, lote: int = 5000) -> int:
+    """Refaz o índice a partir da tabela de clientes, em lotes. Não faz commit."""
+    conexao = db.connection()
+    conexao.execute(delete(_PG if _postgres(conexao) else _FTS))
+    total = 0
+    resultado = db.execute(
+        select(Cliente.id, *[getattr(Cliente, c) for c in CAMPOS]).execution_options(yield_per=lote)
+    )
+    for linhas in resultado.partitions():
+        indexar(conexao, linhas, substituir=False)
+        total += len(linhas)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconstrói o índice de busca de clientes")
+    parser.add_argument("--lote", type=int, default=5000, help="Clientes lidos por lote")
+    args = parser.parse_args()
+
+    from app.data.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        comeco = time.perf_counter()
+        total = reconstruir(db, args.lote)
+        db.commit()
+    finally:
+        db.close()
+    print(f"{total} clientes indexados em {time.perf_counter() - comeco:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 from app.models.categoria_model import Categoria
 from sqlalchemy.orm import Session
+from app.data import cache_catalogo
 
 class CategoriaService:
 
@@ -10,9 +11,11 @@ class CategoriaService:
         cat = Categoria(nome=nome)
         db.add(cat)
         db.commit()
+        cache_catalogo.invalidar(cache_catalogo.CATEGORIAS)
         db.refresh(cat)
         return cat
 
     def deletar(self, db: Session, id: int):
         db.query(Categoria).filter(Categoria.id == id).delete()
         db.commit()
+        cache_catalogo.invalidar(cache_catalogo.CATEGORIAS)
@@ -1,21 +1,33 @@
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
-from app.models.cliente_model import Cliente
+from app.models.cliente_model import Cliente, filtro_cpf, filtro_email, somente_digitos
 from typing import Optional
+from datetime import date, timedelta
+import calendar
 import logging
-import sqlite3
-import os
-from app.config import settings
+from app.data.database import executar
+from app.data.fila_escrita import executar_escrita
+from app.services import busca_clientes, periodo
+from app.services.paginacao import aplicar_cursor
+from app.services.projecao import colunas_resumo
+from app.schemas import ClienteResumo
 
 logger = logging.getLogger(__name__)
 
+# Colunas das listagens (ClienteResumo): sem endereço, documentos e observações
+COLUNAS_RESUMO = colunas_resumo(Cliente, ClienteResumo)
+
 
 class ClienteService:
 
-    def listar(self, db: Session, skip: int = 0, limit: int = 100, apenas_ativos: bool = True):
-        query = db.query(Cliente)
+    def listar(self, db: Session, skip: int = 0, limit: int = 100, apenas_ativos: bool = True,
+               cursor: Optional[str] = None):
+        query = db.query(*COLUNAS_RESUMO)
         if apenas_ativos:
             query = query.filter(Cliente.ativo == True)
+        query = query.order_by(Cliente.id)
+        if cursor:
+            return aplicar_cursor(query, [Cliente.id], cursor, descendente=False).limit(limit).all()
         return query.offset(skip).limit(limit).all()
 
     def buscar_por_id(self, db: Session, id: int):
@@ -25,87 +37,34 @@ class ClienteService:
         return cliente
 
     def buscar_por_email(self, db: Session, email: str):
-        # Busca case-insensitive por email
-        return db.query(Cliente).filter(Cliente.email.ilike(email)).first()
+        # Busca case-insensitive por email; o email exatamente como cadastrado tem prioridade
+        return db.query(Cliente).filter(filtro_email(email)).order_by((Cliente.email == email).desc()).first()
 
     def buscar_por_cpf(self, db: Session, cpf: str):
-        if not cpf:
+        if not somente_digitos(cpf):
             return None
-        return db.query(Cliente).filter(Cliente.cpf == cpf).first()
+        return db.query(Cliente).filter(filtro_cpf(cpf)).order_by((Cliente.cpf == cpf).desc()).first()
 
-    def buscar(self, db: Session, termo: str):
-        termo_lower = termo.lower()
+    def buscar(self, db: Session, termo: str, limit: int = 50):
         # Se o termo parece ser um email (contém @), buscar primeiro por email exato
         if "@" in termo:
-            cliente_exato = db.query(Cliente).filter(Cliente.email.ilike(termo)).first()
+            cliente_exato = db.query(*COLUNAS_RESUMO).filter(
+                filtro_email(termo)
+            ).order_by((Cliente.email == termo).desc()).first()
             if cliente_exato:
                 return [cliente_exato]
         
-        # Busca geral por nome, email, telefone ou CPF
-        clientes = db.query(Cliente).filter(
-            (Cliente.nome.ilike(f"%{termo}%")) |
-            (Cliente.email.ilike(f"%{termo}%")) |
-            (Cliente.telefone.ilike(f"%{termo}%")) |
-            (Cliente.cpf.ilike(f"%{termo}%"))
-        ).all()
-        return clientes
-
-    def _migrate_telefone_if_needed(self):
-        """Migra o banco de dados para permitir telefone NULL se necessário"""
-        try:
-            db_path = settings.DATABASE_URL.replace('sqlite:///', '')
-            if not os.path.exists(db_path):
-                return False
-            
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            
-            # Verificar se telefone tem NOT NULL
-            cursor.execute("PRAGMA table_info(clientes)")
-            columns = cursor.fetchall()
-            telefone_col = [col for col in columns if col[1] == 'telefone' and col[3] == 1]
-            
-            if telefone_col:
-                logger.info("Migrando banco de dados para permitir telefone NULL...")
-                cursor.execute("""
-                    CREATE TABLE clientes_new (
-                        id INTEGER NOT NULL PRIMARY KEY,
-                        nome VARCHAR NOT NULL,
-                        email VARCHAR NOT NULL UNIQUE,
-                        telefone VARCHAR,
-                        cpf VARCHAR UNIQUE,
-                        endereco VARCHAR,
-                        numero VARCHAR,
-                        complemento VARCHAR,
-                        bairro VARCHAR,
-                        cidade VARCHAR,
-                        estado VARCHAR,
-                        cep VARCHAR,
-                        data_nascimento VARCHAR,
-                        observacoes VARCHAR,
-                        ativo BOOLEAN,
-                        data_cadastro DATETIME,
-                        data_atualizacao DATETIME
-                    )
-                """)
-                cursor.execute("INSERT INTO clientes_new SELECT * FROM clientes")
-                cursor.execute("DROP TABLE clientes")
-                cursor.execute("ALTER TABLE clientes_new RENAME TO clientes")
-                cursor.execute("CREATE UNIQUE INDEX ix_clientes_email ON clientes (email)")
-                cursor.execute("CREATE INDEX ix_clientes_cpf ON clientes (cpf)")
-                cursor.execute("CREATE INDEX ix_clientes_id ON clientes (id)")
-                conn.commit()
-                logger.info("Migração concluída com sucesso!")
-                return True
-            return False
-        except Exception as e:
-            logger.error(f"Erro ao migrar banco: {e}")
-            if conn:
-                conn.rollback()
-            return False
-        finally:
-            if conn:
-                conn.close()
+        # Telefone ou CPF completos (10 ou 11 dígitos): busca exata primeiro
+        digitos = somente_digitos(termo)
+        if digitos and len(digitos) in (10, 11) and busca_clientes.normalizar_termo(termo) == digitos:
+            clientes_exatos = db.query(*COLUNAS_RESUMO).filter(
+                (Cliente.telefone_normalizado == digitos) | filtro_cpf(digitos)
+            ).limit(limit).all()
+            if clientes_exatos:
+                return clientes_exatos
+        
+        # Busca geral por nome, email, telefone ou CPF (índice de trigramas, sem acentos)
+        return busca_clientes.buscar(db, COLUNAS_RESUMO, termo, limit)
 
     def criar(self, db: Session, dados: dict):
         """Cria um novo cliente"""
@@ -119,8 +78,7 @@ class ClienteService:
         if dados.get("cpf") and self.buscar_por_cpf(db, dados["cpf"]):
             raise HTTPException(400, "CPF já cadastrado.")
 
-        # Remove campos None e strings vazias do dicionário para evitar problemas com constraints do banco
-        # Isso é necessário porque o banco pode ainda ter constraints NOT NULL antigas
+        # Remove campos None e strings vazias do dicionário
         logger.info(f"Dados recebidos para criar cliente: {dados}")
         
         dados_limpos = {}
@@ -153,31 +111,8 @@ class ClienteService:
             return novo_cliente
         except Exception as e:
             db.rollback()
-            error_str = str(e)
-            logger.error(f"Erro ao criar cliente: {error_str}", exc_info=True)
-            
-            # Se o erro for relacionado a constraint NOT NULL em telefone, tentar migração automática
-            if "NOT NULL constraint failed" in error_str and "telefone" in error_str:
-                logger.warning("Constraint NOT NULL detectada na coluna telefone. Tentando migração automática...")
-                if self._migrate_telefone_if_needed():
-                    # Tentar novamente após migração
-                    try:
-                        novo_cliente = Cliente()
-                        for key, value in dados_limpos.items():
-                            setattr(novo_cliente, key, value)
-                        db.add(novo_cliente)
-                        db.commit()
-                        db.refresh(novo_cliente)
-                        logger.info("Cliente criado com sucesso após migração automática")
-                        return novo_cliente
-                    except Exception as e2:
-                        db.rollback()
-                        logger.error(f"Erro ao criar cliente após migração: {e2}")
-                        raise HTTPException(500, f"Erro ao criar cliente: {str(e2)}")
-                else:
-                    raise HTTPException(500, f"Erro ao criar cliente: {error_str}. Execute a migração do banco manualmente.")
-            
-            raise HTTPException(500, f"Erro ao criar cliente: {error_str}")
+            logger.error(f"Erro ao criar cliente: {e}", exc_info=True)
+            raise HTTPException(500, f"Erro ao criar cliente: {str(e)}")
 
     def atualizar(self, db: Session, id: int, dados: dict):
         """Atualiza dados de um cliente"""
@@ -186,17 +121,19 @@ class ClienteService:
         # Remove campos None do dicionário
         dados_atualizacao = {k: v for k, v in dados.items() if v is not None}
 
-        # Verifica se o novo email já existe (se estiver sendo atualizado)
-        if "email" in dados_atualizacao:
-            cliente_existente = self.buscar_por_email(db, dados_atualizacao["email"])
-            if cliente_existente and cliente_existente.id != id:
-                raise HTTPException(400, "Email já cadastrado por outro cliente.")
-
-        # Verifica se o novo CPF já existe (se estiver sendo atualizado)
-        if "cpf" in dados_atualizacao:
-            cliente_existente = self.buscar_por_cpf(db, dados_atualizacao["cpf"])
-            if cliente_existente and cliente_existente.id != id:
-                raise HTTPException(400, "CPF já cadastrado por outro cliente.")
+        # Verifica se o novo email/CPF já existe em outro cliente (exato ou normalizado).
+        # Clientes antigos repetidos após a normalização (v0009) podem reenviar o
+        # próprio valor: ele não é regravado, e a coluna normalizada segue NULL.
+        for campo, filtro, mensagem in (
+            ("email", filtro_email, "Email já cadastrado por outro cliente."),
+            ("cpf", filtro_cpf, "CPF já cadastrado por outro cliente."),
+        ):
+            valor = dados_atualizacao.get(campo)
+            if valor is None or not db.query(Cliente.id).filter(filtro(valor), Cliente.id != id).first():
+                continue
+            if valor != getattr(cliente, campo):
+                raise HTTPException(400, mensagem)
+            del dados_atualizacao[campo]
 
         try:
             for key, value in dados_atualizacao.items():
@@ -239,22 +176,94 @@ class ClienteService:
         return query.count()
 
     def aniversariantes_do_mes(self, db: Session, mes: int):
-        """Lista clientes que fazem aniversário no mês especificado"""
-        # Assumindo que data_nascimento está no formato "YYYY-MM-DD" ou "DD/MM/YYYY"
-        clientes = db.query(Cliente).filter(Cliente.ativo == True).all()
+        """Lista clientes ativos que fazem aniversário no mês especificado"""
+        return self._aniversariantes(db, [(mes, 1, 31)])
+
+    def aniversariantes_de_hoje(self, db: Session):
+        """Clientes ativos que fazem aniversário hoje (fuso da loja)"""
+        hoje = periodo.hoje()
+        return self._aniversariantes(db, _intervalos_aniversario(hoje, hoje))
+
+    def aniversariantes_da_semana(self, db: Session):
+        """Clientes ativos que fazem aniversário de segunda a domingo da semana atual"""
+        hoje = periodo.hoje()
+        segunda = hoje - timedelta(days=hoje.weekday())
+        return self._aniversariantes(db, _intervalos_aniversario(segunda, segunda + timedelta(days=6)))
+
+    def _aniversariantes(self, db: Session, intervalos: list) -> list:
+        """Uma busca no índice (mês, dia) por intervalo (mês, primeiro dia, último dia), na ordem dada"""
         aniversariantes = []
-        for cliente in clientes:
-            if cliente.data_nascimento:
-                try:
-                    # Tentar diferentes formatos de data
-                    if "/" in cliente.data_nascimento:
-                        partes = cliente.data_nascimento.split("/")
-                        if len(partes) >= 2 and int(partes[1]) == mes:
-                            aniversariantes.append(cliente)
-                    elif "-" in cliente.data_nascimento:
-                        partes = cliente.data_nascimento.split("-")
-                        if len(partes) >= 2 and int(partes[1]) == mes:
-                            aniversariantes.append(cliente)
-                except:
-                    continue
+        for mes, primeiro, ultimo in intervalos:
+            aniversariantes += db.query(*COLUNAS_RESUMO).filter(
+                Cliente.mes_aniversario == mes,
+                Cliente.dia_aniversario.between(primeiro, ultimo),
+                Cliente.ativo == True,
+            ).order_by(Cliente.dia_aniversario, Cliente.id).all()
         return aniversariantes
+
+
+def _intervalos_aniversario(inicio: date, fim: date) -> list:
+    """
+    (mês, primeiro dia, último dia) de cada mês entre inicio e fim. Fora dos
+    anos bissextos, quem nasceu em 29/02 entra junto com o dia 28.
+    """
+    intervalos = []
+    dia = inicio
+    while dia <= fim:
+        ultimo = min(fim, dia.replace(day=calendar.monthrange(dia.year, dia.month)[1]))
+        ate = ultimo.day
+        if ultimo.month == 2 and ate == 28 and not calendar.isleap(ultimo.year):
+            ate = 29
+        intervalos.append((dia.month, dia.day, ate))
+        dia = ultimo + timedelta(days=1)
+    return intervalos
+
+
+class AsyncClienteService:
+    """Versão assíncrona do ClienteService, usada com AsyncSession ou no threadpool"""
+
+    def __init__(self):
+        self.sync = ClienteService()
+
+    async def listar(self, db, skip: int = 0, limit: int = 100, apenas_ativos: bool = True,
+                     cursor: Optional[str] = None):
+        return await executar(db, self.sync.listar, skip, limit, apenas_ativos, cursor)
+
+    async def buscar_por_id(self, db, id: int):
+        return await executar(db, self.sync.buscar_por_id, id)
+
+    async def buscar_por_email(self, db, email: str):
+        return await executar(db, self.sync.buscar_por_email, email)
+
+    async def buscar_por_cpf(self, db, cpf: str):
+        return await executar(db, self.sync.buscar_por_cpf, cpf)
+
+    async def buscar(self, db, termo: str, limit: int = 50):
+        return await executar(db, self.sync.buscar, termo, limit)
+
+    async def criar(self, db, dados: dict):
+        return await executar_escrita(db, self.sync.criar, dados)
+
+    async def atualizar(self, db, id: int, dados: dict):
+        return await executar(db, self.sync.atualizar, id, dados)
+
+    async def desativar(self, db, id: int):
+        return await executar(db, self.sync.desativar, id)
+
+    async def reativar(self, db, id: int):
+        return await executar(db, self.sync.reativar, id)
+
+    async def deletar(self, db, id: int):
+        return await executar(db, self.sync.deletar, id)
+
+    async def contar(self, db, apenas_ativos: bool = True):
+        return await executar(db, self.sync.contar, apenas_ativos)
+
+    async def aniversariantes_do_mes(self, db, mes: int):
+        return await executar(db, self.sync.aniversariantes_do_mes, mes)
+
+    async def aniversariantes_de_hoje(self, db):
+        return await executar(db, self.sync.aniversariantes_de_hoje)
+
+    async def aniversariantes_da_semana(self, db):
+        return await executar(db, self.sync.aniversariantes_da_semana)
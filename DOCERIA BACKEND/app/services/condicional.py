@@ -0,0 +1,84 @@
+"""
+GET condicional (ETag / Last-Modified)
+
+As respostas do catálogo e do detalhe do pedido levam um ETag forte e um
+Last-Modified. O navegador (ou o quiosque) reenvia esses valores em
+If-None-Match / If-Modified-Since e recebe 304 sem corpo enquanto a versão
+não mudar — sem passar pelo serializador.
+
+- If-None-Match tem prioridade: If-Modified-Since só é avaliado sem ele
+- If-Modified-Since tem resolução de segundos: recursos que podem mudar duas
+  vezes no mesmo segundo (pedidos) passam `if_modified_since=False` e só
+  respondem 304 pelo ETag
+- Cache-Control: no-cache faz o cliente revalidar a cada navegação em vez de
+  reaproveitar a cópia por heurística
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+from fastapi import Request, Response
+
+CACHE_CONTROL_PUBLICO = "no-cache"
+CACHE_CONTROL_PRIVADO = "private, no-cache"
+
+
+def etag_do_corpo(corpo: bytes) -> str:
+    """ETag forte do conteúdo: igual em todos os workers para os mesmos bytes"""
+    return f'"{hashlib.blake2b(corpo, digest_size=12).hexdigest()}"'
+
+
+def etag_da_versao(prefixo: str, versao: datetime) -> str:
+    """ETag forte de um registro versionado pela data de atualização"""
+    return f'"{prefixo}-{versao.strftime("%Y%m%d%H%M%S%f")}"'
+
+
+def http_data(momento: datetime) -> str:
+    """Data no formato HTTP; datas sem fuso são UTC (como gravadas no banco)"""
+    if momento.tzinfo is None:
+        momento = momento.replace(tzinfo=timezone.utc)
+    return format_datetime(momento.astimezone(timezone.utc).replace(microsecond=0), usegmt=True)
+
+
+def cabecalhos(etag: str, ultima_modificacao: datetime, cache_control: str = CACHE_CONTROL_PUBLICO) -> dict:
+    return {
+        "ETag": etag,
+        "Last-Modified": http_data(ultima_modificacao),
+        "Cache-Control": cache_control,
+    }
+
+
+def _ler_data(valor: str) -> Optional[datetime]:
+    try:
+        data = parsedate_to_datetime(valor)
+    except (TypeError, ValueError, IndexError):
+        return None
+    return data if data.tzinfo else data.replace(tzinfo=timezone.utc)
+
+
+def condicional(request: Request, if_modified_since: bool = True) -> bool:
+    """Se a requisição traz If-None-Match ou (se aceito) If-Modified-Since"""
+    return "if-none-match" in request.headers or (if_modified_since and "if-modified-since" in request.headers)
+
+
+def nao_modificado(request: Request, etag: str, ultima_modificacao: datetime,
+                   if_modified_since: bool = True) -> bool:
+    """Se a cópia do cliente ainda vale (resposta 304)"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # Comparação fraca, como manda a RFC 9110 para If-None-Match
+        aceitos = {valor.strip().removeprefix("W/") for valor in if_none_match.split(",")}
+        return "*" in aceitos or etag in aceitos
+    if_modified_since = request.headers.get("if-modified-since") if if_modified_since else None
+    if if_modified_since is not None:
+        desde = _ler_data(if_modified_since)
+        if desde is None:
+            return False
+        if ultima_modificacao.tzinfo is None:
+            ultima_modificacao = ultima_modificacao.replace(tzinfo=timezone.utc)
+        return ultima_modificacao.replace(microsecond=0) <= desde
+    return False
+
+
+def resposta_304(headers: dict) -> Response:
+    return Response(status_code=304, headers=headers)
@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
+from app.data import cache_catalogo
 from app.models.evento_model import Evento
 
 class EventoService:
@@ -18,6 +19,7 @@ class EventoService:
             novo = Evento(titulo=titulo, descricao=descricao, data=data)
             db.add(novo)
             db.commit()
+            cache_catalogo.invalidar(cache_catalogo.EVENTOS)
             db.refresh(novo)
             return novo
         except:
@@ -30,6 +32,7 @@ class EventoService:
             evento.descricao = descricao
             evento.data = data
             db.commit()
+            cache_catalogo.invalidar(cache_catalogo.EVENTOS)
             db.refresh(evento)
             return evento
         except:
@@ -40,5 +43,6 @@ class EventoService:
         try:
             db.delete(evento)
             db.commit()
+            cache_catalogo.invalidar(cache_catalogo.EVENTOS)
         except:
             raise HTTPException(500, "Erro ao excluir evento.")
@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
+from app.data import cache_catalogo
 from app.models.kit_model import Kit
 
 class KitService:
@@ -18,6 +19,7 @@ class KitService:
             novo = Kit(nome=nome, descricao=descricao, preco=preco)
             db.add(novo)
             db.commit()
+            cache_catalogo.invalidar(cache_catalogo.KITS)
             db.refresh(novo)
             return novo
         except:
@@ -30,6 +32,7 @@ class KitService:
             kit.descricao = descricao
             kit.preco = preco
             db.commit()
+            cache_catalogo.invalidar(cache_catalogo.KITS)
             db.refresh(kit)
             return kit
         except:
@@ -40,5 +43,6 @@ class KitService:
         try:
             db.delete(kit)
             db.commit()
+            cache_catalogo.invalidar(cache_catalogo.KITS)
         except:
             raise HTTPException(500, "Erro ao remover kit.")
@@ -1,11 +1,31 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func
 from fastapi import HTTPException
 from datetime import datetime
 from typing import Optional
+import math
 import uuid
 from app.models.pagamento_model import Pagamento, HistoricoPagamento, StatusPagamento
 from app.models.pedido_model import Pedido, StatusPedido
+from app.models.resumo_model import ResumoDiarioPagamento
+from app.data.database import executar
+from app.data.fila_escrita import executar_escrita
+from app.services import resumo_diario
+from app.services.paginacao import aplicar_cursor
+from app.services import periodo
+from app.services.periodo import converter_data
+from app.services.projecao import colunas_resumo
+from app.schemas import PagamentoResumo
+
+# Colunas das listagens (PagamentoResumo): sem comprovante, códigos e observações
+COLUNAS_RESUMO = colunas_resumo(Pagamento, PagamentoResumo, numero_pedido=Pedido.numero_pedido)
+
+# Opções de carga do PagamentoOut: numero_pedido no mesmo SELECT, via join que
+# carrega só essa coluna do pedido
+CARGA_PAGAMENTO_OUT = (joinedload(Pagamento.pedido, innerjoin=True).load_only(Pedido.numero_pedido),)
+
+# Percentis do valor (ticket) dos pagamentos aprovados em estatisticas(percentis=True)
+PERCENTIS_TICKET = (50, 90, 95, 99)
 
 
 class PagamentoService:
@@ -27,6 +47,39 @@ class PagamentoService:
         )
         db.add(historico)
 
+    def _novo_pagamento(self, dados: dict) -> Pagamento:
+        """Monta um pagamento pendente a partir dos dados (sem gravar)"""
+        forma_pagamento = dados.get("forma_pagamento")
+        valor = dados.get("valor")
+        
+        pagamento = Pagamento(
+            pedido_id=dados.get("pedido_id"),
+            valor=valor,
+            forma_pagamento=forma_pagamento,
+            status=StatusPagamento.PENDENTE.value,
+            bandeira_cartao=dados.get("bandeira_cartao"),
+            ultimos_digitos=dados.get("ultimos_digitos"),
+            parcelas=dados.get("parcelas", 1),
+            chave_pix=dados.get("chave_pix"),
+            comprovante=dados.get("comprovante"),
+            codigo_transacao=dados.get("codigo_transacao"),
+            codigo_autorizacao=dados.get("codigo_autorizacao"),
+            nsu=dados.get("nsu"),
+            observacoes=dados.get("observacoes")
+        )
+        
+        # Gera código PIX se for pagamento PIX
+        if forma_pagamento == "pix":
+            pagamento.codigo_pix = self._gerar_codigo_pix()
+        
+        # Calcula troco se for dinheiro
+        if forma_pagamento == "dinheiro":
+            valor_pago = dados.get("valor_pago", valor)
+            pagamento.valor_pago = valor_pago
+            pagamento.troco = max(0, valor_pago - valor)
+        
+        return pagamento
+
     def criar(self, db: Session, dados: dict) -> Pagamento:
         """Cria um novo pagamento"""
         pedido_id = dados.get("pedido_id")
@@ -49,38 +102,11 @@ class PagamentoService:
         if pagamento_existente:
             raise HTTPException(400, "Já existe um pagamento aprovado para este pedido.")
         
-        forma_pagamento = dados.get("forma_pagamento")
-        valor = dados.get("valor")
-        
         try:
-            pagamento = Pagamento(
-                pedido_id=pedido_id,
-                valor=valor,
-                forma_pagamento=forma_pagamento,
-                status=StatusPagamento.PENDENTE.value,
-                bandeira_cartao=dados.get("bandeira_cartao"),
-                ultimos_digitos=dados.get("ultimos_digitos"),
-                parcelas=dados.get("parcelas", 1),
-                chave_pix=dados.get("chave_pix"),
-                comprovante=dados.get("comprovante"),
-                codigo_transacao=dados.get("codigo_transacao"),
-                codigo_autorizacao=dados.get("codigo_autorizacao"),
-                nsu=dados.get("nsu"),
-                observacoes=dados.get("observacoes")
-            )
-            
-            # Gera código PIX se for pagamento PIX
-            if forma_pagamento == "pix":
-                pagamento.codigo_pix = self._gerar_codigo_pix()
-            
-            # Calcula troco se for dinheiro
-            if forma_pagamento == "dinheiro":
-                valor_pago = dados.get("valor_pago", valor)
-                pagamento.valor_pago = valor_pago
-                pagamento.troco = max(0, valor_pago - valor)
-            
+            pagamento = self._novo_pagamento(dados)
             db.add(pagamento)
             db.flush()
+            resumo_diario.registrar_pagamento(db, pagamento)
             
             # Registra no histórico
             self._registrar_historico(
@@ -99,6 +125,37 @@ class PagamentoService:
             db.rollback()
             raise HTTPException(500, f"Erro ao criar pagamento: {str(e)}")
 
+    def registrar_no_checkout(self, db: Session, pedido: Pedido, dados: dict) -> Pagamento:
+        """
+        Adiciona o pagamento automático de um pedido recém-criado na transação do
+        próprio pedido, sem commit. Dispensa as verificações de criar(): o pedido
+        acabou de ser gravado e não tem outros pagamentos. Dinheiro já é gravado
+        aprovado e confirma o pedido, com o mesmo histórico de criar + confirmar.
+        """
+        pagamento = self._novo_pagamento(dados)
+        aprovado = pagamento.forma_pagamento == "dinheiro"
+        if aprovado:
+            pagamento.status = StatusPagamento.APROVADO.value
+            pagamento.data_pagamento = datetime.utcnow()
+        
+        db.add(pagamento)
+        db.flush()
+        resumo_diario.registrar_pagamento(db, pagamento)
+        
+        self._registrar_historico(
+            db, pagamento.id, None, StatusPagamento.PENDENTE.value,
+            "Pagamento criado"
+        )
+        if aprovado:
+            self._registrar_historico(
+                db, pagamento.id, StatusPagamento.PENDENTE.value, StatusPagamento.APROVADO.value,
+                "Pagamento confirmado/aprovado"
+            )
+            if pedido.status == StatusPedido.PENDENTE.value:
+                pedido.status = StatusPedido.CONFIRMADO.value
+        
+        return pagamento
+
     def criar_pagamento_dinheiro(self, db: Session, dados: dict) -> Pagamento:
         """Cria pagamento em dinheiro e já aprova"""
         dados["forma_pagamento"] = "dinheiro"
@@ -120,46 +177,47 @@ class PagamentoService:
 
     def buscar_por_id(self, db: Session, id: int) -> Pagamento:
         """Busca pagamento por ID"""
-        from sqlalchemy.orm import joinedload
-        pagamento = db.query(Pagamento).options(joinedload(Pagamento.pedido)).filter(Pagamento.id == id).first()
+        pagamento = db.query(Pagamento).options(*CARGA_PAGAMENTO_OUT).filter(Pagamento.id == id).first()
         if not pagamento:
             raise HTTPException(404, "Pagamento não encontrado.")
         return pagamento
 
-    def buscar_por_pedido(self, db: Session, pedido_id: int) -> list[Pagamento]:
+    def buscar_por_pedido(self, db: Session, pedido_id: int) -> list:
         """Busca todos os pagamentos de um pedido"""
-        return db.query(Pagamento).filter(
+        return db.query(*COLUNAS_RESUMO).join(Pedido).filter(
             Pagamento.pedido_id == pedido_id
         ).order_by(Pagamento.data_criacao.desc()).all()
 
-    def buscar_por_cliente(self, db: Session, cliente_id: int, skip: int = 0, limit: int = 100) -> list[Pagamento]:
+    def buscar_por_cliente(self, db: Session, cliente_id: int, skip: int = 0, limit: int = 100,
+                           cursor: Optional[str] = None) -> list:
         """Busca todos os pagamentos de pedidos de um cliente"""
         from app.models.cliente_model import Cliente
-        from sqlalchemy.orm import joinedload
         
         # Verifica se cliente existe
         cliente = db.query(Cliente).filter(Cliente.id == cliente_id).first()
         if not cliente:
             raise HTTPException(404, "Cliente não encontrado.")
         
-        # Busca pagamentos através dos pedidos do cliente, carregando relacionamento
-        return db.query(Pagamento).options(joinedload(Pagamento.pedido)).join(Pedido).filter(
+        # Busca pagamentos através dos pedidos do cliente, com o número do pedido
+        query = db.query(*COLUNAS_RESUMO).join(Pedido).filter(
             Pedido.cliente_id == cliente_id
-        ).order_by(Pagamento.data_criacao.desc()).offset(skip).limit(limit).all()
+        ).order_by(Pagamento.data_criacao.desc(), Pagamento.id.desc())
+        if cursor:
+            return aplicar_cursor(query, [Pagamento.data_criacao, Pagamento.id], cursor).limit(limit).all()
+        return query.offset(skip).limit(limit).all()
 
     def pagamento_aprovado_pedido(self, db: Session, pedido_id: int) -> Optional[Pagamento]:
         """Retorna o pagamento aprovado de um pedido, se existir"""
-        return db.query(Pagamento).filter(
+        return db.query(Pagamento).options(*CARGA_PAGAMENTO_OUT).filter(
             Pagamento.pedido_id == pedido_id,
             Pagamento.status == StatusPagamento.APROVADO.value
         ).first()
 
     def listar(self, db: Session, skip: int = 0, limit: int = 100,
-               status: Optional[str] = None, forma_pagamento: Optional[str] = None):
-        """Lista pagamentos com filtros"""
-        from sqlalchemy.orm import joinedload
-        
-        query = db.query(Pagamento).options(joinedload(Pagamento.pedido))
+               status: Optional[str] = None, forma_pagamento: Optional[str] = None,
+               cursor: Optional[str] = None):
+        """Lista pagamentos com filtros (cursor tem prioridade sobre skip)"""
+        query = db.query(*COLUNAS_RESUMO).join(Pedido)
         
         if status:
             query = query.filter(Pagamento.status == status)
@@ -167,7 +225,10 @@ class PagamentoService:
         if forma_pagamento:
             query = query.filter(Pagamento.forma_pagamento == forma_pagamento)
         
-        return query.order_by(Pagamento.data_criacao.desc()).offset(skip).limit(limit).all()
+        query = query.order_by(Pagamento.data_criacao.desc(), Pagamento.id.desc())
+        if cursor:
+            return aplicar_cursor(query, [Pagamento.data_criacao, Pagamento.id], cursor).limit(limit).all()
+        return query.offset(skip).limit(limit).all()
 
     def confirmar(self, db: Session, id: int, dados: dict = None) -> Pagamento:
         """Confirma/aprova um pagamento"""
@@ -181,7 +242,8 @@ class PagamentoService:
         
         try:
             status_anterior = pagamento.status
-            pagamento.status = StatusPagamento.APROVADO.value
+            with resumo_diario.atualizando_pagamento(db, pagamento):
+                pagamento.status = StatusPagamento.APROVADO.value
             pagamento.data_pagamento = datetime.utcnow()
             pagamento.valor_pago = pagamento.valor_pago or pagamento.valor
             
@@ -207,7 +269,8 @@ class PagamentoService:
             # Confirma o pedido se estiver pendente
             pedido = db.query(Pedido).filter(Pedido.id == pagamento.pedido_id).first()
             if pedido and pedido.status == StatusPedido.PENDENTE.value:
-                pedido.status = StatusPedido.CONFIRMADO.value
+                with resumo_diario.atualizando_pedido(db, pedido):
+                    pedido.status = StatusPedido.CONFIRMADO.value
             
             db.commit()
             db.refresh(pagamento)
@@ -229,7 +292,8 @@ class PagamentoService:
         
         try:
             status_anterior = pagamento.status
-            pagamento.status = StatusPagamento.RECUSADO.value
+            with resumo_diario.atualizando_pagamento(db, pagamento):
+                pagamento.status = StatusPagamento.RECUSADO.value
             pagamento.motivo_recusa = motivo
             
             self._registrar_historico(
@@ -258,7 +322,8 @@ class PagamentoService:
         
         try:
             status_anterior = pagamento.status
-            pagamento.status = StatusPagamento.ESTORNADO.value
+            with resumo_diario.atualizando_pagamento(db, pagamento):
+                pagamento.status = StatusPagamento.ESTORNADO.value
             pagamento.motivo_estorno = motivo
             pagamento.data_estorno = datetime.utcnow()
             
@@ -284,7 +349,8 @@ class PagamentoService:
         
         try:
             status_anterior = pagamento.status
-            pagamento.status = StatusPagamento.CANCELADO.value
+            with resumo_diario.atualizando_pagamento(db, pagamento):
+                pagamento.status = StatusPagamento.CANCELADO.value
             
             self._registrar_historico(
                 db, pagamento.id, status_anterior, StatusPagamento.CANCELADO.value,
@@ -306,52 +372,150 @@ class PagamentoService:
         ).order_by(HistoricoPagamento.data_alteracao.desc()).all()
 
     def estatisticas(self, db: Session, data_inicio: Optional[str] = None, 
-                    data_fim: Optional[str] = None):
-        """Retorna estatísticas de pagamentos"""
-        query = db.query(Pagamento)
-        
-        if data_inicio:
-            query = query.filter(func.date(Pagamento.data_criacao) >= data_inicio)
-        if data_fim:
-            query = query.filter(func.date(Pagamento.data_criacao) <= data_fim)
-        
-        pagamentos = query.all()
-        
-        # Estatísticas gerais
-        total = len(pagamentos)
-        aprovados = [p for p in pagamentos if p.status == StatusPagamento.APROVADO.value]
-        pendentes = [p for p in pagamentos if p.status == StatusPagamento.PENDENTE.value]
-        recusados = [p for p in pagamentos if p.status == StatusPagamento.RECUSADO.value]
-        estornados = [p for p in pagamentos if p.status == StatusPagamento.ESTORNADO.value]
-        
-        valor_aprovado = sum(p.valor for p in aprovados)
-        valor_estornado = sum(p.valor for p in estornados)
+                    data_fim: Optional[str] = None, por_dia: bool = False,
+                    percentis: bool = False):
+        """
+        Retorna estatísticas de pagamentos.
+
+        Os totais vêm do resumo diário agrupado por (status, forma_pagamento),
+        algumas linhas por dia do período; nenhuma linha de pagamento é trazida
+        para o processo. `por_dia` acrescenta os totais por dia (da loja) e
+        status; `percentis` acrescenta p50/p90/p95/p99 do valor dos
+        pagamentos aprovados, lidos da tabela de pagamentos.
+        """
+        inicio, fim = converter_data(data_inicio), converter_data(data_fim)
         
-        # Por forma de pagamento
+        quantidade = {}
+        valor = {}
         por_forma = {}
-        for p in aprovados:
-            forma = p.forma_pagamento
-            if forma not in por_forma:
-                por_forma[forma] = {"quantidade": 0, "valor": 0.0}
-            por_forma[forma]["quantidade"] += 1
-            por_forma[forma]["valor"] += p.valor
+        for status, forma, qtd, soma in resumo_diario.totais_pagamentos(db, inicio, fim):
+            quantidade[status] = quantidade.get(status, 0) + qtd
+            valor[status] = valor.get(status, 0.0) + soma
+            # Por forma de pagamento (somente aprovados)
+            if status == StatusPagamento.APROVADO.value:
+                por_forma[forma] = {"quantidade": qtd, "valor": round(soma, 2)}
         
-        return {
-            "total_pagamentos": total,
-            "aprovados": len(aprovados),
-            "pendentes": len(pendentes),
-            "recusados": len(recusados),
-            "estornados": len(estornados),
+        aprovados = quantidade.get(StatusPagamento.APROVADO.value, 0)
+        valor_aprovado = valor.get(StatusPagamento.APROVADO.value, 0.0)
+        valor_estornado = valor.get(StatusPagamento.ESTORNADO.value, 0.0)
+        
+        resultado = {
+            "total_pagamentos": sum(quantidade.values()),
+            "aprovados": aprovados,
+            "pendentes": quantidade.get(StatusPagamento.PENDENTE.value, 0),
+            "recusados": quantidade.get(StatusPagamento.RECUSADO.value, 0),
+            "estornados": quantidade.get(StatusPagamento.ESTORNADO.value, 0),
             "valor_total_aprovado": round(valor_aprovado, 2),
             "valor_total_estornado": round(valor_estornado, 2),
             "valor_liquido": round(valor_aprovado - valor_estornado, 2),
             "por_forma_pagamento": por_forma
         }
+        if por_dia:
+            por_dia_status = {}
+            for dia, status, qtd, soma in resumo_diario.totais_pagamentos(db, inicio, fim, por_dia=True):
+                por_dia_status.setdefault(str(dia), {})[status] = {"quantidade": qtd, "valor": round(soma, 2)}
+            resultado["por_dia"] = por_dia_status
+        if percentis:
+            aprovados_periodo = [
+                Pagamento.status == StatusPagamento.APROVADO.value,
+                *periodo.intervalo(Pagamento.data_criacao, inicio, fim),
+            ]
+            resultado["percentis_ticket"] = self._percentis_valor(db, aprovados_periodo)
+        return resultado
+
+    def _percentis_valor(self, db: Session, filtros: list) -> dict:
+        """
+        Percentis (nearest-rank) do valor dos pagamentos filtrados. No PostgreSQL
+        usa percentile_disc; nos demais bancos busca cada posição com
+        ORDER BY valor LIMIT 1 OFFSET k, uma linha por percentil.
+
+        A quantidade que define as posições é contada com os mesmos filtros da
+        consulta (não vem do resumo diário, que pode divergir das linhas).
+        """
+        if db.get_bind().dialect.name == "postgresql":
+            valores = db.query(*[
+                func.percentile_disc(p / 100).within_group(Pagamento.valor) for p in PERCENTIS_TICKET
+            ]).filter(*filtros).one()
+        else:
+            quantidade = db.query(func.count(Pagamento.id)).filter(*filtros).scalar()
+            if not quantidade:
+                return {}
+            consulta = db.query(Pagamento.valor).filter(*filtros).order_by(Pagamento.valor)
+            valores = [
+                consulta.offset(max(math.ceil(p / 100 * quantidade) - 1, 0)).limit(1).scalar()
+                for p in PERCENTIS_TICKET
+            ]
+        return {f"p{p}": round(v, 2) for p, v in zip(PERCENTIS_TICKET, valores) if v is not None}
 
     def contar(self, db: Session, status: Optional[str] = None) -> int:
-        """Conta pagamentos"""
-        query = db.query(Pagamento)
-        if status:
-            query = query.filter(Pagamento.status == status)
-        return query.count()
+        """Conta pagamentos (pelo resumo diário)"""
+        return resumo_diario.contar(db, ResumoDiarioPagamento, status)
+
+
+def _com_pedido(metodo):
+    """Carrega o número do pedido ainda dentro da sessão (usado pelo PagamentoOut)"""
+    def executar_com_pedido(db: Session, *args, **kwargs) -> Pagamento:
+        pagamento = metodo(db, *args, **kwargs)
+        pagamento.numero_pedido
+        return pagamento
+    return executar_com_pedido
+
+
+class AsyncPagamentoService:
+    """Versão assíncrona do PagamentoService, usada com AsyncSession ou no threadpool"""
+
+    def __init__(self):
+        self.sync = PagamentoService()
+
+    async def criar(self, db, dados: dict) -> Pagamento:
+        return await executar_escrita(db, _com_pedido(self.sync.criar), dados)
+
+    async def criar_pagamento_dinheiro(self, db, dados: dict) -> Pagamento:
+        return await executar_escrita(db, _com_pedido(self.sync.criar_pagamento_dinheiro), dados)
+
+    async def criar_pagamento_pix(self, db, dados: dict) -> Pagamento:
+        return await executar_escrita(db, _com_pedido(self.sync.criar_pagamento_pix), dados)
+
+    async def criar_pagamento_cartao(self, db, dados: dict) -> Pagamento:
+        return await executar_escrita(db, _com_pedido(self.sync.criar_pagamento_cartao), dados)
+
+    async def buscar_por_id(self, db, id: int) -> Pagamento:
+        return await executar(db, self.sync.buscar_por_id, id)
+
+    async def buscar_por_pedido(self, db, pedido_id: int) -> list:
+        return await executar(db, self.sync.buscar_por_pedido, pedido_id)
+
+    async def buscar_por_cliente(self, db, cliente_id: int, skip: int = 0, limit: int = 100,
+                                 cursor: Optional[str] = None) -> list:
+        return await executar(db, self.sync.buscar_por_cliente, cliente_id, skip, limit, cursor)
+
+    async def pagamento_aprovado_pedido(self, db, pedido_id: int) -> Optional[Pagamento]:
+        return await executar(db, self.sync.pagamento_aprovado_pedido, pedido_id)
+
+    async def listar(self, db, skip: int = 0, limit: int = 100,
+                     status: Optional[str] = None, forma_pagamento: Optional[str] = None,
+                     cursor: Optional[str] = None):
+        return await executar(db, self.sync.listar, skip, limit, status, forma_pagamento, cursor)
+
+    async def confirmar(self, db, id: int, dados: dict = None) -> Pagamento:
+        return await executar_escrita(db, _com_pedido(self.sync.confirmar), id, dados)
+
+    async def recusar(self, db, id: int, motivo: str) -> Pagamento:
+        return await executar(db, _com_pedido(self.sync.recusar), id, motivo)
+
+    async def estornar(self, db, id: int, dados: dict) -> Pagamento:
+        return await executar(db, _com_pedido(self.sync.estornar), id, dados)
+
+    async def cancelar(self, db, id: int) -> Pagamento:
+        return await executar(db, _com_pedido(self.sync.cancelar), id)
+
+    async def historico(self, db, pagamento_id: int) -> list[HistoricoPagamento]:
+        return await executar(db, self.sync.historico, pagamento_id)
+
+    async def estatisticas(self, db, data_inicio: Optional[str] = None,
+                           data_fim: Optional[str] = None, por_dia: bool = False,
+                           percentis: bool = False):
+        return await executar(db, self.sync.estatisticas, data_inicio, data_fim, por_dia, percentis)
 
+    async def contar(self, db, status: Optional[str] = None) -> int:
+        return await executar(db, self.sync.contar, status)
@@ -0,0 +1,57 @@
+"""
+Paginação por cursor (keyset)
+
+O cursor é opaco para o cliente: base64 dos valores da chave de ordenação do
+último item da página, ex. (data_pedido, id). A próxima página filtra pela chave
+em vez de pular linhas com OFFSET, então a página N custa o mesmo que a página 1.
+
+As listagens devolvem o cursor da próxima página no header X-Next-Cursor;
+o parâmetro `skip` continua aceito como alternativa quando não há cursor.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+from fastapi import HTTPException, Response
+from sqlalchemy import tuple_
+
+HEADER_PROXIMO_CURSOR = "X-Next-Cursor"
+
+
+def _serializar(valor):
+    return valor.isoformat() if isinstance(valor, datetime) else valor
+
+
+def codificar_cursor(*valores) -> str:
+    dados = json.dumps([_serializar(v) for v in valores], separators=(",", ":"))
+    return base64.urlsafe_b64encode(dados.encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str, colunas: list) -> list:
+    """Converte o cursor nos valores das `colunas` (datas voltam a ser datetime)"""
+    try:
+        valores = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(valores, list) or len(valores) != len(colunas):
+            raise ValueError
+        return [
+            datetime.fromisoformat(valor) if coluna.type.python_type is datetime else valor
+            for coluna, valor in zip(colunas, valores)
+        ]
+    except (ValueError, TypeError):
+        raise HTTPException(400, "Cursor inválido.")
+
+
+def aplicar_cursor(query, colunas: list, cursor: Optional[str], descendente: bool = True):
+    """Filtra a query para as linhas depois do cursor na ordenação por `colunas`"""
+    if not cursor:
+        return query
+    chave = tuple_(*colunas)
+    valores = tuple_(*decodificar_cursor(cursor, colunas))
+    return query.filter(chave < valores if descendente else chave > valores)
+
+
+def definir_proximo_cursor(response: Response, itens: list, limit: int, *atributos: str):
+    """Publica no header o cursor do último item quando a página veio cheia"""
+    if itens and len(itens) >= limit:
+        ultimo = itens[-1]
+        response.headers[HEADER_PROXIMO_CURSOR] = codificar_cursor(*(getattr(ultimo, a) for a in atributos))
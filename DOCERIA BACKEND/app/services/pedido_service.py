@@ -1,34 +1,55 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+import logging
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import func, and_, insert, extract
 from fastapi import HTTPException
-from datetime import datetime, date
+from datetime import datetime, date, time
 from typing import Optional
-from app.models.pedido_model import Pedido, ItemPedido, StatusPedido
+from app.models.pedido_model import Pedido, ItemPedido, ContadorPedido, StatusPedido
 from app.models.produto_model import Produto
 from app.models.kit_model import Kit
 from app.models.cliente_model import Cliente
+from app.models.resumo_model import ResumoDiarioPedido
+from app.config import settings
+from app.data.database import executar, insert_dialeto
+from app.data.fila_escrita import executar_escrita
+from app.services.pagamento_service import PagamentoService
+from app.services import resumo_diario
+from app.services.paginacao import aplicar_cursor
+from app.services import periodo
+from app.services.periodo import converter_data
+from app.services.projecao import colunas_resumo
+from app.schemas import PedidoResumo
+
+logger = logging.getLogger(__name__)
+
+# Colunas das listagens (PedidoResumo): sem observações, endereço e valores parciais
+COLUNAS_RESUMO = colunas_resumo(Pedido, PedidoResumo)
+
+# Opções de carga do PedidoOut: pedido + um SELECT ... IN para os itens,
+# qualquer que seja a quantidade de itens
+CARGA_PEDIDO_OUT = (selectinload(Pedido.itens),)
 
 
 class PedidoService:
 
     def gerar_numero_pedido(self, db: Session) -> str:
-        """Gera número único do pedido no formato PED-ANO-SEQUENCIAL"""
+        """
+        Gera número único do pedido no formato PED-ANO-SEQUENCIAL.
+
+        Incrementa o contador do ano com um único UPSERT ... RETURNING na
+        transação do pedido: custo constante, e a linha do contador fica
+        bloqueada até o commit, então checkouts simultâneos nunca recebem o
+        mesmo número. Se o pedido falhar, o incremento é desfeito junto.
+        """
         ano = datetime.now().year
-        
-        # Busca o último pedido do ano
-        ultimo = db.query(Pedido).filter(
-            Pedido.numero_pedido.like(f"PED-{ano}-%")
-        ).order_by(Pedido.id.desc()).first()
-        
-        if ultimo:
-            # Extrai o número sequencial e incrementa
-            try:
-                seq = int(ultimo.numero_pedido.split("-")[-1]) + 1
-            except:
-                seq = 1
-        else:
-            seq = 1
-        
+        tabela = ContadorPedido.__table__
+        upsert = (
+            insert_dialeto(db)(tabela)
+            .values(ano=ano, ultimo=1)
+            .on_conflict_do_update(index_elements=[tabela.c.ano], set_={"ultimo": tabela.c.ultimo + 1})
+            .returning(tabela.c.ultimo)
+        )
+        seq = db.execute(upsert).scalar_one()
         return f"PED-{ano}-{seq:04d}"
 
     def criar(self, db: Session, dados: dict) -> Pedido:
@@ -46,6 +67,10 @@ class PedidoService:
         if not itens_dados:
             raise HTTPException(400, "Pedido deve ter pelo menos um item.")
         
+        # Valida os itens e resolve produtos/kits antes de qualquer escrita
+        itens = self._resolver_itens(db, itens_dados)
+        subtotal = sum(item["subtotal"] for item in itens)
+        
         # Se usar endereço do cliente
         usar_endereco_cliente = dados.pop("usar_endereco_cliente", True)
         if usar_endereco_cliente and dados.get("tipo_entrega") == "entrega":
@@ -80,57 +105,25 @@ class PedidoService:
                 taxa_entrega=dados.get("taxa_entrega", 0.0),
                 observacoes=dados.get("observacoes")
             )
+            pedido.subtotal = subtotal
+            pedido.total = subtotal - pedido.desconto + pedido.taxa_entrega
             
             db.add(pedido)
             db.flush()  # Para obter o ID do pedido
             
-            # Adiciona os itens
-            subtotal = 0.0
-            for item_dado in itens_dados:
-                item = self._criar_item_pedido(db, pedido.id, item_dado)
-                subtotal += item.subtotal
-            
-            # Atualiza totais
-            pedido.subtotal = subtotal
-            pedido.total = subtotal - pedido.desconto + pedido.taxa_entrega
+            # Insere todos os itens em um único executemany
+            for item in itens:
+                item["pedido_id"] = pedido.id
+            db.execute(insert(ItemPedido.__table__), itens)
             
-            db.commit()
-            db.refresh(pedido)
-            
-            # Cria pagamento automaticamente se forma_pagamento foi informada
-            # Fazemos após o commit para evitar problemas de transação
+            # Pagamento automático na mesma transação, se forma_pagamento foi informada
             if dados.get("forma_pagamento"):
-                try:
-                    from app.models.pagamento_model import Pagamento, StatusPagamento
-                    from app.services.pagamento_service import PagamentoService
-                    
-                    pagamento_service = PagamentoService()
-                    pagamento_data = {
-                        "pedido_id": pedido.id,
-                        "valor": pedido.total,
-                        "forma_pagamento": dados.get("forma_pagamento"),
-                        "observacoes": f"Pagamento criado automaticamente para pedido {pedido.numero_pedido}"
-                    }
-                    
-                    # Se for dinheiro, aprova automaticamente
-                    if dados.get("forma_pagamento") == "dinheiro":
-                        if dados.get("troco_para"):
-                            pagamento_data["valor_pago"] = dados.get("troco_para")
-                        else:
-                            pagamento_data["valor_pago"] = pedido.total
-                        pagamento_service.criar_pagamento_dinheiro(db, pagamento_data)
-                    # Se for PIX, cria pendente
-                    elif dados.get("forma_pagamento") == "pix":
-                        pagamento_service.criar_pagamento_pix(db, pagamento_data)
-                    # Outros métodos ficam pendentes
-                    else:
-                        pagamento_service.criar(db, pagamento_data)
-                except Exception as e:
-                    # Log do erro mas não falha o pedido
-                    import logging
-                    logger = logging.getLogger(__name__)
-                    logger.error(f"Erro ao criar pagamento automático para pedido {pedido.id}: {e}")
+                self._registrar_pagamento(db, pedido, dados)
+            
+            resumo_diario.registrar_pedido(db, pedido)
+            resumo_diario.registrar_itens(db, pedido.data_pedido, itens)
             
+            db.commit()
             return pedido
             
         except HTTPException:
@@ -140,55 +133,94 @@ class PedidoService:
             db.rollback()
             raise HTTPException(500, f"Erro ao criar pedido: {str(e)}")
 
-    def _criar_item_pedido(self, db: Session, pedido_id: int, item_dado: dict) -> ItemPedido:
-        """Cria um item do pedido"""
-        produto_id = item_dado.get("produto_id")
-        kit_id = item_dado.get("kit_id")
-        quantidade = item_dado.get("quantidade", 1)
-        
-        if not produto_id and not kit_id:
-            raise HTTPException(400, "Item deve ter um produto_id ou kit_id.")
-        
-        if produto_id and kit_id:
-            raise HTTPException(400, "Item deve ter apenas produto_id OU kit_id, não ambos.")
-        
-        # Busca produto ou kit
-        if produto_id:
-            produto = db.query(Produto).filter(Produto.id == produto_id).first()
-            if not produto:
-                raise HTTPException(404, f"Produto {produto_id} não encontrado.")
-            nome_item = produto.nome
-            descricao_item = produto.descricao
-            preco_unitario = produto.preco
-        else:
-            kit = db.query(Kit).filter(Kit.id == kit_id).first()
-            if not kit:
-                raise HTTPException(404, f"Kit {kit_id} não encontrado.")
-            nome_item = kit.nome
-            descricao_item = kit.descricao
-            preco_unitario = kit.preco
-        
-        subtotal = preco_unitario * quantidade
+    def _registrar_pagamento(self, db: Session, pedido: Pedido, dados: dict):
+        """
+        Cria o pagamento automático do checkout (dinheiro já aprovado, demais
+        pendentes). Com CHECKOUT_PAGAMENTO_OPCIONAL ele roda em um SAVEPOINT:
+        se falhar, só o pagamento é desfeito e o pedido é gravado mesmo assim.
+        """
+        forma_pagamento = dados["forma_pagamento"]
+        pagamento_data = {
+            "pedido_id": pedido.id,
+            "valor": pedido.total,
+            "forma_pagamento": forma_pagamento,
+            "observacoes": f"Pagamento criado automaticamente para pedido {pedido.numero_pedido}"
+        }
+        if forma_pagamento == "dinheiro":
+            pagamento_data["valor_pago"] = dados.get("troco_para") or pedido.total
         
-        item = ItemPedido(
-            pedido_id=pedido_id,
-            produto_id=produto_id,
-            kit_id=kit_id,
-            nome_item=nome_item,
-            descricao_item=descricao_item,
-            quantidade=quantidade,
-            preco_unitario=preco_unitario,
-            subtotal=subtotal,
-            observacoes=item_dado.get("observacoes")
-        )
+        if not settings.CHECKOUT_PAGAMENTO_OPCIONAL:
+            PagamentoService().registrar_no_checkout(db, pedido, pagamento_data)
+            return
         
-        db.add(item)
-        return item
+        try:
+            with db.begin_nested():
+                PagamentoService().registrar_no_checkout(db, pedido, pagamento_data)
+        except Exception as e:
+            # Log do erro mas não falha o pedido
+            logger.error(f"Erro ao criar pagamento automático para pedido {pedido.id}: {e}")
+
+    def _resolver_itens(self, db: Session, itens_dados: list) -> list[dict]:
+        """
+        Valida os itens e resolve produtos e kits com no máximo duas consultas IN.
+        Retorna as linhas de itens_pedido (sem pedido_id) na ordem recebida.
+        """
+        for item_dado in itens_dados:
+            produto_id = item_dado.get("produto_id")
+            kit_id = item_dado.get("kit_id")
+            
+            if not produto_id and not kit_id:
+                raise HTTPException(400, "Item deve ter um produto_id ou kit_id.")
+            
+            if produto_id and kit_id:
+                raise HTTPException(400, "Item deve ter apenas produto_id OU kit_id, não ambos.")
+        
+        ids_produtos = {i["produto_id"] for i in itens_dados if i.get("produto_id")}
+        ids_kits = {i["kit_id"] for i in itens_dados if i.get("kit_id")}
+        
+        produtos = {}
+        if ids_produtos:
+            produtos = {p.id: p for p in db.query(
+                Produto.id, Produto.nome, Produto.descricao, Produto.preco
+            ).filter(Produto.id.in_(ids_produtos))}
+        kits = {}
+        if ids_kits:
+            kits = {k.id: k for k in db.query(
+                Kit.id, Kit.nome, Kit.descricao, Kit.preco
+            ).filter(Kit.id.in_(ids_kits))}
+        
+        itens = []
+        for item_dado in itens_dados:
+            produto_id = item_dado.get("produto_id")
+            kit_id = item_dado.get("kit_id")
+            quantidade = item_dado.get("quantidade", 1)
+            
+            if produto_id:
+                origem = produtos.get(produto_id)
+                if origem is None:
+                    raise HTTPException(404, f"Produto {produto_id} não encontrado.")
+            else:
+                origem = kits.get(kit_id)
+                if origem is None:
+                    raise HTTPException(404, f"Kit {kit_id} não encontrado.")
+            
+            itens.append({
+                "produto_id": produto_id,
+                "kit_id": kit_id,
+                "nome_item": origem.nome,
+                "descricao_item": origem.descricao,
+                "quantidade": quantidade,
+                "preco_unitario": origem.preco,
+                "subtotal": origem.preco * quantidade,
+                "observacoes": item_dado.get("observacoes"),
+            })
+        return itens
 
     def listar(self, db: Session, skip: int = 0, limit: int = 100, 
-               status: Optional[str] = None, cliente_id: Optional[int] = None):
-        """Lista pedidos com filtros"""
-        query = db.query(Pedido)
+               status: Optional[str] = None, cliente_id: Optional[int] = None,
+               cursor: Optional[str] = None):
+        """Lista pedidos com filtros (cursor tem prioridade sobre skip)"""
+        query = db.query(*COLUNAS_RESUMO)
         
         if status:
             query = query.filter(Pedido.status == status)
@@ -196,18 +228,28 @@ class PedidoService:
         if cliente_id:
             query = query.filter(Pedido.cliente_id == cliente_id)
         
-        return query.order_by(Pedido.data_pedido.desc()).offset(skip).limit(limit).all()
+        query = query.order_by(Pedido.data_pedido.desc(), Pedido.id.desc())
+        if cursor:
+            return aplicar_cursor(query, [Pedido.data_pedido, Pedido.id], cursor).limit(limit).all()
+        return query.offset(skip).limit(limit).all()
 
     def buscar_por_id(self, db: Session, id: int) -> Pedido:
         """Busca pedido por ID"""
-        pedido = db.query(Pedido).filter(Pedido.id == id).first()
+        pedido = db.query(Pedido).options(*CARGA_PEDIDO_OUT).filter(Pedido.id == id).first()
         if not pedido:
             raise HTTPException(404, "Pedido não encontrado.")
         return pedido
 
+    def versao(self, db: Session, id: int) -> datetime:
+        """Data da última alteração do pedido (versão do ETag), sem carregar os itens"""
+        linha = db.query(Pedido.data_atualizacao, Pedido.data_criacao).filter(Pedido.id == id).first()
+        if not linha:
+            raise HTTPException(404, "Pedido não encontrado.")
+        return linha.data_atualizacao or linha.data_criacao
+
     def buscar_por_numero(self, db: Session, numero: str) -> Pedido:
         """Busca pedido por número"""
-        pedido = db.query(Pedido).filter(Pedido.numero_pedido == numero).first()
+        pedido = db.query(Pedido).options(*CARGA_PEDIDO_OUT).filter(Pedido.numero_pedido == numero).first()
         if not pedido:
             raise HTTPException(404, "Pedido não encontrado.")
         return pedido
@@ -228,7 +270,8 @@ class PedidoService:
             raise HTTPException(400, "Não é possível alterar status de pedido já entregue.")
         
         try:
-            pedido.status = novo_status
+            with resumo_diario.atualizando_pedido(db, pedido):
+                pedido.status = novo_status
             db.commit()
             db.refresh(pedido)
             return pedido
@@ -249,7 +292,8 @@ class PedidoService:
             raise HTTPException(400, "Pedido já está cancelado.")
         
         try:
-            pedido.status = StatusPedido.CANCELADO.value
+            with resumo_diario.atualizando_pedido(db, pedido):
+                pedido.status = StatusPedido.CANCELADO.value
             if motivo:
                 pedido.observacoes = f"{pedido.observacoes or ''}\n[CANCELADO] {motivo}".strip()
             db.commit()
@@ -271,13 +315,14 @@ class PedidoService:
         dados_atualizacao = {k: v for k, v in dados.items() if v is not None}
         
         try:
-            for key, value in dados_atualizacao.items():
-                if hasattr(pedido, key):
-                    setattr(pedido, key, value)
-            
-            # Recalcula total se necessário
-            if 'desconto' in dados_atualizacao or 'taxa_entrega' in dados_atualizacao:
-                pedido.total = pedido.subtotal - pedido.desconto + pedido.taxa_entrega
+            with resumo_diario.atualizando_pedido(db, pedido):
+                for key, value in dados_atualizacao.items():
+                    if hasattr(pedido, key):
+                        setattr(pedido, key, value)
+                
+                # Recalcula total se necessário
+                if 'desconto' in dados_atualizacao or 'taxa_entrega' in dados_atualizacao:
+                    pedido.total = pedido.subtotal - pedido.desconto + pedido.taxa_entrega
             
             db.commit()
             db.refresh(pedido)
@@ -288,20 +333,17 @@ class PedidoService:
 
     def pedidos_do_dia(self, db: Session, data: Optional[str] = None):
         """Lista pedidos de uma data específica"""
-        if data:
-            data_filtro = data
-        else:
-            data_filtro = date.today().isoformat()
+        dia = converter_data(data) or periodo.hoje()
         
-        pedidos = db.query(Pedido).filter(
-            func.date(Pedido.data_pedido) == data_filtro
+        pedidos = db.query(*COLUNAS_RESUMO).filter(
+            *periodo.intervalo(Pedido.data_pedido, dia, dia)
         ).order_by(Pedido.data_pedido.desc()).all()
         
         return pedidos
 
     def pedidos_por_status(self, db: Session, status: str):
         """Lista pedidos por status"""
-        return db.query(Pedido).filter(
+        return db.query(*COLUNAS_RESUMO).filter(
             Pedido.status == status
         ).order_by(Pedido.data_pedido.desc()).all()
 
@@ -314,27 +356,38 @@ class PedidoService:
             StatusPedido.PRONTO.value,
             StatusPedido.SAIU_ENTREGA.value
         ]
-        return db.query(Pedido).filter(
+        return db.query(*COLUNAS_RESUMO).filter(
             Pedido.status.in_(status_ativos)
         ).order_by(Pedido.data_pedido.asc()).all()
 
     def estatisticas(self, db: Session, data_inicio: Optional[str] = None, data_fim: Optional[str] = None):
-        """Retorna estatísticas dos pedidos"""
-        query = db.query(Pedido)
-        
-        if data_inicio:
-            query = query.filter(func.date(Pedido.data_pedido) >= data_inicio)
-        if data_fim:
-            query = query.filter(func.date(Pedido.data_pedido) <= data_fim)
-        
-        pedidos = query.all()
-        
-        total_pedidos = len(pedidos)
-        pedidos_entregues = len([p for p in pedidos if p.status == StatusPedido.ENTREGUE.value])
-        pedidos_cancelados = len([p for p in pedidos if p.status == StatusPedido.CANCELADO.value])
-        pedidos_pendentes = len([p for p in pedidos if p.status not in [StatusPedido.ENTREGUE.value, StatusPedido.CANCELADO.value]])
-        
-        valor_total = sum(p.total for p in pedidos if p.status != StatusPedido.CANCELADO.value)
+        """
+        Retorna estatísticas dos pedidos.
+
+        Os totais vêm do resumo diário (algumas linhas por dia do período) e só
+        por_hora agrupa os pedidos no banco; nada é carregado linha a linha.
+        Os detalhamentos por tipo de entrega, forma de pagamento e hora do dia
+        desconsideram os pedidos cancelados, assim como valor_total. Datas e
+        horas são as da loja (FUSO_HORARIO_LOJA).
+        """
+        inicio, fim = converter_data(data_inicio), converter_data(data_fim)
+        
+        por_status, por_tipo_entrega, por_forma_pagamento = {}, {}, {}
+        for status, tipo_entrega, forma_pagamento, qtd, valor in resumo_diario.totais_pedidos(db, inicio, fim):
+            _acumular(por_status, status, qtd, valor)
+            if status != StatusPedido.CANCELADO.value:
+                _acumular(por_tipo_entrega, tipo_entrega, qtd, valor)
+                _acumular(por_forma_pagamento, forma_pagamento, qtd, valor)
+        
+        def quantidade(status: str) -> int:
+            return por_status.get(status, {}).get("quantidade", 0)
+        
+        total_pedidos = sum(g["quantidade"] for g in por_status.values())
+        pedidos_entregues = quantidade(StatusPedido.ENTREGUE.value)
+        pedidos_cancelados = quantidade(StatusPedido.CANCELADO.value)
+        pedidos_pendentes = total_pedidos - pedidos_entregues - pedidos_cancelados
+        
+        valor_total = sum(g["valor"] for s, g in por_status.items() if s != StatusPedido.CANCELADO.value)
         ticket_medio = valor_total / pedidos_entregues if pedidos_entregues > 0 else 0
         
         return {
@@ -343,19 +396,129 @@ class PedidoService:
             "pedidos_cancelados": pedidos_cancelados,
             "pedidos_pendentes": pedidos_pendentes,
             "valor_total": round(valor_total, 2),
-            "ticket_medio": round(ticket_medio, 2)
+            "ticket_medio": round(ticket_medio, 2),
+            "por_status": _arredondar(por_status),
+            "por_tipo_entrega": _arredondar(por_tipo_entrega),
+            "por_forma_pagamento": _arredondar(por_forma_pagamento),
+            "por_hora": _arredondar(self._por_hora(db, inicio, fim)),
         }
 
+    def produtos_vendidos(self, db: Session, data_inicio: Optional[str] = None,
+                          data_fim: Optional[str] = None, limit: int = 20):
+        """Produtos e kits mais vendidos no período (pelo resumo diário)"""
+        return [
+            {"tipo_item": tipo, "item_id": item_id, "nome": nome, "quantidade": qtd, "valor": round(valor, 2)}
+            for tipo, item_id, nome, qtd, valor in resumo_diario.produtos_vendidos(
+                db, converter_data(data_inicio), converter_data(data_fim), limit
+            )
+        ]
+
+    def _por_hora(self, db: Session, inicio: Optional[date], fim: Optional[date]) -> dict:
+        """
+        Pedidos não cancelados por hora do dia da loja. O banco agrupa por dia e
+        hora UTC (no máximo 24 linhas por dia) e cada grupo é convertido para a
+        hora local aqui, o que acompanha mudanças de horário de verão.
+        """
+        dia_utc, hora_utc = func.date(Pedido.data_pedido), extract("hour", Pedido.data_pedido)
+        linhas = db.query(
+            dia_utc, hora_utc, func.count(Pedido.id), func.coalesce(func.sum(Pedido.total), 0.0)
+        ).filter(
+            *periodo.intervalo(Pedido.data_pedido, inicio, fim),
+            Pedido.status.is_distinct_from(StatusPedido.CANCELADO.value),
+        ).group_by(dia_utc, hora_utc).all()
+        
+        por_hora = {}
+        for dia, hora, qtd, valor in linhas:
+            if dia is None:
+                continue
+            momento = datetime.combine(date.fromisoformat(str(dia)), time(int(hora)))
+            _acumular(por_hora, periodo.horario_local(momento).hour, qtd, valor)
+        return dict(sorted(por_hora.items()))
+
     def pedidos_cliente(self, db: Session, cliente_id: int):
         """Lista todos os pedidos de um cliente"""
-        return db.query(Pedido).filter(
+        return db.query(*COLUNAS_RESUMO).filter(
             Pedido.cliente_id == cliente_id
         ).order_by(Pedido.data_pedido.desc()).all()
 
     def contar(self, db: Session, status: Optional[str] = None) -> int:
-        """Conta pedidos"""
-        query = db.query(Pedido)
-        if status:
-            query = query.filter(Pedido.status == status)
-        return query.count()
+        """Conta pedidos (pelo resumo diário)"""
+        return resumo_diario.contar(db, ResumoDiarioPedido, status)
+
+
+def _acumular(grupos: dict, chave, quantidade: int, valor: float):
+    grupo = grupos.setdefault(chave, {"quantidade": 0, "valor": 0.0})
+    grupo["quantidade"] += quantidade
+    grupo["valor"] += valor
+
+
+def _arredondar(grupos: dict) -> dict:
+    return {chave: {**g, "valor": round(g["valor"], 2)} for chave, g in grupos.items()}
+
+
+def _com_itens(metodo):
+    """
+    Garante os itens carregados ainda dentro da sessão (usados pelo PedidoOut).
+    Nas buscas já vêm por CARGA_PEDIDO_OUT; nas escritas, após o commit, é um
+    único SELECT dos itens.
+    """
+    def executar_com_itens(db: Session, *args, **kwargs) -> Pedido:
+        pedido = metodo(db, *args, **kwargs)
+        pedido.itens
+        return pedido
+    return executar_com_itens
+
+
+class AsyncPedidoService:
+    """Versão assíncrona do PedidoService, usada com AsyncSession ou no threadpool"""
+
+    def __init__(self):
+        self.sync = PedidoService()
+
+    async def criar(self, db, dados: dict) -> Pedido:
+        return await executar_escrita(db, _com_itens(self.sync.criar), dados)
+
+    async def listar(self, db, skip: int = 0, limit: int = 100,
+                     status: Optional[str] = None, cliente_id: Optional[int] = None,
+                     cursor: Optional[str] = None):
+        return await executar(db, self.sync.listar, skip, limit, status, cliente_id, cursor)
+
+    async def buscar_por_id(self, db, id: int) -> Pedido:
+        return await executar(db, _com_itens(self.sync.buscar_por_id), id)
+
+    async def versao(self, db, id: int) -> datetime:
+        return await executar(db, self.sync.versao, id)
+
+    async def buscar_por_numero(self, db, numero: str) -> Pedido:
+        return await executar(db, _com_itens(self.sync.buscar_por_numero), numero)
+
+    async def atualizar_status(self, db, id: int, novo_status: str) -> Pedido:
+        return await executar(db, _com_itens(self.sync.atualizar_status), id, novo_status)
+
+    async def cancelar(self, db, id: int, motivo: Optional[str] = None) -> Pedido:
+        return await executar(db, _com_itens(self.sync.cancelar), id, motivo)
+
+    async def atualizar(self, db, id: int, dados: dict) -> Pedido:
+        return await executar(db, _com_itens(self.sync.atualizar), id, dados)
+
+    async def pedidos_do_dia(self, db, data: Optional[str] = None):
+        return await executar(db, self.sync.pedidos_do_dia, data)
+
+    async def pedidos_por_status(self, db, status: str):
+        return await executar(db, self.sync.pedidos_por_status, status)
+
+    async def pedidos_pendentes(self, db):
+        return await executar(db, self.sync.pedidos_pendentes)
+
+    async def estatisticas(self, db, data_inicio: Optional[str] = None, data_fim: Optional[str] = None):
+        return await executar(db, self.sync.estatisticas, data_inicio, data_fim)
+
+    async def produtos_vendidos(self, db, data_inicio: Optional[str] = None,
+                                data_fim: Optional[str] = None, limit: int = 20):
+        return await executar(db, self.sync.produtos_vendidos, data_inicio, data_fim, limit)
+
+    async def pedidos_cliente(self, db, cliente_id: int):
+        return await executar(db, self.sync.pedidos_cliente, cliente_id)
 
+    async def contar(self, db, status: Optional[str] = None) -> int:
+        return await executar(db, self.sync.contar, status)
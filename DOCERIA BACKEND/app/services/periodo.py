@@ -0,0 +1,58 @@
+"""
+Datas dos filtros de período (YYYY-MM-DD) recebidas nas rotas de estatísticas
+
+As datas são dias da loja (FUSO_HORARIO_LOJA), enquanto data_pedido e
+data_criacao são gravadas em UTC sem fuso. Os filtros convertem o dia em um
+intervalo semiaberto [00:00 do dia, 00:00 do dia seguinte) em UTC e comparam a
+coluna diretamente, sem func.date(), para que o índice da coluna seja usado.
+"""
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import Optional
+from zoneinfo import ZoneInfo
+from fastapi import HTTPException
+from app.config import settings
+
+
+def converter_data(valor: Optional[str]) -> Optional[date]:
+    if not valor:
+        return None
+    try:
+        return date.fromisoformat(valor)
+    except ValueError:
+        raise HTTPException(400, f"Data inválida: {valor}. Use o formato YYYY-MM-DD.")
+
+
+@lru_cache
+def fuso_loja() -> ZoneInfo:
+    return ZoneInfo(settings.FUSO_HORARIO_LOJA)
+
+
+def hoje() -> date:
+    """Data atual no fuso da loja"""
+    return datetime.now(fuso_loja()).date()
+
+
+def horario_local(momento: datetime) -> datetime:
+    """Converte um datetime gravado (UTC sem fuso) para o horário da loja"""
+    return momento.replace(tzinfo=timezone.utc).astimezone(fuso_loja())
+
+
+def dia_local(momento: datetime) -> date:
+    """Dia da loja de um datetime gravado (UTC sem fuso)"""
+    return horario_local(momento).date()
+
+
+def inicio_do_dia(dia: date) -> datetime:
+    """00:00 do dia da loja em UTC sem fuso, como as colunas são gravadas"""
+    return datetime.combine(dia, time.min, tzinfo=fuso_loja()).astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def intervalo(coluna, inicio: Optional[date], fim: Optional[date]) -> list:
+    """Filtros de `coluna` (datetime) para os dias inicio..fim da loja, inclusive"""
+    filtros = []
+    if inicio:
+        filtros.append(coluna >= inicio_do_dia(inicio))
+    if fim:
+        filtros.append(coluna < inicio_do_dia(fim + timedelta(days=1)))
+    return filtros
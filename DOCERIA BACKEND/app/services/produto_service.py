@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
+from app.data import cache_catalogo
 from app.models.produto_model import Produto
 
 class ProdutoService:
@@ -23,6 +24,7 @@ class ProdutoService:
             )
             db.add(novo)
             db.commit()
+            cache_catalogo.invalidar(cache_catalogo.PRODUTOS)
             db.refresh(novo)
             return novo
         except Exception:
@@ -37,6 +39,7 @@ class ProdutoService:
             prod.categoria_id = categoria_id
 
             db.commit()
+            cache_catalogo.invalidar(cache_catalogo.PRODUTOS)
             db.refresh(prod)
             return prod
         except:
@@ -47,5 +50,6 @@ class ProdutoService:
         try:
             db.delete(prod)
             db.commit()
+            cache_catalogo.invalidar(cache_catalogo.PRODUTOS)
         except:
             raise HTTPException(500, "Erro ao excluir produto.")
@@ -0,0 +1,25 @@
+"""
+Colunas das listagens (schemas *Resumo)
+
+As listagens selecionam apenas as colunas usadas pelo schema resumido e devolvem
+as linhas (Row) sem passar pelo ORM: sem identity map e sem carregar textos
+grandes (observacoes, comprovante) ou campos de endereço. As Row têm acesso por
+atributo, então o response_model (from_attributes) as valida diretamente.
+"""
+from sqlalchemy import inspect
+
+
+def colunas_resumo(modelo, schema, **extras) -> list:
+    """
+    Colunas de `modelo` com o mesmo nome dos campos de `schema`, na ordem do schema.
+    `extras` fornece expressões para campos que não são colunas do modelo
+    (ex.: numero_pedido=Pedido.numero_pedido).
+    """
+    colunas_modelo = inspect(modelo).columns
+    colunas = []
+    for campo in schema.model_fields:
+        if campo in extras:
+            colunas.append(extras[campo].label(campo))
+        elif campo in colunas_modelo:
+            colunas.append(getattr(modelo, campo))
+    return colunas
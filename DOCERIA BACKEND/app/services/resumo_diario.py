@@ -0,0 +1,336 @@
+"""
+Resumos diários (rollups) para os dashboards
+
+As estatísticas e os totais leem `resumo_diario_pedidos`, `resumo_diario_pagamentos`
+e `resumo_diario_produtos` em vez de varrer pedidos e pagamentos: um período de
+um ano lê algumas linhas por dia, qualquer que seja o volume de pedidos.
+
+Os serviços mantêm os resumos na mesma transação das escritas, somando deltas
+com UPSERT (INSERT ... ON CONFLICT DO UPDATE):
+    - criação: registrar_pedido, registrar_itens e registrar_pagamento
+    - alterações: `with atualizando_pedido(db, pedido): ...` (idem pagamento),
+      que move a contribuição do registro para os valores após o bloco
+
+Para preencher ou corrigir os resumos a partir dos dados (backfill):
+    python -m app.services.resumo_diario
+    python -m app.services.resumo_diario --inicio 2025-01-01 --fim 2025-12-31
+
+Os dias são os da loja: o fuso usado fica em resumo_diario_parametros. Depois
+de mudar FUSO_HORARIO_LOJA a aplicação não inicia (verificar_fuso) até uma
+reconstrução completa, sem --inicio/--fim, gravar os resumos no fuso novo.
+"""
+import argparse
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Optional
+from sqlalchemy import func, insert, select, and_
+from sqlalchemy.orm import Session
+from app.data.database import insert_dialeto
+from app.models.kit_model import Kit
+from app.models.pedido_model import Pedido, ItemPedido, StatusPedido
+from app.models.pagamento_model import Pagamento
+from app.models.produto_model import Produto
+from app.config import settings
+from app.models.resumo_model import (
+    ResumoDiarioPedido, ResumoDiarioPagamento, ResumoDiarioProduto, ResumoDiarioParametro,
+)
+from app.services import periodo
+
+FUSO_HORARIO = "fuso_horario"
+
+
+def dia_resumo(momento: datetime) -> date:
+    """Dia do resumo de um data_pedido/data_criacao: o dia da loja (FUSO_HORARIO_LOJA)"""
+    return periodo.dia_local(momento)
+
+
+def _intervalo(coluna, inicio: Optional[date], fim: Optional[date]) -> list:
+    """Filtros de `coluna` (datetime) para os registros dos dias inicio..fim do resumo"""
+    return [coluna.isnot(None), *periodo.intervalo(coluna, inicio, fim)]
+
+
+def _periodo(modelo, inicio: Optional[date], fim: Optional[date]) -> list:
+    filtros = []
+    if inicio:
+        filtros.append(modelo.dia >= inicio)
+    if fim:
+        filtros.append(modelo.dia <= fim)
+    return filtros
+
+
+def _valor(coluna):
+    """Coluna da chave com "" convertido de volta para None"""
+    return func.nullif(coluna, "").label(coluna.key)
+
+
+def fuso_dos_resumos(db: Session) -> Optional[str]:
+    """Fuso em que os resumos gravados foram calculados (None se não registrado)"""
+    return db.query(ResumoDiarioParametro.valor).filter(ResumoDiarioParametro.nome == FUSO_HORARIO).scalar()
+
+
+def verificar_fuso(db: Session):
+    """Falha se os resumos foram calculados em um fuso diferente de FUSO_HORARIO_LOJA"""
+    fuso = fuso_dos_resumos(db)
+    if fuso is not None and fuso != settings.FUSO_HORARIO_LOJA:
+        raise RuntimeError(
+            f"Resumos diários calculados no fuso {fuso}, mas FUSO_HORARIO_LOJA={settings.FUSO_HORARIO_LOJA}. "
+            "Reconstrua os resumos: python -m app.services.resumo_diario"
+        )
+
+
+def _gravar_fuso(db: Session):
+    tabela = ResumoDiarioParametro.__table__
+    upsert = insert_dialeto(db)(tabela).values(nome=FUSO_HORARIO, valor=settings.FUSO_HORARIO_LOJA)
+    db.execute(upsert.on_conflict_do_update(index_elements=[tabela.c.nome], set_={"valor": upsert.excluded.valor}))
+
+
+# Manutenção (chamada pelos serviços, sem commit)
+
+def _somar(db: Session, modelo, linhas: list):
+    """Soma quantidade e valor_total de `linhas` nas linhas do resumo com a mesma chave"""
+    if not linhas:
+        return
+    tabela = modelo.__table__
+    upsert = insert_dialeto(db)(tabela)
+    upsert = upsert.on_conflict_do_update(
+        index_elements=list(tabela.primary_key.columns),
+        set_={
+            "quantidade": tabela.c.quantidade + upsert.excluded.quantidade,
+            "valor_total": tabela.c.valor_total + upsert.excluded.valor_total,
+        },
+    )
+    db.execute(upsert, linhas)
+
+
+def _chave_pedido(pedido: Pedido) -> dict:
+    return {
+        "dia": dia_resumo(pedido.data_pedido),
+        "status": pedido.status or "",
+        "tipo_entrega": pedido.tipo_entrega or "",
+        "forma_pagamento": pedido.forma_pagamento or "",
+    }
+
+
+def _chave_pagamento(pagamento: Pagamento) -> dict:
+    return {
+        "dia": dia_resumo(pagamento.data_criacao),
+        "status": pagamento.status or "",
+        "forma_pagamento": pagamento.forma_pagamento or "",
+    }
+
+
+def registrar_pedido(db: Session, pedido: Pedido):
+    """Soma um pedido recém-gravado (após o flush) no resumo de pedidos"""
+    _somar(db, ResumoDiarioPedido, [{**_chave_pedido(pedido), "quantidade": 1, "valor_total": pedido.total or 0.0}])
+
+
+def registrar_itens(db: Session, data_pedido: datetime, itens: list, sinal: int = 1):
+    """
+    Soma (sinal=1) ou subtrai (sinal=-1) os itens de um pedido no resumo de
+    produtos. `itens`: dicts com produto_id, kit_id, quantidade e subtotal.
+    """
+    dia = dia_resumo(data_pedido)
+    totais = {}
+    for item in itens:
+        chave = ("produto", item["produto_id"]) if item.get("produto_id") else ("kit", item["kit_id"])
+        quantidade, valor = totais.get(chave, (0, 0.0))
+        totais[chave] = (quantidade + item["quantidade"], valor + item["subtotal"])
+    _somar(db, ResumoDiarioProduto, [
+        {"dia": dia, "tipo_item": tipo, "item_id": item_id,
+         "quantidade": sinal * quantidade, "valor_total": sinal * valor}
+        for (tipo, item_id), (quantidade, valor) in totais.items()
+    ])
+
+
+def registrar_pagamento(db: Session, pagamento: Pagamento):
+    """Soma um pagamento recém-gravado (após o flush) no resumo de pagamentos"""
+    _somar(db, ResumoDiarioPagamento, [{**_chave_pagamento(pagamento), "quantidade": 1,
+                                        "valor_total": pagamento.valor or 0.0}])
+
+
+@contextmanager
+def atualizando_pedido(db: Session, pedido: Pedido):
+    """
+    Envolve alterações de um pedido já gravado: move a contribuição dele no
+    resumo de pedidos para os valores após o bloco, e retira ou devolve os itens
+    no resumo de produtos quando o pedido é cancelado.
+    """
+    chave, total = _chave_pedido(pedido), pedido.total or 0.0
+    cancelado = pedido.status == StatusPedido.CANCELADO.value
+    yield
+    nova_chave, novo_total = _chave_pedido(pedido), pedido.total or 0.0
+    if (nova_chave, novo_total) != (chave, total):
+        _somar(db, ResumoDiarioPedido, [
+            {**chave, "quantidade": -1, "valor_total": -total},
+            {**nova_chave, "quantidade": 1, "valor_total": novo_total},
+        ])
+    if (pedido.status == StatusPedido.CANCELADO.value) != cancelado:
+        itens = db.query(
+            ItemPedido.produto_id, ItemPedido.kit_id, ItemPedido.quantidade, ItemPedido.subtotal
+        ).filter(ItemPedido.pedido_id == pedido.id).all()
+        registrar_itens(db, pedido.data_pedido, [i._asdict() for i in itens], 1 if cancelado else -1)
+
+
+@contextmanager
+def atualizando_pagamento(db: Session, pagamento: Pagamento):
+    """Envolve alterações de um pagamento já gravado (ver atualizando_pedido)"""
+    chave, valor = _chave_pagamento(pagamento), pagamento.valor or 0.0
+    yield
+    nova_chave, novo_valor = _chave_pagamento(pagamento), pagamento.valor or 0.0
+    if (nova_chave, novo_valor) != (chave, valor):
+        _somar(db, ResumoDiarioPagamento, [
+            {**chave, "quantidade": -1, "valor_total": -valor},
+            {**nova_chave, "quantidade": 1, "valor_total": novo_valor},
+        ])
+
+
+# Consultas dos dashboards
+
+def totais_pedidos(db: Session, inicio: Optional[date] = None, fim: Optional[date] = None) -> list:
+    """(status, tipo_entrega, forma_pagamento, quantidade, valor) somados no período"""
+    r = ResumoDiarioPedido
+    return db.query(
+        _valor(r.status), _valor(r.tipo_entrega), _valor(r.forma_pagamento),
+        func.sum(r.quantidade), func.sum(r.valor_total)
+    ).filter(*_periodo(r, inicio, fim)).group_by(
+        r.status, r.tipo_entrega, r.forma_pagamento
+    ).having(func.sum(r.quantidade) != 0).all()
+
+
+def totais_pagamentos(db: Session, inicio: Optional[date] = None, fim: Optional[date] = None,
+                      por_dia: bool = False) -> list:
+    """
+    (status, forma_pagamento, quantidade, valor) somados no período; com
+    `por_dia`, (dia, status, quantidade, valor) ordenados por dia.
+    """
+    r = ResumoDiarioPagamento
+    if por_dia:
+        colunas = (r.dia, r.status)
+        selecionadas = (r.dia, _valor(r.status))
+    else:
+        colunas = (r.status, r.forma_pagamento)
+        selecionadas = (_valor(r.status), _valor(r.forma_pagamento))
+    return db.query(
+        *selecionadas, func.sum(r.quantidade), func.sum(r.valor_total)
+    ).filter(*_periodo(r, inicio, fim)).group_by(*colunas).having(
+        func.sum(r.quantidade) != 0
+    ).order_by(*colunas).all()
+
+
+def contar(db: Session, modelo, status: Optional[str] = None) -> int:
+    """Total de registros (de todos os dias) no resumo `modelo`, opcionalmente por status"""
+    query = db.query(func.coalesce(func.sum(modelo.quantidade), 0))
+    if status:
+        query = query.filter(modelo.status == status)
+    return query.scalar()
+
+
+def produtos_vendidos(db: Session, inicio: Optional[date] = None, fim: Optional[date] = None,
+                      limit: int = 20) -> list:
+    """Produtos e kits mais vendidos no período (pedidos não cancelados)"""
+    r = ResumoDiarioProduto
+    vendidos = db.query(
+        r.tipo_item, r.item_id,
+        func.sum(r.quantidade).label("quantidade"), func.sum(r.valor_total).label("valor")
+    ).filter(*_periodo(r, inicio, fim)).group_by(r.tipo_item, r.item_id).having(
+        func.sum(r.quantidade) != 0
+    ).subquery()
+    return db.query(
+        vendidos.c.tipo_item, vendidos.c.item_id,
+        func.coalesce(Produto.nome, Kit.nome).label("nome"),
+        vendidos.c.quantidade, vendidos.c.valor,
+    ).outerjoin(Produto, and_(vendidos.c.tipo_item == "produto", Produto.id == vendidos.c.item_id)).outerjoin(
+        Kit, and_(vendidos.c.tipo_item == "kit", Kit.id == vendidos.c.item_id)
+    ).order_by(vendidos.c.quantidade.desc(), vendidos.c.valor.desc()).limit(limit).all()
+
+
+# Reconstrução (backfill)
+
+def reconstruir(db: Session, inicio: Optional[date] = None, fim: Optional[date] = None,
+                lote: int = 5000) -> dict:
+    """
+    Recalcula os resumos dos dias inicio..fim (sem período: todos) a partir de
+    pedidos, itens e pagamentos. Os registros são lidos em lotes, então a
+    memória depende só do número de linhas de resumo. Não faz commit.
+    Retorna o número de linhas gravadas por tabela.
+
+    Só a reconstrução completa registra FUSO_HORARIO_LOJA como o fuso dos
+    resumos; com o fuso alterado, a parcial é recusada (os outros dias
+    ficariam no fuso antigo).
+    """
+    completa = inicio is None and fim is None
+    if not completa:
+        verificar_fuso(db)
+
+    def acumular(totais: dict, chave: tuple, quantidade: int, valor: float):
+        q, v = totais.get(chave, (0, 0.0))
+        totais[chave] = (q + quantidade, v + (valor or 0.0))
+
+    def ler(consulta):
+        return db.execute(consulta.execution_options(yield_per=lote))
+
+    pedidos, produtos, pagamentos = {}, {}, {}
+    for data, status, tipo, forma, total in ler(select(
+        Pedido.data_pedido, Pedido.status, Pedido.tipo_entrega, Pedido.forma_pagamento, Pedido.total
+    ).where(*_intervalo(Pedido.data_pedido, inicio, fim))):
+        acumular(pedidos, (dia_resumo(data), status or "", tipo or "", forma or ""), 1, total)
+
+    for data, produto_id, kit_id, quantidade, subtotal in ler(select(
+        Pedido.data_pedido, ItemPedido.produto_id, ItemPedido.kit_id, ItemPedido.quantidade, ItemPedido.subtotal
+    ).join(Pedido, ItemPedido.pedido_id == Pedido.id).where(
+        *_intervalo(Pedido.data_pedido, inicio, fim),
+        Pedido.status.is_distinct_from(StatusPedido.CANCELADO.value),
+    )):
+        item = ("produto", produto_id) if produto_id else ("kit", kit_id)
+        acumular(produtos, (dia_resumo(data), *item), quantidade or 0, subtotal)
+
+    for data, status, forma, valor in ler(select(
+        Pagamento.data_criacao, Pagamento.status, Pagamento.forma_pagamento, Pagamento.valor
+    ).where(*_intervalo(Pagamento.data_criacao, inicio, fim))):
+        acumular(pagamentos, (dia_resumo(data), status or "", forma or ""), 1, valor)
+
+    gravadas = {}
+    for modelo, totais, colunas in (
+        (ResumoDiarioPedido, pedidos, ("dia", "status", "tipo_entrega", "forma_pagamento")),
+        (ResumoDiarioProduto, produtos, ("dia", "tipo_item", "item_id")),
+        (ResumoDiarioPagamento, pagamentos, ("dia", "status", "forma_pagamento")),
+    ):
+        db.query(modelo).filter(*_periodo(modelo, inicio, fim)).delete(synchronize_session=False)
+        linhas = [
+            {**dict(zip(colunas, chave)), "quantidade": quantidade, "valor_total": valor}
+            for chave, (quantidade, valor) in totais.items()
+        ]
+        if linhas:
+            db.execute(insert(modelo.__table__), linhas)
+        gravadas[modelo.__tablename__] = len(linhas)
+    if completa:
+        _gravar_fuso(db)
+    return gravadas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconstrói os resumos diários dos dashboards")
+    parser.add_argument("--inicio", type=date.fromisoformat, help="Primeiro dia (YYYY-MM-DD)")
+    parser.add_argument("--fim", type=date.fromisoformat, help="Último dia (YYYY-MM-DD)")
+    parser.add_argument("--lote", type=int, default=5000, help="Registros lidos por lote")
+    args = parser.parse_args()
+
+    from app.data.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        comeco = time.perf_counter()
+        gravadas = reconstruir(db, args.inicio, args.fim, args.lote)
+        db.commit()
+    except RuntimeError as e:
+        parser.error(f"{e} (sem --inicio/--fim)")
+    finally:
+        db.close()
+    for tabela, linhas in gravadas.items():
+        print(f"{tabela}: {linhas} linhas")
+    print(f"Resumos reconstruídos em {time.perf_counter() - comeco:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
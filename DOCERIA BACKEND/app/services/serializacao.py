@@ -0,0 +1,88 @@
+"""
+Serialização JSON das respostas
+
+- RespostaJSON: classe de resposta padrão da aplicação, com orjson (opcional;
+  sem ele, o json da stdlib). Vale para as rotas sem response_model (dicts de
+  estatísticas, totais); as rotas com response_model continuam no caminho
+  do FastAPI que valida e gera os bytes no pydantic-core.
+- adaptador_lista(schema): TypeAdapter de list[schema] criado uma vez por
+  schema e reutilizado, em vez de validar item a item.
+- SerializadorResumo: as listagens resumidas já vêm do banco com as colunas
+  do schema (ver projecao.py); as linhas viram bytes diretamente, sem validar
+  cada uma de novo pelo response_model. Os campos numéricos passam pela mesma
+  coerção do pydantic (ex.: total int -> float), então o JSON é o mesmo.
+"""
+import json
+import typing
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Optional
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # dependência opcional
+    orjson = None
+
+COERCOES = (bool, int, float)
+
+
+def dumps(conteudo: Any) -> bytes:
+    """JSON compacto em UTF-8 (mesma saída do JSONResponse do Starlette)"""
+    if orjson is not None:
+        return orjson.dumps(conteudo, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(conteudo, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+class RespostaJSON(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+@lru_cache(maxsize=None)
+def adaptador_lista(schema) -> TypeAdapter:
+    return TypeAdapter(list[schema])
+
+
+def _coercao(anotacao) -> Optional[type]:
+    """bool/int/float do campo (também dentro de Optional[...]); demais tipos seguem como vêm"""
+    tipos = [t for t in typing.get_args(anotacao) if t is not type(None)] or [anotacao]
+    if len(tipos) == 1 and tipos[0] in COERCOES:
+        return tipos[0]
+    return None
+
+
+class SerializadorResumo:
+    """Linhas (Row ou objetos com os atributos do schema) -> bytes do JSON de list[schema]"""
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.campos = list(schema.model_fields)
+        self._valores = attrgetter(*self.campos)
+        self._coercoes = [
+            (indice, tipo) for indice, campo in enumerate(schema.model_fields.values())
+            if (tipo := _coercao(campo.annotation)) is not None
+        ]
+
+    def _dicionario(self, linha) -> dict:
+        valores = list(self._valores(linha))
+        for indice, tipo in self._coercoes:
+            valor = valores[indice]
+            if valor is not None and type(valor) is not tipo:
+                valores[indice] = tipo(valor)
+        return dict(zip(self.campos, valores))
+
+    def bytes(self, linhas) -> bytes:
+        if orjson is None:
+            adaptador = adaptador_lista(self.schema)
+            return adaptador.dump_json(adaptador.validate_python(linhas, from_attributes=True))
+        return orjson.dumps([self._dicionario(linha) for linha in linhas])
+
+    def resposta(self, linhas, response: Optional[Response] = None) -> Response:
+        """Response com o JSON das linhas; `response` traz headers já definidos (ex.: X-Next-Cursor)"""
+        resposta = Response(self.bytes(linhas), media_type="application/json")
+        if response is not None:
+            resposta.headers.raw.extend(response.headers.raw)
+        return resposta
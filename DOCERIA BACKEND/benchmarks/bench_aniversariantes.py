@@ -0,0 +1,109 @@
+"""
+Benchmark: aniversariantes com data_nascimento em texto x índice (mês, dia)
+
+Cria clientes sintéticos com data_nascimento nos dois formatos aceitos
+("DD/MM/YYYY" e "YYYY-MM-DD") e compara o cálculo anterior (todos os clientes
+ativos carregados e o texto separado no Python) com as consultas no índice
+ix_clientes_aniversario: mês, semana e dia.
+
+Execute na pasta DOCERIA BACKEND:
+    python -m benchmarks.bench_aniversariantes
+    python -m benchmarks.bench_aniversariantes --clientes 300000
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from benchmarks.utils import preparar_ambiente
+
+
+def _popular(total: int, lote: int = 20000):
+    from sqlalchemy import insert
+    from app.data.database import SessionLocal
+    from app.migrations import aplicar_migracoes
+    from app.models import Cliente
+    from app.models.cliente_model import interpretar_nascimento
+
+    aplicar_migracoes(informar=lambda mensagem: None)
+    sorteio = random.Random(42)
+    db = SessionLocal()
+    try:
+        for inicio in range(0, total, lote):
+            linhas = []
+            for i in range(inicio, min(inicio + lote, total)):
+                nascimento = date(1950, 1, 1) + timedelta(days=sorteio.randrange(365 * 55))
+                texto = nascimento.strftime("%d/%m/%Y" if i % 2 else "%Y-%m-%d")
+                data, mes, dia = interpretar_nascimento(texto)
+                linhas.append({
+                    "nome": f"Cliente {i}", "email": f"cliente{i}@bench.com", "ativo": i % 10 != 0,
+                    "data_nascimento": texto, "nascimento": data, "mes_aniversario": mes, "dia_aniversario": dia,
+                })
+            db.execute(insert(Cliente), linhas)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _anterior(db, mes: int) -> list:
+    """Cálculo anterior: todos os clientes ativos carregados, mês separado do texto"""
+    from app.models import Cliente
+
+    aniversariantes = []
+    for cliente in db.query(Cliente).filter(Cliente.ativo == True).all():
+        if cliente.data_nascimento:
+            separador = "/" if "/" in cliente.data_nascimento else "-"
+            partes = cliente.data_nascimento.split(separador)
+            if len(partes) >= 2 and int(partes[1]) == mes:
+                aniversariantes.append(cliente)
+    return aniversariantes
+
+
+def _medir(funcao, repeticoes: int) -> tuple:
+    from app.data.database import SessionLocal
+
+    def executar():
+        db = SessionLocal()
+        try:
+            return funcao(db)
+        finally:
+            db.close()
+
+    resultado = executar()
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        executar()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1000, len(resultado)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos aniversariantes")
+    parser.add_argument("--clientes", type=int, default=100000)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    preparar_ambiente(LOG_LEVEL="ERROR")
+    _popular(args.clientes)
+
+    from app.services.cliente_service import ClienteService
+
+    servico = ClienteService()
+    mes = date.today().month
+    consultas = [
+        ("mês (anterior)", lambda db: _anterior(db, mes)),
+        ("mês (índice)", lambda db: servico.aniversariantes_do_mes(db, mes)),
+        ("semana (índice)", servico.aniversariantes_da_semana),
+        ("hoje (índice)", servico.aniversariantes_de_hoje),
+    ]
+    print(f"{args.clientes} clientes")
+    print(f"{'consulta':<18} {'mediana (ms)':>13} {'clientes':>9}")
+    for nome, funcao in consultas:
+        ms, quantidade = _medir(funcao, args.repeticoes)
+        print(f"{nome:<18} {ms:>13.2f} {quantidade:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark: modo síncrono (threadpool) x modo assíncrono (DB_ASYNC) em /pedidos e /pagamentos
+
+Execute na pasta DOCERIA BACKEND:
+    python -m benchmarks.bench_async
+    python -m benchmarks.bench_async --requisicoes 2000 --concorrencia 100
+
+Requer httpx e aiosqlite instalados.
+"""
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+
+from benchmarks.utils import preparar_ambiente, popular_banco, cabecalho_autenticacao, percentil
+
+ROTAS = ["/pedidos/?limit=50", "/pagamentos/?limit=50"]
+
+
+async def _medir(app, rota: str, requisicoes: int, concorrencia: int) -> dict:
+    import httpx
+
+    headers = cabecalho_autenticacao()
+    latencias = []
+    semaforo = asyncio.Semaphore(concorrencia)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def uma_requisicao():
+            async with semaforo:
+                inicio = time.perf_counter()
+                resposta = await client.get(rota, headers=headers)
+                latencias.append(time.perf_counter() - inicio)
+                assert resposta.status_code == 200, resposta.text
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*(uma_requisicao() for _ in range(requisicoes)))
+        duracao = time.perf_counter() - inicio
+
+    return {
+        "req_s": round(requisicoes / duracao, 1),
+        "p50_ms": round(percentil(latencias, 50) * 1000, 2),
+        "p95_ms": round(percentil(latencias, 95) * 1000, 2),
+    }
+
+
+def executar_modo(modo: str, requisicoes: int, concorrencia: int) -> dict:
+    """Roda o benchmark de um modo (chamado em um subprocesso próprio)"""
+    preparar_ambiente(DB_ASYNC="true" if modo == "async" else "false", LOG_LEVEL="WARNING")
+    popular_banco(total_pedidos=2000)
+    from app.main import app
+
+    async def todas_as_rotas():
+        # Um único loop de eventos: o pool da engine assíncrona fica preso ao loop que o criou
+        return {rota: await _medir(app, rota, requisicoes, concorrencia) for rota in ROTAS}
+
+    return asyncio.run(todas_as_rotas())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modo", choices=["sync", "async"], help="Executa apenas um modo (uso interno)")
+    parser.add_argument("--requisicoes", type=int, default=1000)
+    parser.add_argument("--concorrencia", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.modo:
+        print(json.dumps(executar_modo(args.modo, args.requisicoes, args.concorrencia)))
+        return
+
+    # Cada modo roda em um processo separado, pois o modo é lido na importação das configurações
+    resultados = {}
+    for modo in ("sync", "async"):
+        saida = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_async", "--modo", modo,
+             "--requisicoes", str(args.requisicoes), "--concorrencia", str(args.concorrencia)],
+            capture_output=True, text=True, check=True
+        )
+        resultados[modo] = json.loads(saida.stdout.strip().splitlines()[-1])
+
+    print(f"{'rota':<24}{'modo':<8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for rota in ROTAS:
+        for modo in ("sync", "async"):
+            r = resultados[modo][rota]
+            print(f"{rota:<24}{modo:<8}{r['req_s']:>10}{r['p50_ms']:>10}{r['p95_ms']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark: busca de clientes com ILIKE '%termo%' x índice de trigramas
+
+Cria clientes sintéticos (nomes com e sem acento, email, telefone e CPF), monta
+o índice `clientes_busca` e compara, para termos típicos da caixa de busca, a
+consulta anterior (quatro ILIKE com OR, varredura completa de clientes) com
+ClienteService.buscar (FTS5 trigram, normalizado e limitado).
+
+Execute na pasta DOCERIA BACKEND:
+    python -m benchmarks.bench_busca_clientes
+    python -m benchmarks.bench_busca_clientes --clientes 100000 --repeticoes 5
+"""
+import argparse
+import random
+import statistics
+import time
+
+from benchmarks.utils import preparar_ambiente
+
+NOMES = ["José", "João", "Maria", "Ana", "Antônio", "Luíza", "Conceição", "Inês", "Márcio", "Fábio",
+         "Paulo", "Carla", "Sérgio", "Débora", "Lúcia", "Rafael", "Bruna", "Tiago", "Letícia", "André"]
+SOBRENOMES = ["Silva", "Souza", "Gonçalves", "Araújo", "Conceição", "Simões", "Magalhães", "Pereira",
+              "Lima", "Brandão", "Assunção", "Oliveira", "Ribeiro", "Guimarães", "Nogueira", "Damião"]
+
+TERMOS = [
+    "silva",              # muito comum
+    "conceicao",          # sem acento, gravado com acento
+    "Brandão Damião",     # combinação rara
+    "cliente12345",       # parte do email
+    "98712-3",            # telefone formatado
+    "001.234-5",          # CPF formatado
+    "xyzxyz",             # nenhum resultado
+]
+
+
+def _popular(total: int, lote: int = 20000):
+    from sqlalchemy import insert
+    from app.data.database import SessionLocal
+    from app.migrations import aplicar_migracoes
+    from app.models import Cliente
+    from app.services.busca_clientes import reconstruir
+
+    aplicar_migracoes(informar=lambda mensagem: None)
+    sorteio = random.Random(42)
+    db = SessionLocal()
+    try:
+        for inicio in range(0, total, lote):
+            db.execute(insert(Cliente), [
+                {
+                    "nome": f"{sorteio.choice(NOMES)} {sorteio.choice(SOBRENOMES)} {sorteio.choice(SOBRENOMES)}",
+                    "email": f"cliente{i}@bench.com",
+                    "telefone": f"(11) 9{sorteio.randrange(10 ** 4):04d}-{sorteio.randrange(10 ** 4):04d}",
+                    "cpf": f"{i:011d}"[:3] + "." + f"{i:011d}"[3:6] + "." + f"{i:011d}"[6:9] + "-" + f"{i:011d}"[9:],
+                    "ativo": True,
+                }
+                for i in range(inicio, min(inicio + lote, total))
+            ])
+        comeco = time.perf_counter()
+        indexados = reconstruir(db)
+        db.commit()
+        print(f"{total} clientes; índice montado em {time.perf_counter() - comeco:.1f}s ({indexados} documentos)")
+    finally:
+        db.close()
+
+
+def _anterior(db, termo: str):
+    """Consulta anterior: quatro ILIKE '%termo%' com OR, sem limite"""
+    from app.models import Cliente
+    from app.services.cliente_service import COLUNAS_RESUMO
+
+    return db.query(*COLUNAS_RESUMO).filter(
+        (Cliente.nome.ilike(f"%{termo}%")) |
+        (Cliente.email.ilike(f"%{termo}%")) |
+        (Cliente.telefone.ilike(f"%{termo}%")) |
+        (Cliente.cpf.ilike(f"%{termo}%"))
+    ).all()
+
+
+def _indice(db, termo: str, limit: int):
+    from app.services.cliente_service import ClienteService
+    return ClienteService().buscar(db, termo, limit)
+
+
+def _medir(funcao, repeticoes: int) -> tuple:
+    resultado = funcao()
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1000, len(resultado)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da busca de clientes")
+    parser.add_argument("--clientes", type=int, default=500000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    preparar_ambiente(LOG_LEVEL="ERROR")
+    _popular(args.clientes)
+
+    from app.data.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        print(f"{'termo':<18} {'anterior (ms)':>14} {'encontrados':>12} {'índice (ms)':>12} {'retornados':>11}")
+        for termo in TERMOS:
+            ms_anterior, n_anterior = _medir(lambda: _anterior(db, termo), args.repeticoes)
+            ms_indice, n_indice = _medir(lambda: _indice(db, termo, args.limit), args.repeticoes)
+            print(f"{termo:<18} {ms_anterior:>14.1f} {n_anterior:>12} {ms_indice:>12.1f} {n_indice:>11}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
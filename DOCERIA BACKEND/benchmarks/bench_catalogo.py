@@ -0,0 +1,81 @@
+"""
+Benchmark: listagens públicas do catálogo com e sem o cache em processo
+
+Mede a latência mediana/p95 e as consultas SQL (header X-DB-Queries) de
+GET /produtos, /kits, /categorias e /eventos com CACHE_CATALOGO_ATIVO ligado
+(acertos: bytes prontos, sem sessão do banco) e desligado, e das revalidações
+com If-None-Match (304 sem corpo).
+
+Execute na pasta DOCERIA BACKEND:
+    python -m benchmarks.bench_catalogo
+    python -m benchmarks.bench_catalogo --produtos 2000 --requisicoes 300
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks.utils import preparar_ambiente, popular_banco, percentil
+
+ROTAS = ["/produtos/", "/kits/", "/categorias/", "/eventos/"]
+
+
+def _ampliar_catalogo(produtos: int):
+    """popular_banco cria 50 produtos; completa até `produtos`"""
+    from sqlalchemy import insert
+    from app.data.database import SessionLocal
+    from app.models import Produto, Evento
+
+    db = SessionLocal()
+    try:
+        db.execute(insert(Produto), [
+            {"nome": f"Produto extra {i}", "descricao": "Bolo de pote com recheio de brigadeiro " * 3,
+             "preco": 10.0 + i % 40, "categoria_id": 1}
+            for i in range(max(produtos - 50, 0))
+        ])
+        db.execute(insert(Evento), [
+            {"titulo": f"Evento {i}", "descricao": "Encomendas especiais", "data": "2025-12-24"}
+            for i in range(20)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do cache do catálogo")
+    parser.add_argument("--produtos", type=int, default=500)
+    parser.add_argument("--requisicoes", type=int, default=200)
+    args = parser.parse_args()
+
+    preparar_ambiente(SQL_MONITORAMENTO_ATIVO="true", LOG_LEVEL="ERROR")
+    popular_banco(total_pedidos=10, itens_por_pedido=1, total_clientes=10)
+    _ampliar_catalogo(args.produtos)
+
+    from fastapi.testclient import TestClient
+    from app.config import settings
+    from app.main import app
+
+    print(f"{'rota':<14} {'cache':<9} {'revalidação':<12} {'mediana (ms)':>13} {'p95 (ms)':>10} "
+          f"{'consultas':>10} {'bytes':>8}")
+    with TestClient(app) as client:
+        for rota in ROTAS:
+            for ativo, revalidar in ((False, False), (True, False), (False, True), (True, True)):
+                settings.CACHE_CATALOGO_ATIVO = ativo
+                aquecimento = client.get(rota)  # também carrega o cache
+                headers = {"If-None-Match": aquecimento.headers["ETag"]} if revalidar else {}
+                esperado = b"" if revalidar else aquecimento.content
+                latencias, consultas = [], set()
+                for _ in range(args.requisicoes):
+                    inicio = time.perf_counter()
+                    resposta = client.get(rota, headers=headers)
+                    latencias.append((time.perf_counter() - inicio) * 1000)
+                    assert resposta.status_code == (304 if revalidar else 200)
+                    assert resposta.content == esperado
+                    consultas.add(resposta.headers.get("X-DB-Queries"))
+                print(f"{rota:<14} {'ligado' if ativo else 'desligado':<9} {'304' if revalidar else '-':<12} "
+                      f"{statistics.median(latencias):>13.2f} {percentil(latencias, 95):>10.2f} "
+                      f"{'/'.join(sorted(consultas)):>10} {len(esperado):>8}")
+
+
+if __name__ == "__main__":
+    main()
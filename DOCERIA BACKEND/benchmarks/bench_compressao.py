@@ -0,0 +1,64 @@
+"""
+Benchmark: compressão das listagens grandes por codificação e nível
+
+Busca cada listagem sem compressão (Accept-Encoding: identity) e mede, para
+gzip em alguns níveis e brotli (se o pacote estiver instalado), a razão
+comprimido/original e o tempo de CPU por resposta — os mesmos números que o
+CompressaoMiddleware publica em X-Compression-Ratio e X-Compression-CPU-Ms.
+
+Execute na pasta DOCERIA BACKEND:
+    python -m benchmarks.bench_compressao
+    python -m benchmarks.bench_compressao --pedidos 2000 --repeticoes 50
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks.utils import preparar_ambiente, popular_banco, cabecalho_autenticacao
+
+ROTAS = ["/pedidos/?limit=500", "/clientes/?limit=500", "/pagamentos/", "/produtos/"]
+
+
+def _medir(corpo: bytes, comprimir, repeticoes: int) -> tuple[float, float]:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.thread_time()
+        comprimido = comprimir(corpo)
+        tempos.append(time.thread_time() - inicio)
+    return len(comprimido) / len(corpo), statistics.median(tempos) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da compressão das respostas")
+    parser.add_argument("--pedidos", type=int, default=1000)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+
+    preparar_ambiente(LOG_LEVEL="ERROR")
+    popular_banco(total_pedidos=args.pedidos, itens_por_pedido=2, total_clientes=args.pedidos)
+
+    import gzip
+    from fastapi.testclient import TestClient
+    from app.data import compressao
+    from app.main import app
+
+    variantes = [(f"gzip-{nivel}", lambda corpo, n=nivel: gzip.compress(corpo, compresslevel=n, mtime=0))
+                 for nivel in (1, 6, 9)]
+    if compressao.brotli is not None:
+        variantes += [(f"br-{nivel}", lambda corpo, n=nivel: compressao.brotli.compress(corpo, quality=n))
+                      for nivel in (4, 6, 11)]
+    else:
+        print("brotli não instalado: só gzip")
+
+    headers = {**cabecalho_autenticacao(), "Accept-Encoding": "identity"}
+    print(f"{'rota':<22} {'bytes':>8} {'codificação':<12} {'razão':>7} {'CPU (ms)':>9}")
+    with TestClient(app) as client:
+        for rota in ROTAS:
+            corpo = client.get(rota, headers=headers).content
+            for nome, comprimir in variantes:
+                razao, cpu_ms = _medir(corpo, comprimir, args.repeticoes)
+                print(f"{rota:<22} {len(corpo):>8} {nome:<12} {razao:>7.3f} {cpu_ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
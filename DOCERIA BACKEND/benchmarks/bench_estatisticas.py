@@ -0,0 +1,135 @@
+"""
+Benchmark: estatísticas agregadas no banco x carga de todas as linhas no Python
+
+Compara, para períodos crescentes, o cálculo antigo (carrega todos os pedidos ou
+pagamentos do período como entidades e conta no Python) com
+PedidoService.estatisticas e PagamentoService.estatisticas (com por_dia e
+percentis), que leem os resumos diários e agrupam no banco. Confere que os
+totais batem e mede latência e pico de memória (tracemalloc).
+
+Execute na pasta DOCERIA BACKEND:
+    python -m benchmarks.bench_estatisticas
+    python -m benchmarks.bench_estatisticas --pedidos 100000 --dias 7 30 90 365
+"""
+import argparse
+import statistics
+import time
+import tracemalloc
+from datetime import timedelta
+
+from benchmarks.utils import preparar_ambiente, popular_banco
+
+
+def _pedidos_orm(db, data_inicio, data_fim) -> dict:
+    """Cálculo anterior: todas as entidades do período carregadas na memória"""
+    from app.models import Pedido
+    from app.services.periodo import converter_data, intervalo
+
+    pedidos = db.query(Pedido).filter(
+        *intervalo(Pedido.data_pedido, converter_data(data_inicio), converter_data(data_fim))
+    ).all()
+    entregues = len([p for p in pedidos if p.status == "entregue"])
+    cancelados = len([p for p in pedidos if p.status == "cancelado"])
+    valor_total = sum(p.total for p in pedidos if p.status != "cancelado")
+    return {
+        "total_pedidos": len(pedidos),
+        "pedidos_entregues": entregues,
+        "pedidos_cancelados": cancelados,
+        "pedidos_pendentes": len(pedidos) - entregues - cancelados,
+        "valor_total": round(valor_total, 2),
+        "ticket_medio": round(valor_total / entregues if entregues else 0, 2),
+    }
+
+
+def _pedidos_agregado(db, data_inicio, data_fim) -> dict:
+    from app.services.pedido_service import PedidoService
+    return PedidoService().estatisticas(db, data_inicio, data_fim)
+
+
+def _pagamentos_orm(db, data_inicio, data_fim) -> dict:
+    """Cálculo anterior: todos os pagamentos do período carregados na memória"""
+    from app.models import Pagamento
+    from app.services.periodo import converter_data, intervalo
+
+    pagamentos = db.query(Pagamento).filter(
+        *intervalo(Pagamento.data_criacao, converter_data(data_inicio), converter_data(data_fim))
+    ).all()
+    aprovados = [p for p in pagamentos if p.status == "aprovado"]
+    estornados = [p for p in pagamentos if p.status == "estornado"]
+    valor_aprovado = sum(p.valor for p in aprovados)
+    valor_estornado = sum(p.valor for p in estornados)
+    return {
+        "total_pagamentos": len(pagamentos),
+        "aprovados": len(aprovados),
+        "pendentes": len([p for p in pagamentos if p.status == "pendente"]),
+        "estornados": len(estornados),
+        "valor_total_aprovado": round(valor_aprovado, 2),
+        "valor_liquido": round(valor_aprovado - valor_estornado, 2),
+    }
+
+
+def _pagamentos_agregado(db, data_inicio, data_fim) -> dict:
+    from app.services.pagamento_service import PagamentoService
+    return PagamentoService().estatisticas(db, data_inicio, data_fim, por_dia=True, percentis=True)
+
+
+def _cenarios():
+    """(nome, cálculo anterior, cálculo agregado)"""
+    return [
+        ("pedidos", _pedidos_orm, _pedidos_agregado),
+        ("pagamentos", _pagamentos_orm, _pagamentos_agregado),
+    ]
+
+
+def _executar(funcao, data_inicio, data_fim) -> dict:
+    from app.data.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return funcao(db, data_inicio, data_fim)
+    finally:
+        db.close()
+
+
+def _medir(funcao, data_inicio, data_fim, repeticoes: int) -> dict:
+    _executar(funcao, data_inicio, data_fim)  # aquece cache do SQLite
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        _executar(funcao, data_inicio, data_fim)
+        tempos.append(time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    _executar(funcao, data_inicio, data_fim)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"mediana_ms": statistics.median(tempos) * 1000, "pico_kb": pico / 1024}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark das estatísticas agregadas")
+    parser.add_argument("--pedidos", type=int, default=30000, help="Pedidos distribuídos em um ano")
+    parser.add_argument("--dias", type=int, nargs="+", default=[7, 30, 90, 365])
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    preparar_ambiente()
+    from app.services.periodo import hoje as hoje_loja
+    popular_banco(total_pedidos=args.pedidos, itens_por_pedido=1, total_clientes=200)
+
+    hoje = hoje_loja()
+    print(f"{'consulta':<10} {'dias':>5} {'modo':<10} {'mediana (ms)':>13} {'pico (KB)':>11}")
+    for nome, anterior, agregado in _cenarios():
+        for dias in args.dias:
+            data_inicio, data_fim = str(hoje - timedelta(days=dias)), str(hoje)
+            esperado = _executar(anterior, data_inicio, data_fim)
+            obtido = _executar(agregado, data_inicio, data_fim)
+            assert all(obtido[chave] == valor for chave, valor in esperado.items()), \
+                f"{nome} ({dias} dias): {esperado} != {obtido}"
+            for modo, funcao in (("anterior", anterior), ("agregado", agregado)):
+                r = _medir(funcao, data_inicio, data_fim, args.repeticoes)
+                print(f"{nome:<10} {dias:>5} {modo:<10} {r['mediana_ms']:>13.2f} {r['pico_kb']:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
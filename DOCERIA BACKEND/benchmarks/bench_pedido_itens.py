@@ -0,0 +1,60 @@
+"""
+Benchmark: latência de POST /pedidos conforme o número de itens cresce
+
+Mede a latência mediana/p95 e a quantidade de consultas SQL (header X-DB-Queries)
+por requisição para pedidos com 1 a 80 itens, misturando produtos e kits.
+
+Execute na pasta DOCERIA BACKEND:
+    python -m benchmarks.bench_pedido_itens
+    python -m benchmarks.bench_pedido_itens --itens 1 10 40 100 --requisicoes 50
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks.utils import preparar_ambiente, popular_banco, cabecalho_autenticacao, percentil
+
+
+def _corpo_pedido(quantidade_itens: int) -> dict:
+    itens = []
+    for i in range(quantidade_itens):
+        if i % 5 == 4:
+            itens.append({"kit_id": 1 + i % 10, "quantidade": 1})
+        else:
+            itens.append({"produto_id": 1 + i % 50, "quantidade": 2})
+    return {"cliente_id": 1, "tipo_entrega": "retirada", "itens": itens}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de POST /pedidos por número de itens")
+    parser.add_argument("--itens", type=int, nargs="+", default=[1, 5, 10, 20, 40, 80])
+    parser.add_argument("--requisicoes", type=int, default=30)
+    args = parser.parse_args()
+
+    preparar_ambiente(SQL_MONITORAMENTO_ATIVO="true", LOG_LEVEL="ERROR")
+    popular_banco(total_pedidos=1000, itens_por_pedido=3, total_clientes=50)
+
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    headers = cabecalho_autenticacao()
+    print(f"{'itens':>6} {'mediana (ms)':>13} {'p95 (ms)':>10} {'consultas':>10}")
+    with TestClient(app) as client:
+        for quantidade in args.itens:
+            corpo = _corpo_pedido(quantidade)
+            client.post("/pedidos/", json=corpo, headers=headers)  # aquecimento
+            latencias = []
+            consultas = set()
+            for _ in range(args.requisicoes):
+                inicio = time.perf_counter()
+                resposta = client.post("/pedidos/", json=corpo, headers=headers)
+                latencias.append((time.perf_counter() - inicio) * 1000)
+                assert resposta.status_code == 200, resposta.text
+                assert len(resposta.json()["itens"]) == quantidade
+                consultas.add(resposta.headers.get("X-DB-Queries"))
+            print(f"{quantidade:>6} {statistics.median(latencias):>13.2f} "
+                  f"{percentil(latencias, 95):>10.2f} {'/'.join(sorted(consultas)):>10}")
+
+
+if __name__ == "__main__":
+    main()
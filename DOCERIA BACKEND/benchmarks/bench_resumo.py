@@ -0,0 +1,116 @@
+"""
+Benchmark: listagens com ORM completo x colunas projetadas (schemas *Resumo)
+
+Compara, para limit=500, a carga de entidades completas (como era antes) com as
+consultas projetadas dos serviços, incluindo a serialização para JSON. Mede
+latência mediana e pico de memória (tracemalloc).
+
+Execute na pasta DOCERIA BACKEND:
+    python -m benchmarks.bench_resumo
+    python -m benchmarks.bench_resumo --pedidos 20000 --limit 500 --repeticoes 30
+"""
+import argparse
+import base64
+import os
+import statistics
+import time
+import tracemalloc
+
+from benchmarks.utils import preparar_ambiente, popular_banco
+
+
+def _cenarios(limit: int):
+    """(nome, schema, consulta ORM completa, consulta projetada)"""
+    from app.models import Pedido, Pagamento, Cliente
+    from app.schemas import PedidoResumo, PagamentoResumo, ClienteResumo
+    from app.services.pedido_service import PedidoService
+    from app.services.pagamento_service import PagamentoService
+    from app.services.cliente_service import ClienteService
+
+    def pagamentos_orm(db):
+        pagamentos = db.query(Pagamento).join(Pedido).order_by(
+            Pagamento.data_criacao.desc(), Pagamento.id.desc()
+        ).limit(limit).all()
+        for pagamento in pagamentos:
+            pagamento.numero_pedido = pagamento.pedido.numero_pedido
+        return pagamentos
+
+    return [
+        ("PedidoResumo", PedidoResumo,
+         lambda db: db.query(Pedido).order_by(Pedido.data_pedido.desc(), Pedido.id.desc()).limit(limit).all(),
+         lambda db: PedidoService().listar(db, limit=limit)),
+        ("PagamentoResumo", PagamentoResumo,
+         pagamentos_orm,
+         lambda db: PagamentoService().listar(db, limit=limit)),
+        ("ClienteResumo", ClienteResumo,
+         lambda db: db.query(Cliente).filter(Cliente.ativo == True).order_by(Cliente.id).limit(limit).all(),
+         lambda db: ClienteService().listar(db, limit=limit)),
+    ]
+
+
+def _executar(consulta, schema) -> bytes:
+    from pydantic import TypeAdapter
+    from app.data.database import SessionLocal
+
+    adaptador = TypeAdapter(list[schema])
+    db = SessionLocal()
+    try:
+        linhas = consulta(db)
+        return adaptador.dump_json(adaptador.validate_python(linhas, from_attributes=True))
+    finally:
+        db.close()
+
+
+def _medir(consulta, schema, repeticoes: int) -> dict:
+    _executar(consulta, schema)  # aquece cache do SQLite e do pydantic
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        _executar(consulta, schema)
+        tempos.append(time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    _executar(consulta, schema)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"mediana_ms": statistics.median(tempos) * 1000, "pico_kb": pico / 1024}
+
+
+def _simular_comprovantes(tamanho: int):
+    """Preenche comprovante com imagens base64 sintéticas, como no uso real"""
+    from sqlalchemy import text
+    from app.data.database import engine
+
+    comprovante = base64.b64encode(os.urandom(tamanho)).decode()
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE pagamentos SET comprovante = :c"), {"c": comprovante})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark das listagens projetadas")
+    parser.add_argument("--pedidos", type=int, default=5000)
+    parser.add_argument("--clientes", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    parser.add_argument("--comprovante-kb", type=int, default=16, help="Tamanho do comprovante simulado")
+    args = parser.parse_args()
+
+    preparar_ambiente()
+    popular_banco(total_pedidos=args.pedidos, itens_por_pedido=2, total_clientes=args.clientes)
+    _simular_comprovantes(args.comprovante_kb * 1024)
+
+    print(f"limit={args.limit}, {args.repeticoes} repetições\n")
+    print(f"{'schema':<16} {'modo':<10} {'mediana (ms)':>13} {'pico (KB)':>11}")
+    for nome, schema, orm, projetada in _cenarios(args.limit):
+        assert _executar(orm, schema) == _executar(projetada, schema), f"{nome}: respostas diferentes"
+        resultados = {"orm": _medir(orm, schema, args.repeticoes),
+                      "projetada": _medir(projetada, schema, args.repeticoes)}
+        for modo, r in resultados.items():
+            print(f"{nome:<16} {modo:<10} {r['mediana_ms']:>13.2f} {r['pico_kb']:>11.0f}")
+        ganho = resultados["orm"]["mediana_ms"] / resultados["projetada"]["mediana_ms"]
+        memoria = resultados["orm"]["pico_kb"] / resultados["projetada"]["pico_kb"]
+        print(f"{'':<16} {'ganho':<10} {ganho:>12.1f}x {memoria:>10.1f}x\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Microbenchmark: serialização das listagens por schema
+
+Para cada schema resumido (PedidoResumo, ClienteResumo, PagamentoResumo) e
+para CategoriaOut/PedidoOut, serializa as mesmas linhas por:
+- stdlib: validação pelo response_model + json da stdlib (antigo JSONResponse)
+- pydantic: validação + bytes no pydantic-core (TypeAdapter pré-compilado,
+  o que o FastAPI faz nas rotas com response_model)
+- direto: SerializadorResumo, linhas -> bytes com orjson, sem validação
+  (só para os schemas resumidos; confere byte a byte com o caminho pydantic)
+
+Execute na pasta DOCERIA BACKEND:
+    python -m benchmarks.bench_serializacao
+    python -m benchmarks.bench_serializacao --linhas 2000 --repeticoes 100
+"""
+import argparse
+import json
+import statistics
+import time
+
+from benchmarks.utils import preparar_ambiente, popular_banco
+
+
+def _medir(funcao, repeticoes: int) -> tuple[float, bytes]:
+    resultado = funcao()
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1000, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark da serialização por schema")
+    parser.add_argument("--linhas", type=int, default=500)
+    parser.add_argument("--repeticoes", type=int, default=50)
+    args = parser.parse_args()
+
+    preparar_ambiente(LOG_LEVEL="ERROR")
+    popular_banco(total_pedidos=args.linhas, itens_por_pedido=3, total_clientes=args.linhas)
+
+    from app.data.database import SessionLocal
+    from app.schemas import CategoriaOut, ClienteResumo, PagamentoResumo, PedidoOut, PedidoResumo
+    from app.services import serializacao
+    from app.services.categoria_service import CategoriaService
+    from app.services.cliente_service import ClienteService
+    from app.services.pagamento_service import PagamentoService
+    from app.services.pedido_service import PedidoService, CARGA_PEDIDO_OUT
+    from app.models import Pedido
+
+    if serializacao.orjson is None:
+        print("orjson não instalado: o caminho direto usa o TypeAdapter")
+
+    db = SessionLocal()
+    try:
+        casos = [
+            (PedidoResumo, PedidoService().listar(db, limit=args.linhas), True),
+            (ClienteResumo, ClienteService().listar(db, limit=args.linhas), True),
+            (PagamentoResumo, PagamentoService().listar(db, limit=args.linhas), True),
+            (CategoriaOut, CategoriaService().listar(db), False),
+            (PedidoOut, db.query(Pedido).options(*CARGA_PEDIDO_OUT).limit(100).all(), False),
+        ]
+
+        print(f"{'schema':<16} {'linhas':>7} {'stdlib (ms)':>12} {'pydantic (ms)':>14} {'direto (ms)':>12} {'bytes':>8}")
+        for schema, linhas, resumo in casos:
+            adaptador = serializacao.adaptador_lista(schema)
+
+            def stdlib():
+                dados = adaptador.dump_python(adaptador.validate_python(linhas, from_attributes=True), mode="json")
+                return json.dumps(dados, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+            def pydantic():
+                return adaptador.dump_json(adaptador.validate_python(linhas, from_attributes=True))
+
+            ms_stdlib, bytes_stdlib = _medir(stdlib, args.repeticoes)
+            ms_pydantic, bytes_pydantic = _medir(pydantic, args.repeticoes)
+            assert json.loads(bytes_stdlib) == json.loads(bytes_pydantic)
+            coluna_direto = "-"
+            if resumo:
+                serializador = serializacao.SerializadorResumo(schema)
+                ms_direto, bytes_direto = _medir(lambda: serializador.bytes(linhas), args.repeticoes)
+                assert bytes_direto == bytes_pydantic, f"{schema.__name__}: JSON diferente do response_model"
+                coluna_direto = f"{ms_direto:.2f}"
+            print(f"{schema.__name__:<16} {len(linhas):>7} {ms_stdlib:>12.2f} {ms_pydantic:>14.2f} "
+                  f"{coluna_direto:>12} {len(bytes_pydantic):>8}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Teste de estresse: numeração de pedidos com vários processos simultâneos
+
+Cada processo tem o seu próprio engine (como workers do uvicorn/gunicorn) e cria
+pedidos pelo PedidoService no mesmo banco SQLite. Parte das transações é
+desfeita depois de gerar o número, simulando checkouts que falham. Ao final
+verifica que nenhum número se repetiu, que nenhum pedido falhou por conflito e
+que o contador do ano bate com o maior sequencial gravado.
+
+Execute na pasta DOCERIA BACKEND:
+    python -m benchmarks.stress_numero_pedido
+    python -m benchmarks.stress_numero_pedido --processos 16 --pedidos 200 --desfeitos 0.2
+"""
+import argparse
+import multiprocessing
+import random
+import sys
+import time
+from collections import Counter
+
+
+def _trabalhador(indice: int, pedidos: int, desfeitos: float, inicio) -> dict:
+    from app.data.database import SessionLocal
+    from app.services.pedido_service import PedidoService
+
+    servico = PedidoService()
+    sorteio = random.Random(indice)
+    numeros, erros, abandonados = [], [], 0
+    inicio.wait()
+    for i in range(pedidos):
+        db = SessionLocal()
+        try:
+            if sorteio.random() < desfeitos:
+                servico.gerar_numero_pedido(db)
+                db.rollback()
+                abandonados += 1
+                continue
+            pedido = servico.criar(db, {
+                "cliente_id": 1 + (indice + i) % 20,
+                "tipo_entrega": "retirada",
+                "itens": [{"produto_id": 1 + i % 50, "quantidade": 1}],
+            })
+            numeros.append(pedido.numero_pedido)
+        except Exception as e:
+            db.rollback()
+            erros.append(f"{type(e).__name__}: {(str(e).splitlines() or [''])[0]}")
+        finally:
+            db.close()
+    return {"numeros": numeros, "erros": erros, "abandonados": abandonados}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estresse da numeração de pedidos")
+    parser.add_argument("--processos", type=int, default=8)
+    parser.add_argument("--pedidos", type=int, default=100, help="Pedidos por processo")
+    parser.add_argument("--desfeitos", type=float, default=0.1,
+                        help="Fração de transações desfeitas após gerar o número")
+    args = parser.parse_args()
+
+    from benchmarks.utils import preparar_ambiente, popular_banco
+    preparar_ambiente(LOG_LEVEL="ERROR")
+    popular_banco(total_pedidos=100, itens_por_pedido=1, total_clientes=20)
+
+    contexto = multiprocessing.get_context("spawn")
+    with contexto.Manager() as gerenciador:
+        inicio = gerenciador.Event()
+        with contexto.Pool(args.processos) as pool:
+            tarefas = [pool.apply_async(_trabalhador, (i, args.pedidos, args.desfeitos, inicio))
+                       for i in range(args.processos)]
+            time.sleep(2)  # aguarda os processos importarem a aplicação
+            comeco = time.perf_counter()
+            inicio.set()
+            resultados = [t.get() for t in tarefas]
+            duracao = time.perf_counter() - comeco
+
+    numeros = [n for r in resultados for n in r["numeros"]]
+    erros = [e for r in resultados for e in r["erros"]]
+    abandonados = sum(r["abandonados"] for r in resultados)
+    repetidos = [n for n, c in Counter(numeros).items() if c > 1]
+
+    from datetime import datetime
+    from sqlalchemy import func
+    from app.data.database import SessionLocal
+    from app.models import Pedido, ContadorPedido
+
+    ano = datetime.now().year
+    db = SessionLocal()
+    try:
+        gravados = db.query(func.count(Pedido.id)).filter(Pedido.numero_pedido.like(f"PED-{ano}-%")).scalar()
+        contador = db.get(ContadorPedido, ano)
+        ultimo = contador.ultimo if contador else 0
+    finally:
+        db.close()
+    maior = max((int(n.rsplit("-", 1)[1]) for n in numeros), default=0)
+
+    print(f"{args.processos} processos x {args.pedidos} pedidos em {duracao:.2f}s "
+          f"({len(numeros) / duracao:.0f} pedidos/s)")
+    print(f"criados: {len(numeros)}  gravados: {gravados}  desfeitos: {abandonados}  erros: {len(erros)}")
+    print(f"números repetidos: {len(repetidos)}  contador {ano}: {ultimo}  maior sequencial: {maior}")
+    for erro in Counter(erros).most_common(5):
+        print(f"  {erro[1]}x {erro[0]}")
+
+    if repetidos or erros or gravados != len(numeros) or ultimo != maior:
+        print("\nFALHA")
+        sys.exit(1)
+    print("\nOK: números únicos, sem conflitos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Funções comuns dos benchmarks: banco temporário, dados sintéticos e token
+"""
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta
+
+
+def preparar_ambiente(**variaveis):
+    """
+    Aponta a aplicação para um banco SQLite temporário.
+    Deve ser chamada antes de qualquer import de `app`.
+    """
+    pasta = tempfile.mkdtemp(prefix="doceria_bench_")
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(pasta, 'bench.db')}"
+    for chave, valor in variaveis.items():
+        os.environ[chave] = str(valor)
+    return pasta
+
+
+def popular_banco(total_pedidos: int = 1000, itens_por_pedido: int = 3, total_clientes: int = 100):
+    """Cria clientes, produtos, kits, pedidos e pagamentos sintéticos"""
+    from app.data.database import SessionLocal
+    from app.migrations import aplicar_migracoes
+    from app.models import Categoria, Produto, Kit, Cliente, Pedido, ItemPedido, Pagamento
+    from app.services.resumo_diario import reconstruir
+    from app.services import busca_clientes  # noqa: F401 (eventos que indexam os clientes criados)
+
+    aplicar_migracoes(informar=lambda mensagem: None)
+    random.seed(42)
+    db = SessionLocal()
+    try:
+        categoria = Categoria(nome="Bench")
+        db.add(categoria)
+        db.flush()
+        produtos = [Produto(nome=f"Produto {i}", descricao="Produto de teste", preco=5.0 + i,
+                            categoria_id=categoria.id) for i in range(50)]
+        kits = [Kit(nome=f"Kit {i}", descricao="Kit de teste", preco=100.0 + i) for i in range(10)]
+        clientes = [Cliente(nome=f"Cliente {i}", email=f"cliente{i}@bench.com", ativo=True)
+                    for i in range(total_clientes)]
+        db.add_all(produtos + kits + clientes)
+        db.flush()
+
+        inicio = datetime.utcnow() - timedelta(days=365)
+        formas = ["dinheiro", "pix", "cartao_credito", "cartao_debito"]
+        status = ["pendente", "confirmado", "entregue", "cancelado"]
+        for i in range(total_pedidos):
+            data = inicio + timedelta(minutes=i * (525600 // max(total_pedidos, 1)))
+            forma = random.choice(formas)
+            pedido = Pedido(
+                numero_pedido=f"PED-BENCH-{i:07d}",
+                cliente_id=random.choice(clientes).id,
+                status=random.choice(status),
+                tipo_entrega="retirada",
+                forma_pagamento=forma,
+                observacoes="Observação longa de teste " * 10,
+                data_pedido=data,
+                data_criacao=data,
+                data_atualizacao=data,
+            )
+            db.add(pedido)
+            db.flush()
+            subtotal = 0.0
+            for _ in range(itens_por_pedido):
+                produto = random.choice(produtos)
+                db.add(ItemPedido(pedido_id=pedido.id, produto_id=produto.id, nome_item=produto.nome,
+                                  quantidade=2, preco_unitario=produto.preco, subtotal=produto.preco * 2))
+                subtotal += produto.preco * 2
+            pedido.subtotal = pedido.total = subtotal
+            db.add(Pagamento(pedido_id=pedido.id, valor=subtotal, forma_pagamento=forma,
+                             status="aprovado" if pedido.status == "entregue" else "pendente",
+                             data_criacao=data))
+        db.flush()
+        # Os dados sintéticos não passam pelos serviços: calcula os resumos diários
+        reconstruir(db)
+        db.commit()
+    finally:
+        db.close()
+
+
+def cabecalho_autenticacao() -> dict:
+    """Gera o header Authorization com um token válido"""
+    from app.services.token_service import criar_token
+    return {"Authorization": f"Bearer {criar_token({'id': 1, 'email': 'bench@bench.com'})}"}
+
+
+def percentil(valores: list, p: float) -> float:
+    ordenados = sorted(valores)
+    if not ordenados:
+        return 0.0
+    indice = min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))
+    return ordenados[indice]
@@ -0,0 +1,39 @@
+"""
+Configuração dos testes: a aplicação aponta para um banco SQLite temporário
+(nunca para o doceria.db) antes de qualquer import de `app`.
+
+Execute na pasta DOCERIA BACKEND:
+    python -m pytest -q
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+PASTA_BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PASTA_BACKEND not in sys.path:
+    sys.path.insert(0, PASTA_BACKEND)
+
+os.environ.setdefault("SECRET_KEY", "testes")
+os.environ["ENVIRONMENT"] = "testing"
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='doceria_testes_'), 'testes.db')}"
+
+
+@pytest.fixture(scope="session")
+def banco_populado():
+    """Banco de testes migrado e com dados sintéticos (uma vez por sessão)"""
+    from benchmarks.utils import popular_banco
+
+    popular_banco(total_pedidos=200, itens_por_pedido=2, total_clientes=20)
+
+
+@pytest.fixture
+def db(banco_populado):
+    """Sessão no banco de testes; o que não foi commitado é desfeito no fim"""
+    from app.data.database import SessionLocal
+
+    sessao = SessionLocal()
+    yield sessao
+    sessao.rollback()
+    sessao.close()
@@ -0,0 +1,90 @@
+"""
+Checkout em uma transação: pedido, itens, pagamento automático e resumos
+"""
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func
+
+from app.config import settings
+from app.models import ContadorPedido, HistoricoPagamento, ItemPedido, Pagamento, Pedido
+from app.models.resumo_model import ResumoDiarioPedido, ResumoDiarioPagamento
+from app.services.pagamento_service import PagamentoService
+from app.services.pedido_service import PedidoService
+
+pedidos = PedidoService()
+
+
+def _dados(forma_pagamento: str) -> dict:
+    return {
+        "cliente_id": 1,
+        "tipo_entrega": "retirada",
+        "forma_pagamento": forma_pagamento,
+        "itens": [{"produto_id": 1, "quantidade": 2}, {"kit_id": 1, "quantidade": 1}],
+    }
+
+
+def _contagens(db) -> dict:
+    db.expire_all()
+    return {
+        "pedidos": db.query(func.count(Pedido.id)).scalar(),
+        "itens": db.query(func.count(ItemPedido.id)).scalar(),
+        "pagamentos": db.query(func.count(Pagamento.id)).scalar(),
+        "historico": db.query(func.count(HistoricoPagamento.id)).scalar(),
+        "contador": db.query(func.coalesce(func.sum(ContadorPedido.ultimo), 0)).scalar(),
+        "resumo_pedidos": db.query(func.coalesce(func.sum(ResumoDiarioPedido.quantidade), 0)).scalar(),
+        "resumo_pagamentos": db.query(func.coalesce(func.sum(ResumoDiarioPagamento.quantidade), 0)).scalar(),
+    }
+
+
+@pytest.fixture
+def pagamento_falha(monkeypatch):
+    """O pagamento automático falha depois de já ter gravado o pagamento e o histórico"""
+    original = PagamentoService.registrar_no_checkout
+
+    def registrar_e_falhar(self, db, pedido, dados):
+        original(self, db, pedido, dados)
+        db.flush()
+        raise RuntimeError("gateway indisponível")
+
+    monkeypatch.setattr(PagamentoService, "registrar_no_checkout", registrar_e_falhar)
+
+
+def test_checkout_grava_pedido_e_pagamento_juntos(db):
+    antes = _contagens(db)
+    pedido = pedidos.criar(db, _dados("dinheiro"))
+
+    assert pedido.status == "confirmado"
+    [pagamento] = PagamentoService().buscar_por_pedido(db, pedido.id)
+    assert (pagamento.status, pagamento.valor) == ("aprovado", pedido.total)
+    depois = _contagens(db)
+    assert {chave: depois[chave] - antes[chave] for chave in antes} == {
+        "pedidos": 1, "itens": 2, "pagamentos": 1, "historico": 2, "contador": 1,
+        "resumo_pedidos": 1, "resumo_pagamentos": 1,
+    }
+
+
+def test_falha_no_pagamento_desfaz_o_pedido(db, pagamento_falha, monkeypatch):
+    monkeypatch.setattr(settings, "CHECKOUT_PAGAMENTO_OPCIONAL", False)
+    antes = _contagens(db)
+
+    with pytest.raises(HTTPException) as erro:
+        pedidos.criar(db, _dados("pix"))
+
+    assert erro.value.status_code == 500
+    assert _contagens(db) == antes  # nem pedido, itens, pagamento, número ou resumos
+
+
+def test_pagamento_opcional_mantem_o_pedido(db, pagamento_falha, monkeypatch):
+    monkeypatch.setattr(settings, "CHECKOUT_PAGAMENTO_OPCIONAL", True)
+    antes = _contagens(db)
+
+    pedido = pedidos.criar(db, _dados("pix"))
+
+    assert pedido.status == "pendente"
+    assert len(pedido.itens) == 2
+    assert PagamentoService().buscar_por_pedido(db, pedido.id) == []
+    depois = _contagens(db)
+    assert {chave: depois[chave] - antes[chave] for chave in antes} == {
+        "pedidos": 1, "itens": 2, "pagamentos": 0, "historico": 0, "contador": 1,
+        "resumo_pedidos": 1, "resumo_pagamentos": 0,
+    }
@@ -0,0 +1,125 @@
+"""
+Compressão das respostas: validadores do 200 comprimido e do 304, threadpool
+"""
+import json
+import threading
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.data import compressao
+from app.controllers import monitoramento_controller
+from app.data.compressao import CompressaoMiddleware
+from app.data.depedencies import get_current_user
+from app.services.condicional import cabecalhos, etag_do_corpo, nao_modificado, resposta_304
+
+CORPO = json.dumps([{"id": i, "nome": f"Bolo {i}", "preco": i * 1.5} for i in range(2000)]).encode()
+ATUALIZADO = datetime(2026, 1, 1)
+
+app = FastAPI()
+app.add_middleware(CompressaoMiddleware)
+app.include_router(monitoramento_controller.router)
+
+
+@app.get("/catalogo")
+def catalogo(request: Request):
+    headers = cabecalhos(etag_do_corpo(CORPO), ATUALIZADO)
+    if nao_modificado(request, headers["ETag"], ATUALIZADO):
+        return resposta_304(headers)
+    return Response(CORPO, media_type="application/json", headers=headers)
+
+
+@app.get("/categoria")
+def categoria(request: Request):
+    corpo = b'{"id": 1, "nome": "Bolos"}'  # abaixo de COMPRESSAO_MINIMO_BYTES
+    headers = cabecalhos(etag_do_corpo(corpo), ATUALIZADO)
+    if nao_modificado(request, headers["ETag"], ATUALIZADO):
+        return resposta_304(headers)
+    return Response(corpo, media_type="application/json", headers=headers)
+
+
+cliente = TestClient(app)
+
+
+def test_304_tem_os_mesmos_validadores_do_200_comprimido():
+    resposta = cliente.get("/catalogo", headers={"Accept-Encoding": "gzip"})
+    assert resposta.headers["Content-Encoding"] == "gzip"
+    assert resposta.json() == json.loads(CORPO)
+    etag = resposta.headers["ETag"]
+    assert etag.startswith("W/")
+
+    revalidacao = cliente.get("/catalogo", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert revalidacao.status_code == 304
+    assert revalidacao.headers["ETag"] == etag
+    assert revalidacao.headers["Vary"] == resposta.headers["Vary"] == "Accept-Encoding"
+
+
+def test_304_sem_compressao_mantem_etag_forte():
+    resposta = cliente.get("/catalogo", headers={"Accept-Encoding": "identity"})
+    etag = resposta.headers["ETag"]
+    assert "Content-Encoding" not in resposta.headers
+    assert not etag.startswith("W/")
+
+    revalidacao = cliente.get("/catalogo", headers={"Accept-Encoding": "identity", "If-None-Match": etag})
+    assert revalidacao.status_code == 304
+    assert revalidacao.headers["ETag"] == etag
+    assert revalidacao.headers["Vary"] == "Accept-Encoding"
+
+
+def test_304_de_resposta_pequena_mantem_etag_forte():
+    resposta = cliente.get("/categoria", headers={"Accept-Encoding": "gzip"})
+    etag = resposta.headers["ETag"]
+    assert "Content-Encoding" not in resposta.headers
+    assert not etag.startswith("W/")
+
+    revalidacao = cliente.get("/categoria", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert revalidacao.status_code == 304
+    assert revalidacao.headers["ETag"] == etag
+    assert revalidacao.headers["Vary"] == resposta.headers["Vary"] == "Accept-Encoding"
+
+
+@pytest.mark.parametrize("limite, no_threadpool", [(len(CORPO), True), (len(CORPO) + 1, False)])
+def test_corpos_grandes_comprimem_no_threadpool(monkeypatch, limite, no_threadpool):
+    monkeypatch.setattr(settings, "COMPRESSAO_THREADPOOL_BYTES", limite)
+    threads = []
+    original = compressao.comprimir
+
+    def comprimir(corpo, codificacao):
+        threads.append(threading.current_thread())
+        return original(corpo, codificacao)
+
+    monkeypatch.setattr(compressao, "comprimir", comprimir)
+    with TestClient(app) as cliente_local:
+        loop = cliente_local.portal.call(threading.current_thread)
+        resposta = cliente_local.get("/catalogo", headers={"Accept-Encoding": "gzip"})
+
+    assert resposta.json() == json.loads(CORPO)
+    assert len(threads) == 1
+    assert (threads[0] is not loop) == no_threadpool
+
+
+def test_brotli_preferido_quando_instalado():
+    pytest.importorskip("brotli")
+    resposta = cliente.get("/catalogo", headers={"Accept-Encoding": "gzip, br"})
+    assert resposta.headers["Content-Encoding"] == "br"
+    assert resposta.json() == json.loads(CORPO)
+
+
+def test_metricas_expostas_no_monitoramento():
+    assert cliente.get("/monitoramento/compressao").status_code in (401, 403)
+
+    app.dependency_overrides[get_current_user] = lambda: {"id": 1}
+    try:
+        antes = cliente.get("/monitoramento/compressao").json()["totais"].get("gzip", {}).get("respostas", 0)
+        cliente.get("/catalogo", headers={"Accept-Encoding": "gzip"})
+        metricas = cliente.get("/monitoramento/compressao").json()
+    finally:
+        app.dependency_overrides.clear()
+
+    assert metricas["ativa"] is True
+    assert "gzip" in metricas["codificacoes"]
+    assert metricas["totais"]["gzip"]["respostas"] == antes + 1
+    assert metricas["totais"]["gzip"]["bytes_originais"] >= len(CORPO)
@@ -0,0 +1,43 @@
+"""
+GET condicional: If-None-Match e If-Modified-Since
+"""
+from datetime import datetime
+
+from starlette.requests import Request
+
+from app.services import condicional
+
+COPIA = datetime(2026, 3, 1, 12, 30, 15, 100000)
+MESMO_SEGUNDO = datetime(2026, 3, 1, 12, 30, 15, 900000)
+
+
+def _requisicao(**headers) -> Request:
+    cabecalhos = [(k.replace("_", "-").lower().encode(), v.encode()) for k, v in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": cabecalhos})
+
+
+def test_if_none_match_compara_a_versao_inteira():
+    etag_copia = condicional.etag_da_versao("pedido-1", COPIA)
+    etag_atual = condicional.etag_da_versao("pedido-1", MESMO_SEGUNDO)
+
+    assert condicional.nao_modificado(_requisicao(if_none_match=etag_copia), etag_copia, COPIA)
+    assert condicional.nao_modificado(_requisicao(if_none_match=f"W/{etag_copia}"), etag_copia, COPIA)
+    assert not condicional.nao_modificado(_requisicao(if_none_match=etag_copia), etag_atual, MESMO_SEGUNDO)
+
+
+def test_if_modified_since_ignorado_quando_desativado():
+    requisicao = _requisicao(if_modified_since=condicional.http_data(COPIA))
+    etag_atual = condicional.etag_da_versao("pedido-1", MESMO_SEGUNDO)
+
+    # com resolução de segundos, a alteração no mesmo segundo passa despercebida
+    assert condicional.nao_modificado(requisicao, etag_atual, MESMO_SEGUNDO)
+    assert not condicional.condicional(requisicao, if_modified_since=False)
+    assert not condicional.nao_modificado(requisicao, etag_atual, MESMO_SEGUNDO, if_modified_since=False)
+
+
+def test_if_modified_since_por_data():
+    assert condicional.nao_modificado(_requisicao(if_modified_since=condicional.http_data(COPIA)), '"x"', COPIA)
+    assert not condicional.nao_modificado(
+        _requisicao(if_modified_since=condicional.http_data(datetime(2026, 3, 1, 12, 30, 14))), '"x"', COPIA
+    )
+    assert not condicional.nao_modificado(_requisicao(if_modified_since="data inválida"), '"x"', COPIA)
@@ -0,0 +1,79 @@
+"""
+Fila de escrita única: group commit, savepoint por operação e cancelamento
+"""
+import threading
+
+import pytest
+from sqlalchemy import event, text
+
+from app.data.fila_escrita import FilaEscrita
+
+TIMEOUT_S = 5
+
+
+@pytest.fixture
+def fila(tmp_path):
+    fila = FilaEscrita(f"sqlite:///{tmp_path / 'fila.db'}", lote_max=32, janela_ms=200)
+    with fila.engine.begin() as conn:
+        conn.execute(text("CREATE TABLE itens (id INTEGER PRIMARY KEY, nome TEXT NOT NULL)"))
+    yield fila
+    fila.engine.dispose()
+
+
+def inserir(db, nome: str) -> int:
+    id = db.execute(text("INSERT INTO itens (nome) VALUES (:nome) RETURNING id"), {"nome": nome}).scalar()
+    db.commit()  # libera só o savepoint da operação
+    return id
+
+
+def inserir_e_falhar(db, nome: str):
+    db.execute(text("INSERT INTO itens (nome) VALUES (:nome)"), {"nome": nome})
+    raise ValueError("falha da operação")
+
+
+def _nomes(fila) -> list:
+    with fila.engine.connect() as conn:
+        return conn.execute(text("SELECT nome FROM itens ORDER BY id")).scalars().all()
+
+
+def test_operacoes_da_janela_sao_gravadas_em_um_commit(fila):
+    commits = []
+    event.listen(fila.engine, "commit", lambda conn: commits.append(conn))
+
+    futures = [fila.enviar(inserir, f"bolo {i}") for i in range(5)]
+    ids = [future.result(TIMEOUT_S) for future in futures]
+
+    assert ids == sorted(ids) and len(set(ids)) == 5
+    assert len(commits) == 1
+    assert _nomes(fila) == [f"bolo {i}" for i in range(5)]
+
+
+def test_operacao_com_erro_nao_afeta_as_demais_do_lote(fila):
+    futures = [
+        fila.enviar(inserir, "torta"),
+        fila.enviar(inserir_e_falhar, "quindim"),
+        fila.enviar(inserir, "brigadeiro"),
+    ]
+
+    assert futures[0].result(TIMEOUT_S) and futures[2].result(TIMEOUT_S)
+    with pytest.raises(ValueError, match="falha da operação"):
+        futures[1].result(TIMEOUT_S)
+    assert _nomes(fila) == ["torta", "brigadeiro"]
+
+
+def test_operacao_cancelada_na_fila_nao_roda_nem_para_a_thread(fila):
+    liberar = threading.Event()
+
+    def bloquear(db):
+        liberar.wait(TIMEOUT_S)
+        return inserir(db, "primeiro")
+
+    primeira = fila.enviar(bloquear)
+    cancelada = fila.enviar(inserir, "cancelado")
+    assert cancelada.cancel()  # ex.: asyncio.wrap_future cancelado pela desconexão do cliente
+    liberar.set()
+
+    assert primeira.result(TIMEOUT_S)
+    assert fila.enviar(inserir, "depois").result(TIMEOUT_S)
+    assert fila._thread.is_alive()
+    assert _nomes(fila) == ["primeiro", "depois"]
@@ -0,0 +1,134 @@
+"""
+Migrações aplicadas sobre bancos legados (schema anterior às migrações versionadas)
+"""
+import sqlite3
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import Session
+
+from app.migrations import aplicar_migracoes, criar_engine_migracao, versao_atual
+from app.services.cliente_service import ClienteService
+
+# clientes como criada pelas versões antigas: telefone NOT NULL (o que o
+# fix_telefone.py corrigia à mão), UNIQUE/CHECK na tabela e DEFAULT em ativo
+CLIENTES_LEGADO = """
+CREATE TABLE clientes (
+    id INTEGER NOT NULL PRIMARY KEY,
+    nome VARCHAR NOT NULL,
+    email VARCHAR NOT NULL,
+    telefone VARCHAR NOT NULL,
+    cpf VARCHAR,
+    endereco VARCHAR, numero VARCHAR, complemento VARCHAR, bairro VARCHAR,
+    cidade VARCHAR, estado VARCHAR, cep VARCHAR,
+    data_nascimento VARCHAR, observacoes VARCHAR,
+    ativo BOOLEAN DEFAULT 1,
+    data_cadastro DATETIME, data_atualizacao DATETIME,
+    UNIQUE (email),
+    CHECK (length(nome) > 0)
+);
+CREATE UNIQUE INDEX ix_clientes_cpf ON clientes (cpf);
+INSERT INTO clientes (nome, email, telefone, cpf) VALUES ('Ana', 'ana@doceria.com', '11 99999-0000', '123.456.789-00');
+INSERT INTO clientes (nome, email, telefone) VALUES ('Bia', 'bia@doceria.com', '11 98888-0000');
+"""
+
+
+@pytest.fixture
+def banco_legado(tmp_path):
+    caminho = tmp_path / "legado.db"
+    with sqlite3.connect(caminho) as conexao:
+        conexao.executescript(CLIENTES_LEGADO)
+    engine = criar_engine_migracao(f"sqlite:///{caminho}")
+    yield engine
+    engine.dispose()
+
+
+def _coluna(engine, tabela: str, nome: str) -> dict:
+    return next(c for c in inspect(engine).get_columns(tabela) if c["name"] == nome)
+
+
+def test_v0002_remove_not_null_do_telefone(banco_legado):
+    aplicar_migracoes(banco_legado, ate=2, informar=lambda mensagem: None)
+
+    assert versao_atual(banco_legado) == 2
+    assert _coluna(banco_legado, "clientes", "telefone")["nullable"] is True
+
+    with banco_legado.begin() as conn:
+        linhas = conn.execute(text("SELECT nome, telefone, ativo FROM clientes ORDER BY id")).all()
+        assert [tuple(linha) for linha in linhas] == [("Ana", "11 99999-0000", 1), ("Bia", "11 98888-0000", 1)]
+        conn.execute(text("INSERT INTO clientes (nome, email) VALUES ('Caio', 'caio@doceria.com')"))
+        assert conn.execute(text("SELECT ativo FROM clientes WHERE nome = 'Caio'")).scalar() == 1
+
+
+def test_v0002_preserva_constraints_e_indices(banco_legado):
+    aplicar_migracoes(banco_legado, ate=2, informar=lambda mensagem: None)
+
+    inspetor = inspect(banco_legado)
+    assert [u["column_names"] for u in inspetor.get_unique_constraints("clientes")] == [["email"]]
+    assert [c["sqltext"] for c in inspetor.get_check_constraints("clientes")] == ["length(nome) > 0"]
+    assert "ix_clientes_cpf" in {i["name"] for i in inspetor.get_indexes("clientes")}
+    assert _coluna(banco_legado, "clientes", "ativo")["default"] == "1"
+
+    with banco_legado.connect() as conn:
+        with pytest.raises(Exception):
+            conn.execute(text("INSERT INTO clientes (nome, email) VALUES ('Ana 2', 'ana@doceria.com')"))
+
+
+def test_banco_legado_chega_a_ultima_versao(banco_legado):
+    aplicadas = aplicar_migracoes(banco_legado, informar=lambda mensagem: None)
+
+    assert versao_atual(banco_legado) == aplicadas[-1].versao
+    with banco_legado.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM clientes WHERE telefone IS NOT NULL")).scalar() == 2
+
+
+# emails/CPFs que só se repetem depois da normalização (v0009)
+CLIENTES_REPETIDOS = """
+INSERT INTO clientes (nome, email, telefone, cpf) VALUES ('Ana Paula', 'Ana@Doceria.com', '11 97777-0000', '12345678900');
+"""
+
+
+@pytest.fixture
+def mensagens_repetidos(banco_legado) -> list:
+    """Banco legado com clientes repetidos após a normalização, migrado até a última versão"""
+    with banco_legado.begin() as conn:
+        conn.exec_driver_sql(CLIENTES_REPETIDOS)
+    mensagens = []
+    aplicar_migracoes(banco_legado, informar=mensagens.append)
+    return mensagens
+
+
+def test_v0009_clientes_repetidos_continuam_encontraveis(banco_legado, mensagens_repetidos):
+    mensagens = mensagens_repetidos
+    assert any("email_normalizado 'ana@doceria.com' repetido" in m for m in mensagens)
+    assert any("cpf_normalizado '12345678900' repetido" in m for m in mensagens)
+
+    clientes = ClienteService()
+    with Session(banco_legado) as db:
+        assert clientes.buscar_por_email(db, "Ana@Doceria.com").nome == "Ana Paula"
+        assert clientes.buscar_por_email(db, "ana@doceria.com").nome == "Ana"
+        assert clientes.buscar_por_email(db, " ANA@doceria.com").nome == "Ana"
+        assert clientes.buscar_por_cpf(db, "12345678900").nome == "Ana Paula"
+        assert clientes.buscar_por_cpf(db, "123.456.789-00").nome == "Ana"
+        assert [c.nome for c in clientes.buscar(db, "Ana@Doceria.com")] == ["Ana Paula"]
+
+
+def test_v0009_cliente_repetido_pode_ser_atualizado(banco_legado, mensagens_repetidos):
+    clientes = ClienteService()
+    with Session(banco_legado) as db:
+        repetido = clientes.buscar_por_email(db, "Ana@Doceria.com")
+        # o formulário reenvia o registro inteiro, com o email e o CPF de sempre
+        atualizado = clientes.atualizar(db, repetido.id, {
+            "nome": "Ana Paula Souza", "email": "Ana@Doceria.com", "cpf": "12345678900",
+        })
+        assert atualizado.nome == "Ana Paula Souza"
+        assert (atualizado.email_normalizado, atualizado.cpf_normalizado) == (None, None)
+
+        for dados in ({"email": "ANA@doceria.com"}, {"cpf": "123.456.789-00"}):
+            with pytest.raises(HTTPException) as erro:
+                clientes.atualizar(db, repetido.id, dados)
+            assert erro.value.status_code == 400
+
+        atualizado = clientes.atualizar(db, repetido.id, {"email": "anapaula@doceria.com"})
+        assert atualizado.email_normalizado == "anapaula@doceria.com"
@@ -0,0 +1,61 @@
+"""
+Número do pedido: contador por ano com UPSERT ... RETURNING
+"""
+import threading
+from datetime import datetime
+
+from app.data.database import SessionLocal
+from app.services import pedido_service
+from app.services.pedido_service import PedidoService
+
+pedidos = PedidoService()
+
+
+def _no_ano(monkeypatch, ano: int):
+    class DataFixa(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime(ano, 12, 31, 23, 59, 59, tzinfo=tz)
+
+    monkeypatch.setattr(pedido_service, "datetime", DataFixa)
+
+
+def test_pedidos_simultaneos_recebem_numeros_distintos(banco_populado):
+    total = 16
+    numeros, erros = [], []
+    largada = threading.Barrier(total)
+
+    def criar():
+        db = SessionLocal()
+        try:
+            largada.wait()
+            pedido = pedidos.criar(db, {
+                "cliente_id": 1, "tipo_entrega": "retirada", "itens": [{"produto_id": 1, "quantidade": 1}],
+            })
+            numeros.append(pedido.numero_pedido)
+        except Exception as e:
+            erros.append(e)
+        finally:
+            db.close()
+
+    threads = [threading.Thread(target=criar) for _ in range(total)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert erros == []
+    assert len(set(numeros)) == total
+    sequenciais = sorted(int(numero.rsplit("-", 1)[1]) for numero in numeros)
+    assert sequenciais == list(range(sequenciais[0], sequenciais[0] + total))  # sem buracos
+
+
+def test_contador_recomeca_na_virada_do_ano(db, monkeypatch):
+    _no_ano(monkeypatch, 2098)
+    assert [pedidos.gerar_numero_pedido(db) for _ in range(2)] == ["PED-2098-0001", "PED-2098-0002"]
+
+    _no_ano(monkeypatch, 2099)
+    assert pedidos.gerar_numero_pedido(db) == "PED-2099-0001"
+
+    _no_ano(monkeypatch, 2098)
+    assert pedidos.gerar_numero_pedido(db) == "PED-2098-0003"  # o ano anterior segue de onde parou
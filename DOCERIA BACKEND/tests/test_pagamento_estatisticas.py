@@ -0,0 +1,39 @@
+"""
+Percentis do ticket nas estatísticas de pagamentos
+"""
+import math
+
+from sqlalchemy import update
+
+from app.data.database import SessionLocal
+from app.models.pagamento_model import Pagamento, StatusPagamento
+from app.models.resumo_model import ResumoDiarioPagamento
+from app.services.pagamento_service import PERCENTIS_TICKET, PagamentoService
+
+pagamentos = PagamentoService()
+
+
+def _esperados(db) -> dict:
+    """Nearest-rank calculado em Python sobre todos os pagamentos aprovados"""
+    valores = sorted(v for (v,) in db.query(Pagamento.valor).filter(
+        Pagamento.status == StatusPagamento.APROVADO.value
+    ))
+    return {f"p{p}": round(valores[max(math.ceil(p / 100 * len(valores)) - 1, 0)], 2) for p in PERCENTIS_TICKET}
+
+
+def test_percentis_nao_dependem_do_resumo_diario(banco_populado):
+    db = SessionLocal()
+    try:
+        esperados = _esperados(db)
+        assert pagamentos.estatisticas(db, percentis=True)["percentis_ticket"] == esperados
+
+        # resumo maior que as linhas (ex.: pagamentos removidos sem ajustar o resumo)
+        db.execute(update(ResumoDiarioPagamento).values(quantidade=ResumoDiarioPagamento.quantidade * 10))
+        assert pagamentos.estatisticas(db, percentis=True)["percentis_ticket"] == esperados
+
+        # resumo sem nenhum aprovado, mas com linhas na tabela de pagamentos
+        db.execute(update(ResumoDiarioPagamento).values(quantidade=0))
+        assert pagamentos.estatisticas(db, percentis=True)["percentis_ticket"] == esperados
+    finally:
+        db.rollback()
+        db.close()
@@ -0,0 +1,124 @@
+"""
+Paginação por cursor (keyset) das listagens de pedidos, pagamentos e clientes
+"""
+import base64
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app.models import Cliente, Pagamento, Pedido
+from app.services.cliente_service import ClienteService
+from app.services.pagamento_service import PagamentoService
+from app.services.paginacao import codificar_cursor
+from app.services.pedido_service import PedidoService
+
+pedidos = PedidoService()
+pagamentos = PagamentoService()
+clientes = ClienteService()
+
+MOMENTO = datetime(2030, 6, 15, 12, 0, 0)
+
+
+def _paginar(listar, chave, limit: int, ao_virar_a_pagina=lambda: None) -> list:
+    """Percorre as páginas como o cliente faz, seguindo o cursor do último item"""
+    vistos, cursor = [], None
+    while True:
+        pagina = listar(limit=limit, cursor=cursor)
+        vistos.extend(item.id for item in pagina)
+        if len(pagina) < limit:
+            return vistos
+        cursor = codificar_cursor(*chave(pagina[-1]))
+        ao_virar_a_pagina()
+
+
+@pytest.fixture
+def cliente(db):
+    cliente = Cliente(nome="Cliente Cursor", email="cursor@doceria.com", ativo=True)
+    db.add(cliente)
+    db.flush()
+    return cliente
+
+
+def _pedido(db, cliente, data_pedido: datetime) -> Pedido:
+    pedido = Pedido(cliente_id=cliente.id, data_pedido=data_pedido, tipo_entrega="retirada", total=10.0)
+    db.add(pedido)
+    db.flush()
+    return pedido
+
+
+def _pagamento(db, pedido, data_criacao: datetime) -> Pagamento:
+    pagamento = Pagamento(pedido_id=pedido.id, valor=10.0, forma_pagamento="teste_cursor", data_criacao=data_criacao)
+    db.add(pagamento)
+    db.flush()
+    return pagamento
+
+
+def test_empates_na_data_nao_repetem_nem_pulam_pedidos(db, cliente):
+    # 7 pedidos no mesmo instante e 2 antes: o id desempata a ordem
+    esperados = [_pedido(db, cliente, MOMENTO).id for _ in range(7)]
+    esperados += [_pedido(db, cliente, MOMENTO - timedelta(seconds=1)).id for _ in range(2)]
+
+    vistos = _paginar(
+        lambda **k: pedidos.listar(db, cliente_id=cliente.id, **k),
+        lambda p: (p.data_pedido, p.id), limit=2,
+    )
+
+    assert vistos == sorted(esperados[:7], reverse=True) + sorted(esperados[7:], reverse=True)
+
+
+def test_empates_na_data_nao_repetem_nem_pulam_pagamentos(db, cliente):
+    pedido = _pedido(db, cliente, MOMENTO)
+    esperados = [_pagamento(db, pedido, MOMENTO).id for _ in range(5)]
+
+    vistos = _paginar(
+        lambda **k: pagamentos.listar(db, forma_pagamento="teste_cursor", **k),
+        lambda p: (p.data_criacao, p.id), limit=2,
+    )
+
+    assert vistos == sorted(esperados, reverse=True)
+
+
+def test_insercoes_durante_a_paginacao(db, cliente):
+    originais = [_pedido(db, cliente, MOMENTO - timedelta(minutes=i)).id for i in range(10)]
+    novos = []
+
+    def inserir():
+        # pedidos novos (no topo da lista) e no mesmo instante do último já visto
+        novos.append(_pedido(db, cliente, MOMENTO + timedelta(minutes=len(novos) + 1)).id)
+        novos.append(_pedido(db, cliente, MOMENTO).id)
+
+    vistos = _paginar(
+        lambda **k: pedidos.listar(db, cliente_id=cliente.id, **k),
+        lambda p: (p.data_pedido, p.id), limit=3, ao_virar_a_pagina=inserir,
+    )
+
+    assert len(vistos) == len(set(vistos))  # nenhuma linha repetida
+    assert [id for id in vistos if id in originais] == originais  # nenhuma original pulada, em ordem
+    assert not set(vistos) & set(novos)  # inseridas antes do cursor ficam para a próxima leitura do topo
+
+
+def test_clientes_em_ordem_de_id_com_insercoes(db):
+    ativos = [c.id for c in clientes.listar(db, limit=10 ** 6)]
+
+    def inserir():
+        db.add(Cliente(nome="Cliente Novo", email=f"novo{datetime.now().timestamp()}@doceria.com", ativo=True))
+        db.flush()
+
+    vistos = _paginar(lambda **k: clientes.listar(db, **k), lambda c: (c.id,), limit=7, ao_virar_a_pagina=inserir)
+
+    assert len(vistos) == len(set(vistos))
+    assert vistos[:len(ativos)] == ativos
+
+
+@pytest.mark.parametrize("cursor", [
+    "nao-e-base64!",
+    base64.urlsafe_b64encode(b"{}").decode(),  # não é lista
+    codificar_cursor(MOMENTO),  # faltando o id
+    codificar_cursor("ontem", 1),  # data inválida
+])
+def test_cursor_malformado_retorna_400(db, cursor):
+    with pytest.raises(HTTPException) as erro:
+        pedidos.listar(db, cursor=cursor)
+    assert erro.value.status_code == 400
+    assert erro.value.detail == "Cursor inválido."
@@ -0,0 +1,98 @@
+"""
+Regressão dos planos de consulta (EXPLAIN QUERY PLAN) das consultas dos serviços
+
+Cada caso executa um método de PedidoService, PagamentoService ou
+ClienteService, captura os SELECTs emitidos e falha se algum plano fizer
+varredura completa de uma tabela do modelo (SCAN <tabela> sem índice).
+Rode após alterar models, índices ou consultas.
+"""
+import re
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.data.database import engine, SessionLocal, Base
+from app.services.cliente_service import ClienteService
+from app.services.paginacao import codificar_cursor
+from app.services.pagamento_service import PagamentoService
+from app.services.pedido_service import PedidoService
+from app.services.periodo import hoje as hoje_loja
+
+_VARREDURA = re.compile(r"^SCAN (\w+)(?: AS \w+)?$")
+
+pedidos = PedidoService()
+pagamentos = PagamentoService()
+clientes = ClienteService()
+cursor = codificar_cursor(datetime.utcnow(), 10 ** 9)
+hoje = hoje_loja()
+
+CONSULTAS = [
+    ("PedidoService.listar", lambda db: pedidos.listar(db)),
+    ("PedidoService.listar(cursor)", lambda db: pedidos.listar(db, cursor=cursor)),
+    ("PedidoService.listar(status, cursor)", lambda db: pedidos.listar(db, status="pendente", cursor=cursor)),
+    ("PedidoService.listar(status)", lambda db: pedidos.listar(db, status="pendente")),
+    ("PedidoService.listar(cliente_id)", lambda db: pedidos.listar(db, cliente_id=1)),
+    ("PedidoService.listar(status, cliente_id)", lambda db: pedidos.listar(db, status="pendente", cliente_id=1)),
+    ("PedidoService.buscar_por_id + itens", lambda db: pedidos.buscar_por_id(db, 1).itens),
+    ("PedidoService.versao", lambda db: pedidos.versao(db, 1)),
+    ("PedidoService.buscar_por_numero", lambda db: pedidos.buscar_por_numero(db, "PED-BENCH-0000001")),
+    ("PedidoService.pedidos_por_status", lambda db: pedidos.pedidos_por_status(db, "confirmado")),
+    ("PedidoService.pedidos_pendentes", lambda db: pedidos.pedidos_pendentes(db)),
+    ("PedidoService.pedidos_cliente", lambda db: pedidos.pedidos_cliente(db, 1)),
+    ("PedidoService.contar(status)", lambda db: pedidos.contar(db, status="entregue")),
+    ("PedidoService.pedidos_do_dia", lambda db: pedidos.pedidos_do_dia(db)),
+    ("PedidoService.estatisticas(período)",
+     lambda db: pedidos.estatisticas(db, str(hoje - timedelta(days=30)), str(hoje))),
+    ("PagamentoService.buscar_por_pedido", lambda db: pagamentos.buscar_por_pedido(db, 1)),
+    ("PagamentoService.pagamento_aprovado_pedido", lambda db: pagamentos.pagamento_aprovado_pedido(db, 1)),
+    ("PagamentoService.historico", lambda db: pagamentos.historico(db, 1)),
+    ("PagamentoService.listar", lambda db: pagamentos.listar(db)),
+    ("PagamentoService.listar(cursor)", lambda db: pagamentos.listar(db, cursor=cursor)),
+    ("PagamentoService.estatisticas(período, percentis)",
+     lambda db: pagamentos.estatisticas(db, str(hoje - timedelta(days=30)), str(hoje), percentis=True)),
+    ("ClienteService.buscar", lambda db: clientes.buscar(db, "cliente 1")),
+    ("ClienteService.buscar(telefone)", lambda db: clientes.buscar(db, "(11) 9876")),
+    ("ClienteService.buscar(telefone completo)", lambda db: clientes.buscar(db, "(11) 98765-4321")),
+    ("ClienteService.buscar(email)", lambda db: clientes.buscar(db, "Cliente1@Bench.com")),
+    ("ClienteService.buscar_por_email", lambda db: clientes.buscar_por_email(db, "CLIENTE1@bench.com")),
+    ("ClienteService.buscar_por_cpf", lambda db: clientes.buscar_por_cpf(db, "123.456.789-00")),
+    ("ClienteService.aniversariantes_do_mes", lambda db: clientes.aniversariantes_do_mes(db, 3)),
+    ("ClienteService.aniversariantes_da_semana", lambda db: clientes.aniversariantes_da_semana(db)),
+]
+
+
+def _capturar(funcao) -> list:
+    """Executa `funcao(db)` e retorna os SELECTs emitidos com seus parâmetros"""
+    emitidos = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            emitidos.append((statement, parameters))
+
+    db = SessionLocal()
+    event.listen(engine, "before_cursor_execute", registrar)
+    try:
+        funcao(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", registrar)
+        db.rollback()
+        db.close()
+    return emitidos
+
+
+def _plano(statement: str, parameters) -> list[str]:
+    with engine.connect() as conn:
+        return [linha[3] for linha in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+
+
+@pytest.mark.parametrize("funcao", [funcao for _, funcao in CONSULTAS], ids=[nome for nome, _ in CONSULTAS])
+def test_consulta_sem_varredura_completa(banco_populado, funcao):
+    emitidos = _capturar(funcao)
+    assert emitidos, "nenhum SELECT emitido"
+
+    tabelas = set(Base.metadata.tables)
+    for statement, parameters in emitidos:
+        plano = _plano(statement, parameters)
+        varreduras = [d for d in plano if (m := _VARREDURA.match(d)) and m.group(1) in tabelas]
+        assert not varreduras, f"varredura completa em {varreduras}\nSQL: {statement}\nplano:\n  " + "\n  ".join(plano)
@@ -0,0 +1,73 @@
+"""
+Read-your-writes do banco de leitura: o momento da escrita volta do cliente
+"""
+import sqlite3
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.config import settings
+from app.data import replica
+
+
+def _requisicao(headers: dict = None, cookies: dict = None) -> Request:
+    cabecalhos = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    if cookies:
+        cabecalhos.append((b"cookie", "; ".join(f"{k}={v}" for k, v in cookies.items()).encode()))
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": cabecalhos})
+
+
+def test_escrita_devolve_cookie_e_header():
+    response = Response()
+    replica.registrar_escrita(response)
+
+    momento = float(response.headers[replica.HEADER_ULTIMA_ESCRITA])
+    assert abs(time.time() - momento) < 1
+    cookie = response.headers["set-cookie"]
+    assert cookie.startswith(f"{replica.COOKIE_ULTIMA_ESCRITA}={response.headers[replica.HEADER_ULTIMA_ESCRITA]}")
+    assert f"Max-Age={settings.READ_YOUR_WRITES_S}" in cookie
+    assert "HttpOnly" in cookie
+
+
+def test_leitura_logo_apos_escrita_vai_ao_principal():
+    agora = f"{time.time():.3f}"
+    assert replica.escreveu_recentemente(_requisicao(cookies={replica.COOKIE_ULTIMA_ESCRITA: agora}))
+    assert replica.escreveu_recentemente(_requisicao(headers={replica.HEADER_ULTIMA_ESCRITA: agora}))
+
+
+def test_sem_escrita_recente_usa_o_banco_de_leitura():
+    vencido = f"{time.time() - settings.READ_YOUR_WRITES_S - 1:.3f}"
+    futuro = f"{time.time() + 3600:.3f}"
+    assert not replica.escreveu_recentemente(_requisicao())
+    assert not replica.escreveu_recentemente(_requisicao(headers={replica.HEADER_ULTIMA_ESCRITA: vencido}))
+    assert not replica.escreveu_recentemente(_requisicao(headers={replica.HEADER_ULTIMA_ESCRITA: futuro}))
+    assert not replica.escreveu_recentemente(_requisicao(cookies={replica.COOKIE_ULTIMA_ESCRITA: "abc"}))
+
+
+def test_snapshot_troca_o_arquivo_sem_afetar_leituras_abertas(tmp_path):
+    origem = tmp_path / "principal.db"
+    destino = tmp_path / "snapshot.db"
+    with sqlite3.connect(origem) as conexao:
+        conexao.execute("PRAGMA journal_mode=WAL")
+        conexao.execute("CREATE TABLE itens (nome TEXT)")
+        conexao.execute("INSERT INTO itens VALUES ('bolo')")
+    snapshot = replica.SnapshotSQLite(str(origem), str(destino), intervalo=30)
+    snapshot.atualizar()
+
+    engine = create_engine(replica.url_snapshot(str(destino)), poolclass=NullPool)
+    with engine.connect() as antiga:
+        assert antiga.execute(text("SELECT nome FROM itens")).scalars().all() == ["bolo"]
+        with sqlite3.connect(origem) as conexao:
+            conexao.execute("INSERT INTO itens VALUES ('torta')")
+        snapshot.atualizar()
+
+        # a leitura aberta segue no arquivo anterior, inteiro; uma nova vê o snapshot novo
+        assert antiga.execute(text("SELECT nome FROM itens")).scalars().all() == ["bolo"]
+        with engine.connect() as nova:
+            assert nova.execute(text("SELECT nome FROM itens ORDER BY nome")).scalars().all() == ["bolo", "torta"]
+
+    engine.dispose()
+    assert sorted(p.name for p in tmp_path.iterdir() if p.name.startswith("snapshot")) == ["snapshot.db"]
@@ -0,0 +1,80 @@
+"""
+Resumos diários mantidos pelos serviços e fuso horário dos resumos
+"""
+from datetime import date
+
+import pytest
+
+from app.config import settings
+from app.models.resumo_model import ResumoDiarioPedido, ResumoDiarioPagamento, ResumoDiarioProduto
+from app.services import resumo_diario
+from app.services.pagamento_service import PagamentoService
+from app.services.pedido_service import PedidoService
+
+pedidos = PedidoService()
+pagamentos = PagamentoService()
+
+CHAVES = {
+    ResumoDiarioPedido: ("dia", "status", "tipo_entrega", "forma_pagamento"),
+    ResumoDiarioPagamento: ("dia", "status", "forma_pagamento"),
+    ResumoDiarioProduto: ("dia", "tipo_item", "item_id"),
+}
+
+
+def _resumos(db) -> dict:
+    """Linhas com quantidade não nula de cada resumo: chave -> (quantidade, valor)"""
+    resumos = {}
+    for modelo, chave in CHAVES.items():
+        resumos[modelo.__tablename__] = {
+            tuple(getattr(linha, c) for c in chave): (linha.quantidade, round(linha.valor_total, 2))
+            for linha in db.query(modelo).filter(modelo.quantidade != 0)
+        }
+    return resumos
+
+
+def _novo_pedido(db, forma_pagamento=None, **extras):
+    itens = [{"produto_id": 1, "quantidade": 2}, {"produto_id": 2, "quantidade": 1}, {"kit_id": 1, "quantidade": 1}]
+    dados = {"cliente_id": 1, "tipo_entrega": "retirada", "itens": itens, **extras}
+    if forma_pagamento:
+        dados["forma_pagamento"] = forma_pagamento
+    return pedidos.criar(db, dados)
+
+
+def test_manutencao_pelos_servicos_confere_com_recontagem(db):
+    em_pix = _novo_pedido(db, "pix")
+    em_dinheiro = _novo_pedido(db, "dinheiro")
+    sem_pagamento = _novo_pedido(db)
+    cancelado = _novo_pedido(db, "cartao_credito")
+
+    pedidos.atualizar(db, sem_pagamento.id, {"desconto": 5.0, "tipo_entrega": "entrega"})
+    pedidos.atualizar_status(db, sem_pagamento.id, "em_producao")
+    pedidos.cancelar(db, cancelado.id, "cliente desistiu")
+
+    pix = pagamentos.buscar_por_pedido(db, em_pix.id)[0]
+    pagamentos.confirmar(db, pix.id)
+    pagamentos.estornar(db, pix.id, {"motivo": "produto em falta"})
+    recusado = pagamentos.criar(db, {"pedido_id": sem_pagamento.id, "valor": 10.0, "forma_pagamento": "pix"})
+    pagamentos.recusar(db, recusado.id, "sem saldo")
+    cancelado_pagamento = pagamentos.criar(db, {"pedido_id": sem_pagamento.id, "valor": 12.5,
+                                                "forma_pagamento": "cartao_debito"})
+    pagamentos.cancelar(db, cancelado_pagamento.id)
+    assert pagamentos.buscar_por_pedido(db, em_dinheiro.id)[0].status == "aprovado"
+
+    mantidos = _resumos(db)
+    resumo_diario.reconstruir(db)  # recontagem completa, desfeita pelo rollback da fixture
+    assert mantidos == _resumos(db)
+
+
+def test_fuso_diferente_exige_reconstrucao_completa(db, monkeypatch):
+    resumo_diario.verificar_fuso(db)
+    assert resumo_diario.fuso_dos_resumos(db) == settings.FUSO_HORARIO_LOJA
+
+    monkeypatch.setattr(settings, "FUSO_HORARIO_LOJA", "Asia/Tokyo")
+    with pytest.raises(RuntimeError, match="Reconstrua"):
+        resumo_diario.verificar_fuso(db)
+    with pytest.raises(RuntimeError):
+        resumo_diario.reconstruir(db, inicio=date(2025, 1, 1), fim=date(2025, 1, 31))
+
+    resumo_diario.reconstruir(db)
+    assert resumo_diario.fuso_dos_resumos(db) == "Asia/Tokyo"
+    resumo_diario.verificar_fuso(db)
@@ -0,0 +1,84 @@
+"""
+Retry em SQLITE_BUSY: só comandos iniciados fora de transação e o COMMIT
+"""
+import logging
+import sqlite3
+import threading
+
+import pytest
+
+from app.config import settings
+from app.data.sqlite_profile import ConexaoComRetry
+
+
+@pytest.fixture
+def conectar(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "SQLITE_BUSY_RETRIES", 2)
+    monkeypatch.setattr(settings, "SQLITE_BUSY_BACKOFF_MS", 100)
+    caminho = tmp_path / "busy.db"
+    conexoes = []
+
+    def conectar() -> sqlite3.Connection:
+        conexao = sqlite3.connect(caminho, timeout=0.05, factory=ConexaoComRetry, check_same_thread=False)
+        conexoes.append(conexao)
+        return conexao
+
+    inicial = conectar()
+    inicial.execute("PRAGMA journal_mode=WAL")
+    inicial.execute("CREATE TABLE itens (id INTEGER PRIMARY KEY, nome TEXT)")
+    inicial.commit()
+    yield conectar
+    for conexao in conexoes:
+        conexao.close()
+
+
+def _executar(conexao: sqlite3.Connection, sql: str):
+    """Pelo cursor, como o SQLAlchemy faz (Connection.execute não passa por CursorComRetry.execute)"""
+    return conexao.cursor().execute(sql)
+
+
+def _tentativas(caplog) -> int:
+    return sum("SQLite ocupado" in registro.message for registro in caplog.records)
+
+
+def test_comando_fora_de_transacao_repete_ate_liberar(conectar, caplog):
+    escritor, outro = conectar(), conectar()
+    _executar(escritor, "BEGIN IMMEDIATE")
+    threading.Timer(0.1, escritor.commit).start()
+
+    with caplog.at_level(logging.WARNING, logger="app.data.sqlite_profile"):
+        _executar(outro, "INSERT INTO itens (nome) VALUES ('bolo')")
+        outro.commit()
+
+    assert _tentativas(caplog) >= 1
+    assert _executar(outro, "SELECT COUNT(*) FROM itens").fetchone()[0] == 1
+
+
+def test_busy_snapshot_dentro_de_transacao_nao_repete(conectar, caplog):
+    leitor, escritor = conectar(), conectar()
+    _executar(leitor, "BEGIN")
+    _executar(leitor, "SELECT COUNT(*) FROM itens").fetchone()  # fixa o snapshot de leitura
+    _executar(escritor, "INSERT INTO itens (nome) VALUES ('torta')")
+    escritor.commit()
+
+    with caplog.at_level(logging.WARNING, logger="app.data.sqlite_profile"):
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            _executar(leitor, "INSERT INTO itens (nome) VALUES ('brigadeiro')")
+
+    assert _tentativas(caplog) == 0
+    leitor.rollback()
+    _executar(leitor, "INSERT INTO itens (nome) VALUES ('brigadeiro')")  # refazendo a transação funciona
+    leitor.commit()
+
+
+def test_desiste_apos_os_retries(conectar, caplog):
+    escritor, outro = conectar(), conectar()
+    _executar(escritor, "BEGIN IMMEDIATE")
+
+    with caplog.at_level(logging.WARNING, logger="app.data.sqlite_profile"):
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            _executar(outro, "INSERT INTO itens (nome) VALUES ('bolo')")
+
+    assert _tentativas(caplog) == settings.SQLITE_BUSY_RETRIES
+    assert not outro.in_transaction
+    escritor.rollback()
@@ -133,12 +133,40 @@ async function handleResponse(response) {
     return response.json();
 }
 
+/**
+ * Read-your-writes: o backend marca as respostas de escrita com o header
+ * X-Ultima-Escrita (e o cookie ultima_escrita). Reenviar esse valor faz as
+ * leituras seguintes irem ao banco principal em vez da réplica/snapshot.
+ */
+const ULTIMA_ESCRITA_HEADER = 'X-Ultima-Escrita';
+const ULTIMA_ESCRITA_KEY = 'ultimaEscrita';
+const ULTIMA_ESCRITA_JANELA_S = 60; // READ_YOUR_WRITES_S do backend
+
+function getUltimaEscrita() {
+    const valor = sessionStorage.getItem(ULTIMA_ESCRITA_KEY);
+    if (valor && Date.now() / 1000 - parseFloat(valor) < ULTIMA_ESCRITA_JANELA_S) {
+        return valor;
+    }
+    // Fora da janela o header não muda nada no backend: deixa de ser enviado
+    sessionStorage.removeItem(ULTIMA_ESCRITA_KEY);
+    return null;
+}
+
 /**
  * Wrapper para requisições fetch com tratamento de erro melhorado
  */
 async function safeFetch(url, options = {}) {
+    const headers = { ...(options.headers || {}) };
+    const ultimaEscrita = getUltimaEscrita();
+    if (ultimaEscrita) {
+        headers[ULTIMA_ESCRITA_HEADER] = ultimaEscrita;
+    }
     try {
-        const response = await fetch(url, options);
+        const response = await fetch(url, { credentials: 'include', ...options, headers });
+        const marca = response.headers.get(ULTIMA_ESCRITA_HEADER);
+        if (marca) {
+            sessionStorage.setItem(ULTIMA_ESCRITA_KEY, marca);
+        }
         return response;
     } catch (error) {
         // Se for erro de CORS ou conexão